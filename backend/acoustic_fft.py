@@ -12,15 +12,169 @@ class AcousticFFT:
     - Output Audio_Conf [0,1].
     """
     
-    def __init__(self):
+    def __init__(self, sample_rate=16000, frame_size=1024, hop_size=512, max_chunk=None):
         self.frequency_band = (50, 200) # Hz
+        self.wind_band = (0, 50) # Hz, low frequency rumble
         self.last_energy = 50.0 # State for smoothing
         
+        # STFT setup, computed once
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.window = np.hanning(frame_size).astype(np.float32)
+        freqs = np.fft.rfftfreq(frame_size, d=1.0 / sample_rate)
+        # Bands are contiguous bins, so store slices rather than boolean masks
+        self.fire_bins = self._band_slice(freqs, *self.frequency_band)
+        self.wind_bins = self._band_slice(freqs, 1e-9, self.wind_band[1])  # skip DC
+        # Power of a full-scale sine through the window, for dBFS scaling
+        self._ref_power = (self.window.sum() / 2) ** 2
+
+        # Streaming state, allocated once per channel count and sized for
+        # chunks of up to max_chunk samples (1 s by default; larger chunks grow it).
+        # The first _carried columns of _buffer hold samples not yet consumed.
+        self.max_chunk = max_chunk or sample_rate
+        self._buffer = None
+        self._frames = None
+        self._carried = None
+
+    @staticmethod
+    def _band_slice(freqs, low, high):
+        idx = np.nonzero((freqs >= low) & (freqs <= high))[0]
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+
+    @staticmethod
+    def _to_float(audio_chunk):
+        """PCM bytes (int16 LE), int16 or float arrays -> float32 in [-1, 1]."""
+        if isinstance(audio_chunk, (bytes, bytearray, memoryview)):
+            audio_chunk = np.frombuffer(audio_chunk, dtype="<i2")
+        audio = np.asarray(audio_chunk)
+        if audio.dtype == np.int16:
+            return audio.astype(np.float32) / 32768.0
+        return audio.astype(np.float32, copy=False)
+
+    def reset_stream(self):
+        """Forget the overlap carried between chunks (e.g. new recording)."""
+        self._carried = None
+
+    def _stream_buffer(self, channels, n):
+        """Buffer for the carried samples plus an n-sample chunk, reallocated only when it cannot fit."""
+        overlap = self.frame_size - self.hop_size
+        buffer = self._buffer
+        same_stream = buffer is not None and buffer.shape[0] == channels and self._carried is not None
+        if buffer is not None and buffer.shape[0] == channels and buffer.shape[1] >= self.frame_size + n:
+            if not same_stream:
+                buffer[:, :overlap] = 0.0
+                self._carried = overlap
+            return buffer
+
+        # First chunk, new channel count or a chunk above max_chunk
+        self.max_chunk = max(self.max_chunk, n)
+        capacity = self.frame_size + self.max_chunk
+        self._buffer = np.zeros((channels, capacity), dtype=np.float32)
+        if same_stream:
+            self._buffer[:, :self._carried] = buffer[:, :self._carried]
+        else:
+            self._carried = overlap
+        max_frames = 1 + (capacity - self.frame_size) // self.hop_size
+        self._frames = np.empty((channels, max_frames, self.frame_size), dtype=np.float32)
+        return self._buffer
+
+    def band_energies(self, audio_chunk):
+        """
+        Windowed, overlapped STFT over one chunk per channel.
+
+        Args:
+            audio_chunk: (channels, samples) or (samples,) PCM. Consecutive
+                calls continue the stream: samples not yet consumed by a
+                hop (at least frame_size - hop_size per channel) stay at the
+                front of the preallocated buffer and the next chunk is
+                appended after them, so chunks shorter than a hop still add
+                up to full frames.
+
+        Returns:
+            (fire_band_energy, wind_energy) arrays per channel, on the module's
+            0-100 scale (dBFS + 100, clipped).
+        """
+        audio = np.atleast_2d(self._to_float(audio_chunk))
+        channels, n = audio.shape
+        buffer = self._stream_buffer(channels, n)
+        total = self._carried + n
+        buffer[:, self._carried:total] = audio
+
+        n_frames = 1 + (total - self.frame_size) // self.hop_size if total >= self.frame_size else 0
+        if n_frames == 0:
+            # Not a full frame yet: carry everything into the next chunk
+            self._carried = total
+            return np.zeros(channels), np.zeros(channels)
+
+        frames = np.lib.stride_tricks.sliding_window_view(buffer[:, :total], self.frame_size, axis=1)
+        frames = frames[:, :n_frames * self.hop_size:self.hop_size]
+        windowed = self._frames[:, :n_frames]
+        np.multiply(frames, self.window, out=windowed)
+
+        # Move every unconsumed sample (at least the frame overlap) to the front for the next chunk
+        consumed = n_frames * self.hop_size
+        self._carried = total - consumed
+        buffer[:, :self._carried] = buffer[:, consumed:total]
+
+        spectrum = np.fft.rfft(windowed, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        fire_power = power[..., self.fire_bins].sum(axis=-1).mean(axis=-1)
+        wind_power = power[..., self.wind_bins].sum(axis=-1).mean(axis=-1)
+        return self._scale(fire_power), self._scale(wind_power)
+
+    def _scale(self, power):
+        db = 10.0 * np.log10(np.maximum(power.astype(np.float64) / self._ref_power, 1e-12))
+        return np.clip(db + 100.0, 0.0, 100.0)
+
+    @staticmethod
+    def confidence_from_energies(fire_band_energy, wind_energy):
+        """Vectorized ratio/confidence rules (same as the scalar path)."""
+        fire = np.asarray(fire_band_energy, dtype=np.float64)
+        wind = np.asarray(wind_energy, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(wind > 0, fire / np.where(wind > 0, wind, 1.0), fire)
+        confidence = np.where(
+            ratio > 2.0, np.minimum(1.0, 0.5 + ratio * 0.1),
+            np.where(fire > 80, np.minimum(1.0, fire / 120.0), 0.0),
+        )
+        return ratio, confidence
+
+    def analyze_channels(self, audio_chunk):
+        """
+        Analyze many microphone channels in one batched STFT.
+
+        Returns:
+            dict of arrays: fire_band_energy, wind_energy, ratio, confidence.
+        """
+        fire, wind = self.band_energies(audio_chunk)
+        ratio, confidence = self.confidence_from_energies(fire, wind)
+        return {
+            "fire_band_energy": np.round(fire, 2),
+            "wind_energy": np.round(wind, 2),
+            "ratio": np.round(ratio, 2),
+            "confidence": np.round(confidence, 2),
+        }
+
+    def stream(self, chunks):
+        """Analyze a generator of PCM chunks, yielding one result per chunk."""
+        self.reset_stream()
+        for chunk in chunks:
+            yield self.analyze_channels(chunk)
+
     def analyze_audio(self, audio_chunk=None, simulate_fire_intensity=None):
         """
         Analyze audio chunk for fire signature.
-        If simulate_fire_intensity is provided (0.0-1.0), bias the simulation.
+        If no chunk is given, fall back to simulation; simulate_fire_intensity
+        (0.0-1.0) biases it.
         """
+        if audio_chunk is not None:
+            batch = self.analyze_channels(audio_chunk)
+            # Multi-channel input collapses to the loudest fire-band channel
+            i = int(np.argmax(batch["fire_band_energy"]))
+            self.last_energy = float(batch["fire_band_energy"][i])
+            return {key: float(values[i]) for key, values in batch.items()}
+
         # Simulation Hook:
         # If we have a strong visual fire, audio 'hears' it too.
         if simulate_fire_intensity is not None and simulate_fire_intensity > 0.6:
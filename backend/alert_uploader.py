@@ -0,0 +1,200 @@
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+
+from http_session import build_session
+
+
+class AlertUploader:
+    """
+    Background, crash-safe delivery of fire alerts to the backend.
+
+    - submit() only writes the alert to an on-disk spool and returns, so the
+      inference loop never waits on the network.
+    - A sender thread posts spooled alerts oldest-first as multipart/form-data
+      (metadata fields + raw JPEG part) over a persistent session.
+    - Failures retry with capped exponential backoff; spooled alerts survive
+      restarts and outages. The spool is capped at `max_queue` alerts, dropping
+      the oldest.
+    - An entry that cannot be read (corrupt JSON, missing JPEG, I/O error)
+      is moved to <spool_dir>/quarantine and the sender moves on. Half-written
+      entries left by a crash are removed on start().
+    """
+
+    def __init__(self, api_url, spool_dir, max_queue=500, timeout=10,
+                 backoff_base=1.0, backoff_max=60.0, session=None, on_response=None):
+        self.api_url = api_url
+        self.spool_dir = spool_dir
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = session or build_session(pool_maxsize=2)
+        self.on_response = on_response
+
+        self.sent = 0
+        self.failed_attempts = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.quarantined = 0
+
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        os.makedirs(spool_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="alert-uploader", daemon=True)
+
+    def start(self):
+        self._sweep_orphans()
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def _pending(self):
+        """Spooled alert ids, oldest first (a .json file marks a complete entry)."""
+        return sorted(name[:-5] for name in os.listdir(self.spool_dir) if name.endswith(".json"))
+
+    def pending_count(self):
+        return len(self._pending())
+
+    def _remove(self, alert_id):
+        for ext in (".json", ".jpg"):
+            try:
+                os.remove(os.path.join(self.spool_dir, alert_id + ext))
+            except FileNotFoundError:
+                pass
+
+    def _quarantine(self, alert_id, error):
+        """Move an unreadable entry out of the queue (kept for inspection)."""
+        print(f"[Uploader] Quarantining unreadable alert {alert_id}: {error}")
+        target = os.path.join(self.spool_dir, "quarantine")
+        try:
+            os.makedirs(target, exist_ok=True)
+            for ext in (".json", ".jpg"):
+                try:
+                    os.replace(os.path.join(self.spool_dir, alert_id + ext), os.path.join(target, alert_id + ext))
+                except FileNotFoundError:
+                    pass
+        except OSError as e:
+            print(f"[Uploader] Could not quarantine {alert_id} ({e}); deleting it")
+            self._remove(alert_id)
+        self.quarantined += 1
+
+    def _sweep_orphans(self):
+        """Delete JPEGs without metadata and unfinished .json.tmp files (crash leftovers)."""
+        with self._lock:
+            names = set(os.listdir(self.spool_dir))
+            for name in names:
+                orphan = name.endswith(".json.tmp") or (name.endswith(".jpg") and name[:-4] + ".json" not in names)
+                if orphan:
+                    try:
+                        os.remove(os.path.join(self.spool_dir, name))
+                    except OSError:
+                        pass
+
+    def submit(self, meta, jpeg_bytes):
+        """
+        Spool one alert for delivery. Never blocks on the network.
+
+        Args:
+            meta: Flat dict of form fields (confidence, lat, lon, ...).
+            jpeg_bytes: Encoded evidence frame.
+        """
+        with self._lock:
+            self._seq += 1
+            alert_id = f"{time.time_ns():020d}_{self._seq:06d}"
+            base = os.path.join(self.spool_dir, alert_id)
+            with open(base + ".jpg", "wb") as f:
+                f.write(jpeg_bytes)
+            # Write the metadata last: its presence marks the entry complete
+            with open(base + ".json.tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(base + ".json.tmp", base + ".json")
+
+            pending = self._pending()
+            for old in pending[:max(0, len(pending) - self.max_queue)]:
+                self._remove(old)
+                self.dropped += 1
+        self._wakeup.set()
+        return alert_id
+
+    def _send(self, alert_id):
+        base = os.path.join(self.spool_dir, alert_id)
+        with open(base + ".json") as f:
+            meta = json.load(f)
+        with open(base + ".jpg", "rb") as f:
+            jpeg = f.read()
+        return self.session.post(
+            self.api_url,
+            data={k: str(v) for k, v in meta.items()},
+            files={"image": (f"{alert_id}.jpg", jpeg, "image/jpeg")},
+            timeout=self.timeout,
+        )
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            pending = self._pending()
+            if not pending:
+                self._wakeup.wait(1.0)
+                continue
+
+            alert_id = pending[0]
+            try:
+                resp = self._send(alert_id)
+            except requests.RequestException as e:
+                resp = None
+                error = str(e)
+            except (ValueError, OSError) as e:
+                if not os.path.exists(os.path.join(self.spool_dir, alert_id + ".json")):
+                    continue  # dropped by the queue cap while we were reading it
+                # Corrupt JSON, a missing JPEG half or an I/O error: retrying cannot help
+                self._quarantine(alert_id, e)
+                continue
+
+            if resp is not None and resp.status_code < 300:
+                self._remove(alert_id)
+                self.sent += 1
+                attempt = 0
+                if self.on_response:
+                    try:
+                        self.on_response(resp.json())
+                    except ValueError:
+                        pass
+                    except Exception as e:
+                        print(f"[Uploader] Response handler failed for {alert_id}: {e}")
+                continue
+            if resp is not None and 400 <= resp.status_code < 500 and resp.status_code not in (408, 429):
+                # The backend will never accept this payload; retrying cannot help
+                print(f"[Uploader] Backend rejected alert {alert_id}: {resp.text}")
+                self._remove(alert_id)
+                self.rejected += 1
+                continue
+
+            self.failed_attempts += 1
+            attempt += 1
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)
+            reason = error if resp is None else f"HTTP {resp.status_code}"
+            print(f"[Uploader] Delivery failed ({reason}); {len(pending)} queued, retrying in {delay:.1f}s")
+            self._stop.wait(delay)
+
+    def stats(self):
+        return {
+            "pending": self.pending_count(),
+            "sent": self.sent,
+            "failed_attempts": self.failed_attempts,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "quarantined": self.quarantined,
+        }
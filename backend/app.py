@@ -1,12 +1,30 @@
 import os
-from flask import Flask, jsonify, send_from_directory, request
+import re
+import sys
+from flask import Flask, Response, abort, jsonify, redirect, send_file, request, stream_with_context
 import requests
 from dotenv import load_dotenv
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
-app = Flask(__name__, static_folder=BASE_DIR, static_url_path="")
+# Backend modules import each other flat (same as tests and live_feed_monitor)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dispatch_scheduler import DispatchScheduler
+from event_stream import EventBroadcaster, format_sse
+from evidence_store import EvidenceStore
+from fire_spread import fire_spread
+from firms_service import FirmsService
+from pipeline import CognitivePipeline
+from sat_filter import sat_filter
+from spatial_index import spatial_index
+from static_assets import StaticAssets
+from token_cache import OAuthTokenCache, TokenRequestError
+from wind_field import DEFAULT_WIND, FileWindProvider, OpenMeteoWindProvider, StubWindProvider, WindFieldService
+
+# No implicit static folder: only the allowlisted dashboard assets are served
+app = Flask(__name__, static_folder=None)
 
 
 def get_env(name, default=""):
@@ -14,16 +32,113 @@ def get_env(name, default=""):
     return value if value is not None else ""
 
 
+firms_service = FirmsService(
+    get_env("FIRMS_MAP_KEY"),
+    tile_deg=float(get_env("FIRMS_TILE_DEG", "10")),
+    ttl_seconds=int(get_env("FIRMS_CACHE_TTL", "600")),
+)
+
+# Evidence URLs name their content, so browsers may keep them for a year
+EVIDENCE_MAX_AGE = 365 * 86400
+EVIDENCE_NAME_RE = re.compile(r"^(?P<digest>[0-9a-f]{64})(?:\.(?P<variant>\w+))?\.jpg$")
+
+# FIRMS hotspots stay in the spatial index for a day after they were fetched
+HOTSPOT_TTL_SECONDS = int(get_env("HOTSPOT_TTL", "86400"))
+
+
+def wind_provider():
+    """WIND_PROVIDER=stub (default, offline) | file (WIND_FILE .npz) | open-meteo."""
+    kind = get_env("WIND_PROVIDER", "stub").lower()
+    if kind == "file":
+        return FileWindProvider(get_env("WIND_FILE"))
+    if kind == "open-meteo":
+        return OpenMeteoWindProvider()
+    return StubWindProvider(float(get_env("WIND_STUB_SPEED_KMH", "10")), float(get_env("WIND_STUB_BEARING", "0")))
+
+
+wind_field = WindFieldService(
+    wind_provider(),
+    step_deg=float(get_env("WIND_GRID_DEG", "0.25")),
+    ttl_seconds=int(get_env("WIND_CACHE_TTL", "3600")),
+    cache_dir=get_env("WIND_CACHE_DIR") or None,
+)
+
+dispatcher = DispatchScheduler(
+    cruise_kmh=float(get_env("DRONE_CRUISE_KMH", "60")),
+    range_km=float(get_env("DRONE_RANGE_KM", "30")),
+)
+
+# Content-addressed evidence JPEGs (+ thumb/preview variants), served by /api/evidence
+evidence_store = EvidenceStore(
+    get_env("EVIDENCE_DIR") or os.path.join(BASE_DIR, "evidence"),
+    max_bytes=int(float(get_env("EVIDENCE_MAX_MB", "2048")) * 1024 * 1024),
+    max_age_seconds=float(get_env("EVIDENCE_MAX_AGE_DAYS", "7")) * 86400,
+)
+
+# Dashboard files, fingerprinted and precompressed once at startup
+assets = StaticAssets(BASE_DIR)
+
+pipeline = CognitivePipeline(evidence_store.directory, wind=wind_field, dispatch=dispatcher, store=evidence_store)
+events = EventBroadcaster()
+
+# Fields whose change is worth pushing to dashboards
+STATUS_KEY_FIELDS = ("decision", "final_score", "vision_conf", "audio_conf", "chem_conf",
+                     "evidence_image", "lat", "lon", "persons", "animals", "planning")
+# An alert is news when any of these differ from the last one pushed
+ALERT_KEY_FIELDS = ("decision", "lat", "lon", "evidence_image")
+
+
+def publish_snapshot(snapshot):
+    events.publish("status", snapshot, key=tuple(snapshot.get(k) for k in STATUS_KEY_FIELDS))
+    # Alerts are queued for every client (not coalesced), so only push real
+    # ones: a triggered sniffer or a decision change (e.g. back to SAFE)
+    if not snapshot["triggered_sniffer"] and snapshot["decision"] == snapshot["previous_decision"]:
+        return
+    events.publish(
+        "alert",
+        {
+            "decision": snapshot["decision"],
+            "final_score": snapshot["final_score"],
+            "lat": snapshot["lat"],
+            "lon": snapshot["lon"],
+            "evidence_image": snapshot["evidence_image"],
+            "updated_at": snapshot["updated_at"],
+        },
+        coalesce=False,
+        key=tuple(snapshot.get(k) for k in ALERT_KEY_FIELDS),
+    )
+
+
+pipeline.listeners.append(publish_snapshot)
+
+sentinel_tokens = None
+
+
+def get_sentinel_tokens():
+    """Token cache for the configured Sentinel Hub client; rebuilt if credentials change."""
+    global sentinel_tokens
+    client_id = get_env("SENTINELHUB_CLIENT_ID")
+    client_secret = get_env("SENTINELHUB_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        return None
+    if sentinel_tokens is None or (sentinel_tokens.client_id, sentinel_tokens.client_secret) != (client_id, client_secret):
+        sentinel_tokens = OAuthTokenCache(
+            get_env("SENTINELHUB_TOKEN_URL", "https://services.sentinel-hub.com/oauth/token"),
+            client_id,
+            client_secret,
+        )
+    return sentinel_tokens
+
+
 @app.get("/")
 def index():
-    return send_from_directory(BASE_DIR, "index.html")
+    return static_files("index.html")
 
 
 @app.get("/config")
 def config():
     return jsonify(
         {
-            "FIRMS_MAP_KEY": get_env("FIRMS_MAP_KEY"),
             "FIRMS_WMS_URL": get_env("FIRMS_WMS_URL", "https://firms.modaps.eosdis.nasa.gov/wms/"),
             "OPENWEATHER_KEY": get_env("OPENWEATHER_KEY"),
             "DEFAULT_CENTER": [75, 20],
@@ -33,29 +148,288 @@ def config():
     )
 
 
+@app.get("/api/firms")
+def firms_hotspots():
+    if not firms_service.map_key:
+        return jsonify({"error": "FIRMS key not configured"}), 400
+    try:
+        west, south, east, north = [float(v) for v in request.args.get("bbox", "").split(",")]
+        days = int(request.args.get("days", 1))
+    except ValueError:
+        return jsonify({"error": "bbox must be west,south,east,north"}), 400
+
+    west, east = max(-180.0, west), min(180.0, east)
+    south, north = max(-90.0, south), min(90.0, north)
+    if west >= east or south >= north:
+        return jsonify({"error": "Empty bbox"}), 400
+
+    collection = firms_service.get_features(west, south, east, north, days=days)
+    if collection.get("errors") and not collection["features"]:
+        return jsonify({"error": "FIRMS request failed", "details": collection["errors"]}), 502
+    response = jsonify(collection)
+    # A partial collection (some areas failed) must be refetched, not cached
+    response.headers["Cache-Control"] = "no-store" if collection.get("errors") else "public, max-age=60"
+    return response
+
+
+def index_hotspots(features):
+    """
+    Keep fetched FIRMS hotspots queryable next to detections and alerts.
+    Runs once per area fetched upstream (a FirmsService listener), not per
+    request, and loads the whole area in one bulk_load.
+    """
+    if not features:
+        return
+    lons, lats = zip(*(f["geometry"]["coordinates"] for f in features))
+    props = [f["properties"] for f in features]
+    keys = [("hotspot", p.get("source"), lat, lon, p.get("date"), p.get("time"))
+            for p, lat, lon in zip(props, lats, lons)]
+    spatial_index.bulk_load(lats, lons, "hotspot", ttl=HOTSPOT_TTL_SECONDS, data=props, keys=keys)
+
+
+firms_service.listeners.append(index_hotspots)
+# New FIRMS pulls keep the 30-day thermal baseline rolling (THERMAL_BASELINE_DIR)
+if sat_filter.history_db is not None:
+    firms_service.listeners.append(sat_filter.history_db.ingest_features)
+
+
+def spatial_query_args():
+    """Shared ?layers=a,b&limit=N parsing for the /api/spatial routes."""
+    layers = request.args.get("layers")
+    layers = [l for l in layers.split(",") if l] if layers else None
+    limit = min(int(request.args.get("limit", 1000)), 10000)
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return layers, limit
+
+
+@app.get("/api/spatial/bbox")
+def spatial_bbox():
+    try:
+        west, south, east, north = [float(v) for v in request.args.get("bbox", "").split(",")]
+        layers, limit = spatial_query_args()
+    except ValueError:
+        return jsonify({"error": "bbox must be west,south,east,north; limit must be a positive integer"}), 400
+    return jsonify({"results": spatial_index.bbox(west, south, east, north, layers=layers, limit=limit)})
+
+
+@app.get("/api/spatial/radius")
+def spatial_radius():
+    try:
+        lat, lon = float(request.args["lat"]), float(request.args["lon"])
+        km = float(request.args.get("km", 10))
+        layers, limit = spatial_query_args()
+    except (KeyError, ValueError):
+        return jsonify({"error": "lat and lon are required; km must be a number, limit a positive integer"}), 400
+    return jsonify({"results": spatial_index.radius(lat, lon, km, layers=layers, limit=limit)})
+
+
+@app.get("/api/spatial/nearest")
+def spatial_nearest():
+    try:
+        lat, lon = float(request.args["lat"]), float(request.args["lon"])
+        k = min(int(request.args.get("k", 5)), 1000)
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        max_km = float(request.args["max_km"]) if "max_km" in request.args else None
+        layers, _ = spatial_query_args()
+    except (KeyError, ValueError):
+        return jsonify({"error": "lat and lon are required; k must be a positive integer, max_km a number"}), 400
+    return jsonify({"results": spatial_index.nearest(lat, lon, k=k, layers=layers, max_km=max_km)})
+
+
+@app.get("/api/spread/cones")
+def spread_cones():
+    """1-hour spread cones for every indexed FIRMS hotspot in a bbox, in one batch."""
+    try:
+        west, south, east, north = [float(v) for v in request.args.get("bbox", "").split(",")]
+        wind_speed = request.args.get("wind_speed_kmh")
+        wind_speed = float(wind_speed) if wind_speed is not None else None
+        wind_bearing = float(request.args.get("wind_bearing", 0.0))
+        _, limit = spatial_query_args()
+    except ValueError:
+        return jsonify({"error": "bbox must be west,south,east,north; wind values must be numbers"}), 400
+    hotspots = spatial_index.bbox(west, south, east, north, layers=["hotspot"], limit=limit)
+    lats, lons = [h["lat"] for h in hotspots], [h["lon"] for h in hotspots]
+    if wind_speed is None:
+        # Per-fire wind from the cached wind field: one lookup per tile, not per fire
+        try:
+            wind_speed, wind_bearing = wind_field.sample(lats, lons)
+        except Exception as e:
+            print(f"[Spread] Wind field unavailable, using default wind: {e}")
+            wind_speed, wind_bearing = DEFAULT_WIND
+    cones = fire_spread.calculate_spread_cones(lats, lons, wind_speed, wind_bearing, geojson=True)
+    return jsonify(cones["geojson"])
+
+
+@app.get("/api/wind")
+def wind():
+    """Wind at a batch of points: ?lat=1.5,2&lon=30,31 (bearing = direction the wind blows towards)."""
+    try:
+        lats = [float(v) for v in request.args.get("lat", "").split(",")]
+        lons = [float(v) for v in request.args.get("lon", "").split(",")]
+        if len(lats) != len(lons) or len(lats) > 10000:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "lat and lon must be equal-length comma-separated lists (max 10000)"}), 400
+    try:
+        speed, bearing = wind_field.sample(lats, lons)
+    except Exception as e:
+        return jsonify({"error": f"Wind field unavailable: {e}"}), 502
+    return jsonify({
+        "speed_kmh": [round(v, 2) for v in speed.tolist()],
+        "bearing": [round(v, 1) for v in bearing.tolist()],
+        "cache": wind_field.stats(),
+    })
+
+
+@app.get("/api/dispatch")
+def dispatch_status():
+    return jsonify({"missions": list(dispatcher.missions.values()), "stats": dispatcher.stats()})
+
+
+@app.post("/api/drones")
+def drone_telemetry():
+    """Register drones / report telemetry: {"drones": [{"drone_id", "lat", "lon", "battery", "online"}]}."""
+    body = request.get_json(silent=True) or {}
+    try:
+        for drone in body.get("drones", [body] if "drone_id" in body else []):
+            dispatcher.update_drone(str(drone["drone_id"]), lat=drone.get("lat"), lon=drone.get("lon"),
+                                    battery=drone.get("battery"), online=drone.get("online"))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid drone telemetry: {e}"}), 400
+    return jsonify({"missions": dispatcher.dispatch(), "stats": dispatcher.stats()})
+
+
+@app.post("/api/missions/<mission_id>/complete")
+def complete_mission(mission_id):
+    battery = (request.get_json(silent=True) or {}).get("battery")
+    try:
+        mission = dispatcher.complete_mission(mission_id, battery=battery)
+    except (TypeError, ValueError):
+        return jsonify({"error": "battery must be a number"}), 400
+    if mission is None:
+        return jsonify({"error": "Unknown mission"}), 404
+    return jsonify({"completed": mission, "missions": dispatcher.dispatch()})
+
+
+@app.get("/api/evidence/<name>")
+def evidence(name):
+    """<digest>.jpg or <digest>.<variant>.jpg; content-addressed, so cached forever with a strong ETag."""
+    match = EVIDENCE_NAME_RE.match(name)
+    if match is None:
+        return jsonify({"error": "Unknown evidence"}), 404
+    digest, variant = match.group("digest", "variant")
+    path, data = pipeline.store.open(digest, variant)
+    etag = f"{digest}.{variant}" if variant else digest
+    if path is None and data is None and variant in pipeline.store.variants and pipeline.store.open(digest) != (None, None):
+        # Variant still queued or never produced: send the original, uncached, so this URL serves the real one later
+        response = redirect(pipeline.store.url(digest))
+        response.cache_control.no_cache = True
+        return response
+    if path is not None:
+        response = send_file(path, mimetype="image/jpeg", etag=etag, conditional=True, max_age=EVIDENCE_MAX_AGE)
+    elif data is not None:
+        # Still in the write queue
+        response = Response(data, mimetype="image/jpeg")
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = EVIDENCE_MAX_AGE
+        response = response.make_conditional(request, accept_ranges=True, complete_length=len(data))
+    else:
+        return jsonify({"error": "Unknown evidence"}), 404
+    response.cache_control.immutable = True
+    return response
+
+
+@app.get("/api/evidence/stats")
+def evidence_stats():
+    return jsonify(pipeline.store.stats())
+
+
+@app.get("/api/spatial/stats")
+def spatial_stats():
+    return jsonify(spatial_index.stats())
+
+
+@app.post("/api/vision-trigger")
+def vision_trigger():
+    image = None
+    if request.mimetype == "multipart/form-data":
+        # AlertUploader: form fields + raw JPEG part
+        payload = request.form.to_dict()
+        if "image" in request.files:
+            image = request.files["image"].read()
+    else:
+        payload = request.get_json(silent=True)
+    if not payload:
+        return jsonify({"error": "Expected JSON or multipart alert payload"}), 400
+    try:
+        snapshot = pipeline.ingest(payload, image=image)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(
+        {
+            "status": "accepted",
+            "decision": snapshot["decision"],
+            "final_score": snapshot["final_score"],
+            "levels_passed": snapshot["min_levels_passed"],
+            "reasoning": snapshot["reasoning"],
+            "saved_image": snapshot["evidence_image"],
+        }
+    )
+
+
+@app.get("/api/fusion-status")
+def fusion_status():
+    return jsonify(pipeline.snapshot())
+
+
+@app.get("/api/events")
+def event_stream():
+    """Server-Sent Events push of fusion status and new alerts."""
+    sub = events.subscribe()
+    if not events.stats()["published"]:
+        sub.offer("status", format_sse("status", pipeline.snapshot()), coalesce=True)
+    response = Response(stream_with_context(events.stream(sub)), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 @app.get("/sentinelhub/token")
 def sentinelhub_token():
-    client_id = get_env("SENTINELHUB_CLIENT_ID")
-    client_secret = get_env("SENTINELHUB_CLIENT_SECRET")
-    if not client_id or not client_secret:
+    tokens = get_sentinel_tokens()
+    if tokens is None:
         return jsonify({"error": "Sentinel Hub credentials not configured"}), 400
 
-    token_url = "https://services.sentinel-hub.com/oauth/token"
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "client_secret": client_secret,
-    }
-    response = requests.post(token_url, data=data, timeout=20)
-    if response.status_code != 200:
-        return jsonify({"error": "Token request failed", "details": response.text}), 502
+    try:
+        token = tokens.get_token()
+    except TokenRequestError as e:
+        return jsonify({"error": "Token request failed", "details": e.details}), 502
+    except requests.RequestException as e:
+        return jsonify({"error": "Token request failed", "details": str(e)}), 502
+
+    return jsonify(token)
 
-    return jsonify(response.json())
+
+@app.get("/sentinelhub/token/stats")
+def sentinelhub_token_stats():
+    tokens = get_sentinel_tokens()
+    if tokens is None:
+        return jsonify({"error": "Sentinel Hub credentials not configured"}), 400
+    return jsonify(tokens.stats())
 
 
 @app.get("/<path:filename>")
 def static_files(filename):
-    return send_from_directory(BASE_DIR, filename)
+    if app.debug:
+        assets.refresh()
+    response = assets.response(filename, request)
+    if response is None:
+        abort(404)
+    return response
 
 
 if __name__ == "__main__":
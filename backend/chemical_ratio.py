@@ -1,6 +1,88 @@
-
 import random
 
+import numpy as np
+
+
+class GasBaseline:
+    """
+    Per-sensor rolling CO baseline: EWMA mean and EWMA variance.
+
+    State lives in preallocated fixed-size arrays indexed by sensor slot, so
+    the baseline costs O(1) memory per sensor and no reading history is kept.
+    """
+
+    def __init__(self, capacity=1024, alpha=0.05, warmup=10):
+        self.alpha = alpha
+        self.warmup = warmup
+        self.mean = np.zeros(capacity)
+        self.var = np.zeros(capacity)
+        self.count = np.zeros(capacity, dtype=np.int64)
+
+    def _ensure(self, max_slot):
+        capacity = len(self.mean)
+        if max_slot < capacity:
+            return
+        while capacity <= max_slot:
+            capacity *= 2
+        for name in ("mean", "var", "count"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def update(self, sensors, values):
+        """
+        Score each reading against its sensor's baseline, then fold it in.
+
+        `sensors` may repeat (a stream of records); repeats are applied in
+        order, one vectorized pass per occurrence rank.
+
+        Returns:
+            (z-score, baseline mean) per reading, both taken before the
+            reading is added; z is NaN during warm-up.
+        """
+        sensors = np.asarray(sensors, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        if len(sensors) == 0:
+            return np.empty(0), np.empty(0)
+        self._ensure(int(sensors.max()))
+
+        z = np.empty(len(values))
+        base = np.empty(len(values))
+        counts = np.bincount(sensors)
+        if counts.max() == 1:
+            self._update_unique(sensors, values, z, base, np.arange(len(sensors)))
+            return z, base
+
+        # Occurrence rank of each reading within its sensor (0 = first)
+        order = np.argsort(sensors, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.empty(len(sensors), dtype=np.intp)
+        rank[order] = np.arange(len(sensors)) - starts[sensors[order]]
+        by_rank = np.argsort(rank, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(rank))))
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            rows = by_rank[a:b]
+            self._update_unique(sensors[rows], values[rows], z, base, rows)
+        return z, base
+
+    def _update_unique(self, slots, x, z_out, base_out, rows):
+        mean = self.mean[slots]
+        var = self.var[slots]
+        count = self.count[slots]
+        diff = x - mean
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(count >= self.warmup, diff / np.sqrt(var), np.nan)
+        z_out[rows] = z
+        base_out[rows] = np.where(count > 0, mean, np.nan)
+
+        first = count == 0
+        a = self.alpha
+        self.mean[slots] = np.where(first, x, mean + a * diff)
+        self.var[slots] = np.where(first, 0.0, (1 - a) * (var + a * diff * diff))
+        self.count[slots] = count + 1
+
+
 class ChemicalRatio:
     """
     Level 3C: Chemical Ratio Module (The Senses)
@@ -9,35 +91,110 @@ class ChemicalRatio:
     - Analyze gas ratios to distinguish fire from false alarms.
     - CO/CO2 > 0.1 -> Smoldering biomass
     - NOx/CO > 0.5 -> Vehicle exhaust (false alarm)
+    - CO rising well above the sensor's own rolling baseline (batch path).
     - Output Chem_Conf [0,1].
     """
+
+    RECORD_DTYPE = np.dtype([("sensor", np.intp), ("timestamp", np.float64),
+                             ("co", np.float64), ("co2", np.float64), ("nox", np.float64)])
+
+    def __init__(self, baseline_alpha=0.05, baseline_warmup=10, rise_sigma=4.0, rise_min_ppm=10.0):
+        self.baseline = GasBaseline(alpha=baseline_alpha, warmup=baseline_warmup)
+        self.rise_sigma = rise_sigma
+        self.rise_min_ppm = rise_min_ppm
+
+    @staticmethod
+    def confidence_from_readings(co, co2, nox, co_rise=None):
+        """Vectorized ratio rules (same as the scalar path) over ppm arrays."""
+        co = np.asarray(co, dtype=np.float64)
+        co2 = np.asarray(co2, dtype=np.float64)
+        nox = np.asarray(nox, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            co_co2_ratio = np.where(co2 > 0, co / np.where(co2 > 0, co2, 1.0), 0.0)
+            nox_co_ratio = np.where(co > 0, nox / np.where(co > 0, co, 1.0), 0.0)
+        confidence = 0.6 * (co_co2_ratio > 0.1) + 0.3 * (co > 50)
+        if co_rise is not None:
+            confidence = confidence + 0.3 * co_rise
+        confidence = np.where(nox_co_ratio > 0.5, confidence * 0.2, confidence)
+        return co_co2_ratio, nox_co_ratio, np.minimum(1.0, np.round(confidence, 2))
+
+    def analyze_batch(self, co, co2, nox, sensors=None, timestamps=None):
+        """
+        Evaluate many gas readings at once.
+
+        Args:
+            co, co2, nox: ppm arrays.
+            sensors: Optional int sensor slot per reading; enables the
+                delta-from-baseline rule and updates each sensor's baseline.
+            timestamps: Optional; readings are applied to the baselines in
+                timestamp order (stable), otherwise in array order.
+
+        Returns:
+            dict of arrays: co_co2_ratio, nox_co_ratio, co_zscore (NaN
+            without a warmed-up baseline), co_rise, confidence.
+        """
+        co = np.asarray(co, dtype=np.float64)
+        co2 = np.asarray(co2, dtype=np.float64)
+        nox = np.asarray(nox, dtype=np.float64)
+
+        co_rise = None
+        z = np.full(co.shape, np.nan)
+        if sensors is not None:
+            sensors = np.asarray(sensors, dtype=np.intp)
+            if timestamps is not None:
+                order = np.argsort(np.asarray(timestamps), kind="stable")
+                z_sorted, base_sorted = self.baseline.update(sensors[order], co[order])
+                z[order] = z_sorted
+                base = np.empty(co.shape)
+                base[order] = base_sorted
+            else:
+                z, base = self.baseline.update(sensors, co)
+            co_rise = (z > self.rise_sigma) & (co - base > self.rise_min_ppm)
+
+        co_co2_ratio, nox_co_ratio, confidence = self.confidence_from_readings(co, co2, nox, co_rise)
+        return {
+            "co_co2_ratio": co_co2_ratio,
+            "nox_co_ratio": nox_co_ratio,
+            "co_zscore": z,
+            "co_rise": np.zeros(co.shape, dtype=bool) if co_rise is None else co_rise,
+            "confidence": confidence,
+        }
+
+    def stream(self, records, chunk_size=65536):
+        """
+        Evaluate a stream of (sensor, timestamp, co, co2, nox) records.
+
+        Records are packed into one reused fixed-size chunk buffer and scored
+        a chunk at a time; yields (chunk_records, analyze_batch result).
+        """
+        buffer = np.empty(chunk_size, dtype=self.RECORD_DTYPE)
+        n = 0
+        for record in records:
+            buffer[n] = record
+            n += 1
+            if n == chunk_size:
+                yield self._score_chunk(buffer[:n])
+                n = 0
+        if n:
+            yield self._score_chunk(buffer[:n])
+
+    def _score_chunk(self, chunk):
+        result = self.analyze_batch(chunk["co"], chunk["co2"], chunk["nox"],
+                                    sensors=chunk["sensor"], timestamps=chunk["timestamp"])
+        return chunk.copy(), result
     
     def analyze_gas(self, sensor_readings=None, simulate_fire_intensity=None):
         """
         Analyze gas sensor readings.
-        If simulate_fire_intensity is provided, bias the simulation.
+        sensor_readings: {"co": ppm, "co2": ppm, "nox": ppm}; without it the
+        reading is simulated, biased by simulate_fire_intensity if provided.
         """
-        # SIMULATION HOOK
-        co = random.uniform(0, 5)
-        co2 = random.uniform(400, 450)
-        nox = random.uniform(0, 10)
-        
-        # Bias towards fire if visual detection is strong
-        if simulate_fire_intensity is not None and simulate_fire_intensity > 0.6:
-            # Force "Smoldering Fire" signature (High CO, High CO2)
-            co = random.uniform(50, 150)
-            co2 = random.uniform(600, 900)
-            nox = random.uniform(5, 20)
-        elif random.random() > 0.8: 
-            # Occasional random event (Vehicle or Fire)
-            if random.random() > 0.5:
-                # Fire
-                co = random.uniform(20, 150)
-                co2 = random.uniform(500, 800)
-            else:
-                # Vehicle (False Alarm)
-                co = random.uniform(10, 50)
-                nox = random.uniform(50, 100)
+        if sensor_readings is not None:
+            co = float(sensor_readings["co"])
+            co2 = float(sensor_readings["co2"])
+            nox = float(sensor_readings["nox"])
+        else:
+            co, co2, nox = self._simulate_reading(simulate_fire_intensity)
 
         # Avoid div by zero
         co_co2_ratio = co / co2 if co2 > 0 else 0
@@ -65,4 +222,28 @@ class ChemicalRatio:
             "confidence": min(1.0, round(confidence, 2))
         }
 
+    def _simulate_reading(self, simulate_fire_intensity=None):
+        # SIMULATION HOOK
+        co = random.uniform(0, 5)
+        co2 = random.uniform(400, 450)
+        nox = random.uniform(0, 10)
+        
+        # Bias towards fire if visual detection is strong
+        if simulate_fire_intensity is not None and simulate_fire_intensity > 0.6:
+            # Force "Smoldering Fire" signature (High CO, High CO2)
+            co = random.uniform(50, 150)
+            co2 = random.uniform(600, 900)
+            nox = random.uniform(5, 20)
+        elif random.random() > 0.8: 
+            # Occasional random event (Vehicle or Fire)
+            if random.random() > 0.5:
+                # Fire
+                co = random.uniform(20, 150)
+                co2 = random.uniform(500, 800)
+            else:
+                # Vehicle (False Alarm)
+                co = random.uniform(10, 50)
+                nox = random.uniform(50, 100)
+        return co, co2, nox
+
 chemical_module = ChemicalRatio()
@@ -0,0 +1,352 @@
+import heapq
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from handshake import new_mission_id
+from spatial_index import EARTH_RADIUS_KM
+
+# Drone states
+IDLE, ASSIGNED, OFFLINE = 0, 1, 2
+DRONE_STATES = ("IDLE", "ASSIGNED", "OFFLINE")
+
+# Cost of a drone that cannot reach an incident (minutes); finite so auction bids stay finite
+INFEASIBLE_MIN = 1e6
+
+
+def distance_matrix_km(lats1, lons1, lats2, lons2):
+    """Great-circle distances between two point arrays, shaped (len(lats1), len(lats2))."""
+    lat1, lon1 = np.radians(lats1)[:, None], np.radians(lons1)[:, None]
+    lat2, lon2 = np.radians(lats2)[None, :], np.radians(lons2)[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def auction_assign(cost, eps=0.01):
+    """
+    Min-cost assignment of rows (incidents) to distinct columns (drones).
+
+    Forward auction (Bertsekas), with every unassigned row bidding in the
+    same vectorized round. Needs rows <= columns; the result is within
+    rows * eps of the optimal total cost. Square problems use epsilon
+    scaling (coarse bids first, prices kept between phases). Rectangular
+    ones run a single phase from zero prices, so columns nobody bid for
+    stay at the minimum price as the asymmetric case requires.
+
+    Returns:
+        int array (rows,) of assigned column indices.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    rows, cols = cost.shape
+    if rows > cols:
+        raise ValueError("auction_assign needs at least as many columns as rows")
+    value = -cost
+    prices = np.zeros(cols)
+    phase_eps = eps
+    if rows == cols and rows > 1:
+        phase_eps = max(eps, float(np.ptp(cost)) / 5.0)
+    while True:
+        assigned = _auction_phase(value, prices, phase_eps)
+        if phase_eps <= eps:
+            return assigned
+        phase_eps = max(eps, phase_eps / 5.0)
+
+
+def _auction_phase(value, prices, eps):
+    """One auction run to a full assignment; updates `prices` in place."""
+    rows, cols = value.shape
+    owner = np.full(cols, -1, dtype=np.intp)
+    assigned = np.full(rows, -1, dtype=np.intp)
+    bidders = np.arange(rows)
+    while len(bidders):
+        net = value[bidders] - prices
+        best = np.argmax(net, axis=1)
+        r = np.arange(len(bidders))
+        best_net = net[r, best]
+        if cols > 1:
+            net[r, best] = -np.inf
+            second_net = net.max(axis=1)
+        else:
+            second_net = best_net
+        bids = prices[best] + (best_net - second_net) + eps
+
+        # Highest bid per column wins; ties go to the lower row
+        order = np.lexsort((-bids, best))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = best[order][1:] != best[order][:-1]
+        won = order[first]
+        columns = best[won]
+
+        outbid = owner[columns]
+        assigned[outbid[outbid >= 0]] = -1
+        owner[columns] = bidders[won]
+        assigned[bidders[won]] = columns
+        prices[columns] = bids[won]
+        bidders = np.flatnonzero(assigned < 0)
+    return assigned
+
+
+class DispatchScheduler:
+    """
+    Level 4 support: Drone dispatch (The Brain's fleet)
+
+    Responsibility:
+    - Keep open incidents (triggered_sniffer decisions) in a priority queue
+      ranked by fusion score and spread rate (ROS).
+    - Track the fleet: position, battery and state per drone.
+    - Assign idle drones to the highest-priority waiting incidents, pairing
+      them by an auction (min total ETA). Each dispatch() only looks at
+      waiting incidents and idle drones, so new incidents and freed drones
+      re-plan incrementally; missions in flight are left alone.
+    - Give every mission a unique id.
+    """
+
+    def __init__(self, cruise_kmh=60.0, range_km=30.0, reserve=0.2, ros_weight=0.1, eps_min=0.01,
+                 clock=time.time):
+        """
+        Args:
+            cruise_kmh: Drone ground speed used for ETAs.
+            range_km: Flight distance on a full battery.
+            reserve: Battery fraction every flight must leave unused; a
+                drone only takes an incident it can reach and return from.
+            ros_weight: Priority added per km/h of spread rate on top of
+                the fusion score.
+            eps_min: Auction bid increment in minutes (optimality slack per
+                assignment).
+        """
+        self.cruise_kmh = cruise_kmh
+        self.range_km = range_km
+        self.reserve = reserve
+        self.ros_weight = ros_weight
+        self.eps_min = eps_min
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._seq = itertools.count()
+        self._heap = []           # (-priority, seq, incident id)
+        self.incidents = {}       # incident id -> dict
+        self.missions = {}        # mission id -> dict (open missions)
+        self._used_ids = set()
+        self.completed = 0
+        self.dispatch_calls = 0
+
+        self.drone_ids = []
+        self._drone_index = {}
+        self.lat = np.empty(0)
+        self.lon = np.empty(0)
+        self.battery = np.empty(0)
+        self.state = np.empty(0, dtype=np.int8)
+
+    # ---- fleet --------------------------------------------------------
+
+    def update_drone(self, drone_id, lat=None, lon=None, battery=None, online=None):
+        """Register a drone or apply a telemetry update (position, battery 0-1, online flag)."""
+        lat, lon, battery = (None if v is None else float(v) for v in (lat, lon, battery))
+        with self._lock:
+            i = self._drone_index.get(drone_id)
+            if i is None:
+                if lat is None or lon is None:
+                    raise ValueError(f"New drone {drone_id!r} needs a position")
+                i = self._drone_index[drone_id] = len(self.drone_ids)
+                self.drone_ids.append(drone_id)
+                self.lat = np.append(self.lat, 0.0)
+                self.lon = np.append(self.lon, 0.0)
+                self.battery = np.append(self.battery, 1.0)
+                self.state = np.append(self.state, np.int8(IDLE))
+            if lat is not None:
+                self.lat[i] = lat
+            if lon is not None:
+                self.lon[i] = lon
+            if battery is not None:
+                self.battery[i] = min(max(battery, 0.0), 1.0)
+            if online is not None and self.state[i] != ASSIGNED:
+                self.state[i] = IDLE if online else OFFLINE
+
+    def add_drones(self, drone_ids, lats, lons, battery=1.0):
+        """Register a fleet in one call."""
+        with self._lock:
+            n = len(drone_ids)
+            for drone_id in drone_ids:
+                if drone_id in self._drone_index:
+                    raise ValueError(f"Drone {drone_id!r} already registered")
+                self._drone_index[drone_id] = len(self.drone_ids)
+                self.drone_ids.append(drone_id)
+            self.lat = np.concatenate([self.lat, np.asarray(lats, dtype=np.float64)])
+            self.lon = np.concatenate([self.lon, np.asarray(lons, dtype=np.float64)])
+            self.battery = np.concatenate([self.battery, np.broadcast_to(np.asarray(battery, dtype=np.float64), (n,))])
+            self.state = np.concatenate([self.state, np.full(n, IDLE, dtype=np.int8)])
+
+    # ---- incidents ----------------------------------------------------
+
+    def priority(self, score, ros_kmh):
+        return float(score) + self.ros_weight * float(ros_kmh)
+
+    def submit_incident(self, lat, lon, score, ros_kmh=0.0, incident_id=None, config=None):
+        """
+        Open an incident, or update one that is already open (a repeated
+        alert for the same fire). Returns the incident id.
+
+        Args:
+            score: Fusion final_score.
+            ros_kmh: Spread rate from fire_spread.
+            config: Drone config from the adaptive handshake; it travels
+                with the mission.
+        """
+        with self._lock:
+            if incident_id is None:
+                incident_id = f"incident_{next(self._seq)}"
+            incident = self.incidents.get(incident_id)
+            priority = self.priority(score, ros_kmh)
+            if incident is None:
+                incident = self.incidents[incident_id] = {
+                    "incident_id": incident_id, "mission_id": None, "queued": None, "opened_at": self.clock()}
+            incident.update({"lat": float(lat), "lon": float(lon), "score": float(score),
+                             "ros_kmh": float(ros_kmh), "priority": priority, "config": config})
+            if incident["mission_id"] is None:
+                self._requeue(incident)
+        return incident_id
+
+    def close_incident(self, incident_id):
+        """Drop an incident; its drone (if any) is released. Returns True if it was open."""
+        with self._lock:
+            incident = self.incidents.pop(incident_id, None)
+            if incident is None:
+                return False
+            mission = self.missions.pop(incident["mission_id"], None) if incident["mission_id"] else None
+            if mission is not None:
+                self.state[self._drone_index[mission["drone_id"]]] = IDLE
+            return True
+
+    def _pop_waiting(self, limit):
+        """Highest-priority waiting incidents (at most `limit`), skipping stale heap entries."""
+        popped = []
+        while self._heap and len(popped) < limit:
+            _, seq, incident_id = heapq.heappop(self._heap)
+            incident = self.incidents.get(incident_id)
+            if incident is None or incident["queued"] != seq:
+                continue
+            incident["queued"] = None
+            popped.append(incident)
+        return popped
+
+    def _requeue(self, incident):
+        # Only the newest heap entry of an incident counts; older ones are skipped when popped
+        incident["queued"] = seq = next(self._seq)
+        heapq.heappush(self._heap, (-incident["priority"], seq, incident["incident_id"]))
+
+    # ---- dispatch -----------------------------------------------------
+
+    def dispatch(self):
+        """
+        Assign idle drones to waiting incidents.
+
+        The top incidents (one per idle drone, in priority order) are paired
+        with the idle drones by auction on ETA. A drone whose battery cannot
+        cover the round trip is never sent; incidents left without a
+        reachable drone go back to the queue.
+
+        Returns:
+            List of new mission dicts.
+        """
+        with self._lock:
+            self.dispatch_calls += 1
+            idle = np.flatnonzero(self.state == IDLE)
+            if not len(idle) or not self._heap:
+                return []
+            usable_km = np.maximum(self.battery[idle] - self.reserve, 0.0) * self.range_km
+
+            candidates, skipped = [], []
+            while len(candidates) < len(idle):
+                batch = self._pop_waiting(len(idle) - len(candidates))
+                if not batch:
+                    break
+                dist = distance_matrix_km(np.array([c["lat"] for c in batch]), np.array([c["lon"] for c in batch]),
+                                          self.lat[idle], self.lon[idle])
+                reachable = (2 * dist <= usable_km).any(axis=1)
+                for incident, ok, row in zip(batch, reachable.tolist(), dist):
+                    if ok:
+                        candidates.append((incident, row))
+                    else:
+                        skipped.append(incident)
+            for incident in skipped:
+                self._requeue(incident)
+            if not candidates:
+                return []
+
+            dist = np.stack([row for _, row in candidates])
+            eta_min = dist / self.cruise_kmh * 60.0
+            cost = np.where(2 * dist <= usable_km, eta_min, INFEASIBLE_MIN)
+            columns = auction_assign(cost, eps=self.eps_min)
+
+            missions = []
+            now = self.clock()
+            for row, ((incident, _), column) in enumerate(zip(candidates, columns.tolist())):
+                if cost[row, column] >= INFEASIBLE_MIN:
+                    self._requeue(incident)
+                    continue
+                drone = int(idle[column])
+                config = incident["config"] or {}
+                mission_id = config.get("mission_id")
+                if not mission_id or mission_id in self._used_ids:
+                    mission_id = new_mission_id()
+                self._used_ids.add(mission_id)
+                mission = {
+                    "mission_id": mission_id,
+                    "incident_id": incident["incident_id"],
+                    "drone_id": self.drone_ids[drone],
+                    "lat": incident["lat"],
+                    "lon": incident["lon"],
+                    "priority": incident["priority"],
+                    "distance_km": round(float(dist[row, column]), 3),
+                    "eta_min": round(float(eta_min[row, column]), 2),
+                    "drone_config": incident["config"],
+                    "assigned_at": now,
+                }
+                self.missions[mission_id] = mission
+                incident["mission_id"] = mission_id
+                self.state[drone] = ASSIGNED
+                missions.append(mission)
+            return missions
+
+    def complete_mission(self, mission_id, battery=None):
+        """
+        Close a finished mission: the drone is idle again at the incident
+        (battery from telemetry, else drained by the distance flown) and the
+        incident is closed. Returns the mission, or None if unknown.
+        """
+        battery = None if battery is None else float(battery)
+        with self._lock:
+            mission = self.missions.pop(mission_id, None)
+            if mission is None:
+                return None
+            self.incidents.pop(mission["incident_id"], None)
+            i = self._drone_index[mission["drone_id"]]
+            self.lat[i], self.lon[i] = mission["lat"], mission["lon"]
+            if battery is None:
+                battery = self.battery[i] - mission["distance_km"] / self.range_km
+            self.battery[i] = min(max(battery, 0.0), 1.0)
+            self.state[i] = IDLE
+            self.completed += 1
+            return mission
+
+    def mission_for(self, incident_id):
+        with self._lock:
+            incident = self.incidents.get(incident_id)
+            return self.missions.get(incident["mission_id"]) if incident and incident["mission_id"] else None
+
+    def stats(self):
+        with self._lock:
+            counts = np.bincount(self.state, minlength=len(DRONE_STATES)).tolist()
+            return {
+                "drones": dict(zip((s.lower() for s in DRONE_STATES), counts)),
+                "open_incidents": len(self.incidents),
+                "waiting_incidents": len(self.incidents) - len(self.missions),
+                "open_missions": len(self.missions),
+                "completed_missions": self.completed,
+                "dispatch_calls": self.dispatch_calls,
+            }
+
+
+# Pipeline default (no drones until some register); app.py builds one from the environment
+dispatcher = DispatchScheduler()
@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from collections import deque
+
+
+def format_sse(event, data):
+    """Serialize one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscriber:
+    """
+    Per-client mailbox with built-in backpressure.
+
+    - Coalesced events (status) keep only the latest frame per event name,
+      so a slow client never accumulates stale snapshots.
+    - Discrete events (alerts) go to a bounded backlog; when a client falls
+      behind, the oldest are dropped and counted.
+    """
+
+    def __init__(self, max_backlog=32):
+        self._cond = threading.Condition()
+        self._latest = {}
+        self._backlog = deque(maxlen=max_backlog)
+        self.dropped = 0
+        self.closed = False
+
+    def offer(self, event, frame, coalesce):
+        with self._cond:
+            if coalesce:
+                self._latest[event] = frame
+            else:
+                if len(self._backlog) == self._backlog.maxlen:
+                    self.dropped += 1
+                self._backlog.append(frame)
+            self._cond.notify()
+
+    def wait(self, timeout):
+        """Wait up to `timeout` for frames; True if any are pending."""
+        with self._cond:
+            if not self._latest and not self._backlog and not self.closed:
+                self._cond.wait(timeout)
+            return bool(self._latest or self._backlog)
+
+    def drain(self):
+        """Return and clear everything pending (alerts first, then latest state)."""
+        with self._cond:
+            frames = list(self._backlog) + list(self._latest.values())
+            self._backlog.clear()
+            self._latest.clear()
+            return frames
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+class EventBroadcaster:
+    """
+    Fan-out of fusion snapshots and alerts to dashboard streams.
+
+    Each publish is serialized once and handed to every subscriber's mailbox;
+    unchanged state (same `key`) is not re-broadcast.
+    """
+
+    def __init__(self, max_backlog=32, coalesce_window=0.25, heartbeat_seconds=15.0):
+        self.max_backlog = max_backlog
+        self.coalesce_window = coalesce_window
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._last_key = {}
+        self._last_frame = {}
+        self.published = 0
+        self.suppressed = 0
+
+    def subscribe(self):
+        sub = Subscriber(self.max_backlog)
+        with self._lock:
+            self._subscribers.add(sub)
+            # New clients start from the current state, not an empty screen
+            for event, frame in self._last_frame.items():
+                sub.offer(event, frame, coalesce=True)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+        sub.close()
+
+    def publish(self, event, data, coalesce=True, key=None):
+        """
+        Broadcast `data` as `event`.
+
+        Args:
+            coalesce: Keep only the latest frame per client (state updates).
+                Use False for discrete events such as new alerts.
+            key: Change-detection key; if equal to the last published key
+                for this event, nothing is sent.
+
+        Returns:
+            True if the event was broadcast.
+        """
+        with self._lock:
+            if key is not None and self._last_key.get(event) == key:
+                self.suppressed += 1
+                return False
+            self._last_key[event] = key
+            frame = format_sse(event, data)
+            if coalesce:
+                self._last_frame[event] = frame
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for sub in subscribers:
+            sub.offer(event, frame, coalesce)
+        return True
+
+    def stream(self, sub):
+        """
+        Generator of SSE text for one client; heartbeats keep proxies from
+        closing idle connections. Bursts within `coalesce_window` go out as
+        one write.
+        """
+        try:
+            yield "retry: 3000\n\n"
+            while not sub.closed:
+                if not sub.wait(self.heartbeat_seconds):
+                    yield ": keep-alive\n\n"
+                    continue
+                if self.coalesce_window:
+                    time.sleep(self.coalesce_window)
+                yield "".join(sub.drain())
+        finally:
+            self.unsubscribe(sub)
+
+    def stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "suppressed": self.suppressed,
+            "dropped": sum(s.dropped for s in subscribers),
+        }
@@ -0,0 +1,261 @@
+import hashlib
+import importlib.util
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Downscaled copies served next to each original: name -> longest side in px
+VARIANTS = {"thumb": 160, "preview": 640}
+VARIANT_JPEG_QUALITY = 80
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Writes and deletes of one digest serialize on lock stripe int(digest[:2], 16) % DIGEST_LOCKS
+DIGEST_LOCKS = 64
+
+
+def cv2_resizer(data, max_side):
+    """
+    JPEG bytes -> JPEG bytes no larger than max_side on the longest side
+    (opencv-python-headless). Returns None for undecodable images.
+    """
+    import cv2
+    import numpy as np
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale < 1.0:
+        image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, VARIANT_JPEG_QUALITY])
+    return buffer.tobytes() if ok else None
+
+
+class EvidenceStore:
+    """
+    Content-addressed store for evidence JPEGs.
+
+    Responsibility:
+    - Name each image by its SHA-256, so repeated frames from a burst are
+      stored (and downloaded by dashboards) once; duplicates only refresh
+      the original's age.
+    - Write originals and their thumb/preview variants atomically from a
+      small worker pool; requests only hash and enqueue. Frames still in
+      the queue are served from memory. A full queue drops the frame.
+    - Enforce retention: entries unseen for max_age_seconds go first, then
+      the least recently seen until the store fits in max_bytes.
+    - Files live at <directory>/<digest[:2]>/<digest>[.<variant>].jpg; the
+      index is rebuilt from disk (mtimes) on start.
+    """
+
+    def __init__(self, directory, url_prefix="/api/evidence", variants=VARIANTS, workers=2, max_pending=64,
+                 max_bytes=2 * 1024 ** 3, max_age_seconds=7 * 86400, resizer=cv2_resizer, clock=time.time):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.variants = dict(variants)
+        self.max_pending = max_pending
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        if resizer is cv2_resizer and importlib.util.find_spec("cv2") is None:
+            print("[Evidence] opencv not installed: no thumbnails, variant URLs redirect to the original")
+            resizer = None
+        self.resizer = resizer
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._digest_locks = [threading.Lock() for _ in range(DIGEST_LOCKS)]
+        self._pending = {}            # digest -> original bytes not yet on disk
+        self._futures = set()
+        self._index = OrderedDict()   # digest -> [bytes on disk, last seen], least recently seen first
+        self.total_bytes = 0
+        self.stored = 0
+        self.duplicates = 0
+        self.bytes_deduplicated = 0
+        self.dropped = 0
+        self.failed = 0
+        self.evicted = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="evidence")
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    # ---- paths --------------------------------------------------------
+
+    def _digest_lock(self, digest):
+        return self._digest_locks[int(digest[:2], 16) % DIGEST_LOCKS]
+
+    def _path(self, digest, variant=None):
+        name = f"{digest}.{variant}.jpg" if variant else f"{digest}.jpg"
+        return os.path.join(self.directory, digest[:2], name)
+
+    def url(self, digest, variant=None):
+        return f"{self.url_prefix}/{digest}.{variant}.jpg" if variant else f"{self.url_prefix}/{digest}.jpg"
+
+    def _scan(self):
+        entries = []
+        for shard in os.listdir(self.directory):
+            shard_dir = os.path.join(self.directory, shard)
+            if len(shard) != 2 or not os.path.isdir(shard_dir):
+                continue
+            sizes = {}
+            for name in os.listdir(shard_dir):
+                digest = name.split(".", 1)[0]
+                if not DIGEST_RE.match(digest) or name.endswith(".tmp"):
+                    continue
+                st = os.stat(os.path.join(shard_dir, name))
+                size, seen = sizes.get(digest, (0, 0.0))
+                sizes[digest] = (size + st.st_size, max(seen, st.st_mtime))
+            entries.extend((seen, digest, size) for digest, (size, seen) in sizes.items()
+                           if os.path.exists(self._path(digest)))
+        for seen, digest, size in sorted(entries):
+            self._index[digest] = [size, seen]
+            self.total_bytes += size
+
+    # ---- writes -------------------------------------------------------
+
+    def put(self, data):
+        """
+        Store one JPEG. Returns its digest, or None if the write queue is
+        full and the frame was dropped.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        now = self.clock()
+        with self._lock:
+            entry = self._index.get(digest)
+            if entry is not None or digest in self._pending:
+                self.duplicates += 1
+                self.bytes_deduplicated += len(data)
+                if entry is not None:
+                    entry[1] = now
+                    self._index.move_to_end(digest)
+                return digest
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return None
+            self._pending[digest] = data
+            future = self._pool.submit(self._write, digest, data)
+            self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return digest
+
+    @staticmethod
+    def _write_file(path, data):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _write(self, digest, data):
+        written = 0
+        try:
+            # Not interleaved with a _delete of the same digest evicted earlier
+            with self._digest_lock(digest):
+                os.makedirs(os.path.dirname(self._path(digest)), exist_ok=True)
+                self._write_file(self._path(digest), data)
+                written += len(data)
+                for variant, max_side in self.variants.items():
+                    try:
+                        scaled = self.resizer(data, max_side) if self.resizer else None
+                    except Exception as e:
+                        # Corrupt frame: the variant URL keeps redirecting to the original
+                        scaled = None
+                        print(f"[Evidence] No {variant} for {digest[:12]}: {e}")
+                    if scaled:
+                        self._write_file(self._path(digest, variant), scaled)
+                        written += len(scaled)
+        except OSError as e:
+            with self._lock:
+                self.failed += 1
+                self._pending.pop(digest, None)
+            print(f"[Evidence] Failed to write {digest[:12]}: {e}")
+            return
+        with self._lock:
+            self._pending.pop(digest, None)
+            self._index[digest] = [written, self.clock()]
+            self.total_bytes += written
+            self.stored += 1
+            doomed = self._expired()
+        for old in doomed:
+            self._delete(old)
+
+    # ---- retention ----------------------------------------------------
+
+    def _expired(self):
+        """Pop entries past max_age, then LRU until under max_bytes (lock held)."""
+        doomed = []
+        cutoff = self.clock() - self.max_age_seconds
+        while self._index:
+            digest, (size, seen) = next(iter(self._index.items()))
+            if seen >= cutoff and self.total_bytes <= self.max_bytes:
+                break
+            del self._index[digest]
+            self.total_bytes -= size
+            self.evicted += 1
+            doomed.append(digest)
+        return doomed
+
+    def _delete(self, digest):
+        # The re-check and the unlinks happen under the digest's lock, so a
+        # put() of the same frame either keeps the files or rewrites them after
+        with self._digest_lock(digest):
+            with self._lock:
+                if digest in self._index or digest in self._pending:
+                    return  # stored again since it was evicted
+            for variant in [None, *self.variants]:
+                try:
+                    os.remove(self._path(digest, variant))
+                except OSError:
+                    pass
+
+    def enforce_retention(self):
+        """Apply the age/size limits now (they are also applied after each write)."""
+        with self._lock:
+            doomed = self._expired()
+        for digest in doomed:
+            self._delete(digest)
+        return len(doomed)
+
+    # ---- reads --------------------------------------------------------
+
+    def open(self, digest, variant=None):
+        """
+        (path, None) for a stored file, (None, bytes) for an original still
+        in the write queue, or (None, None) if unknown. A variant is only
+        returned once its own file exists (never the original in its place),
+        so its URL can be cached as immutable.
+        """
+        if not DIGEST_RE.match(digest) or (variant is not None and variant not in self.variants):
+            return None, None
+        with self._lock:
+            data = self._pending.get(digest)
+            known = digest in self._index
+        if data is not None:
+            return (None, data) if variant is None else (None, None)
+        if not known:
+            return None, None
+        path = self._path(digest, variant)
+        if variant is not None and not os.path.exists(path):
+            return None, None
+        return path, None
+
+    def join(self):
+        """Block until every queued frame has been written (tests/shutdown)."""
+        wait(list(self._futures))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "pending": len(self._pending),
+                "total_bytes": self.total_bytes,
+                "stored": self.stored,
+                "duplicates": self.duplicates,
+                "bytes_deduplicated": self.bytes_deduplicated,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "evicted": self.evicted,
+            }
@@ -1,6 +1,10 @@
 
 import math
 
+import numpy as np
+
+from spatial_index import EARTH_RADIUS_KM
+
 class FireSpreadModel:
     """
     Level 4: Fire Spread & Routing (The Brain)
@@ -8,7 +12,10 @@ class FireSpreadModel:
     Responsibility:
     - Simplified Rothermel spread model.
     - Calculate 1-hour spread cone based on wind vector.
+    - Batch the cone for every active fire in one vectorized call.
     """
+
+    FLANK_ANGLE_DEG = 30 # cone half-width around the wind bearing
     
     def calculate_spread_cone(self, origin_lat, origin_lon, wind_speed_kmh, wind_bearing):
         """
@@ -25,17 +32,13 @@ class FireSpreadModel:
         distance_km = ros * 1.0 # 1 hour
         
         # 3. Predict new point
-        # Convert to lat/lon delta (approx)
-        # 1 deg lat ~ 111 km
-        delta_lat = (distance_km / 111.0) * math.cos(math.radians(wind_bearing))
-        delta_lon = (distance_km / 111.0) * math.sin(math.radians(wind_bearing))
-        
-        spread_lat = origin_lat + delta_lat
-        spread_lon = origin_lon + delta_lon
+        # Great-circle destination, so longitude offsets grow with latitude
+        spread_lat, spread_lon = destination(origin_lat, origin_lon, distance_km, wind_bearing)
+        spread_lat, spread_lon = float(spread_lat), float(spread_lon)
         
         # 4. Generate Cone Polygon (Simplified Triangle/Sector)
         # Width of cone impacted by wind variance (random noise)
-        flank_angle = 30 # degrees spread
+        flank_angle = self.FLANK_ANGLE_DEG # degrees spread
         
         cone = {
             "origin": {"lat": origin_lat, "lon": origin_lon},
@@ -48,4 +51,77 @@ class FireSpreadModel:
         print(f"[Level 4] Fire Spread: {cone['message']}")
         return cone
 
+    def calculate_spread_cones(self, origin_lats, origin_lons, wind_speed_kmh, wind_bearing, geojson=False):
+        """
+        Vectorized calculate_spread_cone for many fires at once.
+
+        Args:
+            origin_lats, origin_lons: Arrays of fire origins.
+            wind_speed_kmh, wind_bearing: Scalars or per-fire arrays.
+            geojson: Also build a FeatureCollection of cone polygons.
+
+        Returns:
+            dict of arrays: origin_lat, origin_lon, head_lat, head_lon,
+            ros_kmh, area_risk_km2 (same values as the scalar call; the head
+            is the same geodesic point as the polygon's head vertex), plus
+            "geojson" when asked. Prints one summary line for the batch,
+            not one per fire.
+        """
+        lat, lon, speed, bearing = np.broadcast_arrays(
+            *(np.asarray(v, dtype=np.float64) for v in (origin_lats, origin_lons, wind_speed_kmh, wind_bearing)))
+        ros = np.maximum(0.1, speed * 0.1)
+        distance_km = ros * 1.0
+        head_lat, head_lon = destination(lat, lon, distance_km, bearing)
+        result = {
+            "origin_lat": lat,
+            "origin_lon": lon,
+            "head_lat": head_lat,
+            "head_lon": head_lon,
+            "ros_kmh": ros,
+            "area_risk_km2": 0.5 * distance_km * (distance_km * math.tan(math.radians(self.FLANK_ANGLE_DEG))),
+        }
+        if geojson:
+            result["geojson"] = self.cone_polygons(lat, lon, distance_km, bearing)
+        print(f"[Level 4] Fire Spread: {lat.size} cones")
+        return result
+
+    def cone_polygons(self, lat, lon, distance_km, bearing):
+        """
+        GeoJSON cone triangles (origin, flank, head, flank) with the flank and
+        head vertices placed by great-circle destination, so longitude
+        offsets shrink correctly with latitude.
+        """
+        flank = self.FLANK_ANGLE_DEG
+        reach = distance_km / math.cos(math.radians(flank))
+        vertices = [
+            (lat, lon),
+            destination(lat, lon, reach, bearing - flank),
+            destination(lat, lon, distance_km, bearing),
+            destination(lat, lon, reach, bearing + flank),
+            (lat, lon),
+        ]
+        # (fires, 5 vertices, [lon, lat])
+        coords = np.round(np.stack([np.stack([v_lon, v_lat], axis=-1) for v_lat, v_lon in vertices], axis=1), 6)
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+                "properties": {"distance_km": d, "wind_bearing": b},
+            }
+            for ring, d, b in zip(coords.tolist(), distance_km.tolist(), bearing.tolist())
+        ]
+        return {"type": "FeatureCollection", "features": features}
+
+
+def destination(lat, lon, distance_km, bearing):
+    """Great-circle destination points (arrays, degrees) on a spherical Earth."""
+    phi1, lam1 = np.radians(lat), np.radians(lon)
+    delta = np.asarray(distance_km) / EARTH_RADIUS_KM
+    theta = np.radians(bearing)
+    sin_phi2 = np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta)
+    phi2 = np.arcsin(np.clip(sin_phi2, -1.0, 1.0))
+    lam2 = lam1 + np.arctan2(np.sin(theta) * np.sin(delta) * np.cos(phi1), np.cos(delta) - np.sin(phi1) * sin_phi2)
+    lon2 = (np.degrees(lam2) + 180.0) % 360.0 - 180.0
+    return np.degrees(phi2), lon2
+
 fire_spread = FireSpreadModel()
@@ -0,0 +1,184 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from http_session import session as shared_session
+from tile_cache import TileCache
+
+FIRMS_AREA_URL = "https://firms.modaps.eosdis.nasa.gov/api/area/csv/{key}/{source}/{west},{south},{east},{north}/{days}"
+
+# Same sources the globe used to query from the browser
+FIRMS_SOURCES = [
+    ("VIIRS_SNPP_NRT", "VIIRS SNPP"),
+    ("VIIRS_NOAA20_NRT", "VIIRS NOAA-20"),
+]
+
+
+def _to_float(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def csv_to_features(csv_text, source):
+    """
+    Convert a FIRMS area/csv response into GeoJSON Point features.
+
+    Headers are matched case-insensitively (latitude, longitude, frp,
+    confidence, acq_date, acq_time; brightness from the first header
+    containing 'bright'). Rows without a valid lat/lon are skipped; missing
+    frp defaults to 10, brightness to 300 and confidence to 'nominal'.
+    """
+    lines = csv_text.strip().split("\n")
+    if len(lines) < 2:
+        return []
+
+    headers = lines[0].strip().lower().split(",")
+
+    def idx(name):
+        return headers.index(name) if name in headers else None
+
+    lat_idx, lon_idx = idx("latitude"), idx("longitude")
+    if lat_idx is None or lon_idx is None:
+        return []
+    frp_idx, conf_idx = idx("frp"), idx("confidence")
+    date_idx, time_idx = idx("acq_date"), idx("acq_time")
+    bright_idx = next((i for i, h in enumerate(headers) if "bright" in h), None)
+
+    def col(cols, i):
+        return cols[i] if i is not None and i < len(cols) else ""
+
+    features = []
+    for line in lines[1:]:
+        cols = line.strip().split(",")
+        lat = _to_float(col(cols, lat_idx), None)
+        lon = _to_float(col(cols, lon_idx), None)
+        if lat is None or lon is None or math.isnan(lat) or math.isnan(lon):
+            continue
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "frp": _to_float(col(cols, frp_idx), 0.0) or 10,
+                "confidence": col(cols, conf_idx) or "nominal",
+                "date": col(cols, date_idx),
+                "time": col(cols, time_idx),
+                "brightness": _to_float(col(cols, bright_idx), 0.0) or 300,
+                "source": source,
+            },
+        })
+    return features
+
+
+class FirmsService:
+    """
+    Level 1 ingest: FIRMS hotspots served from the backend (The Eye)
+
+    Responsibility:
+    - Fetch all satellite sources concurrently over one pooled session.
+    - Cache parsed features per fixed lat/lon tile and day window. Views
+      spanning more than max_bbox_tiles tiles (up to the whole world) are
+      fetched and cached as one tile-aligned area per source instead, so
+      they cost as many upstream calls as a small view and never flush
+      the tile cache.
+    - Serve a bbox as a GeoJSON FeatureCollection, keeping the FIRMS key
+      server-side; areas that failed to load are reported, not cached.
+    """
+
+    def __init__(self, map_key, tile_deg=10.0, ttl_seconds=600, max_tiles=256, max_bbox_tiles=16,
+                 session=None, max_workers=8, sources=FIRMS_SOURCES, url_template=FIRMS_AREA_URL):
+        self.map_key = map_key
+        self.tile_deg = float(tile_deg)
+        self.max_bbox_tiles = max_bbox_tiles
+        self.sources = list(sources)
+        self.url_template = url_template
+        self.session = session or shared_session
+        # Room for every area of the largest tiled view, across all sources
+        self.cache = TileCache(max_entries=max(max_tiles, 2 * max_bbox_tiles * len(self.sources)),
+                               ttl_seconds=ttl_seconds)
+        # Called with the features of each area fetched upstream (not on cache hits)
+        self.listeners = []
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="firms")
+
+    def tiles_for_bbox(self, west, south, east, north):
+        """Tile (x, y) indices covering the bbox."""
+        t = self.tile_deg
+        x0, y0 = math.floor((west + 180) / t), math.floor((south + 90) / t)
+        xs = range(x0, max(x0 + 1, math.ceil((east + 180) / t)))
+        ys = range(y0, max(y0 + 1, math.ceil((north + 90) / t)))
+        return [(x, y) for x in xs for y in ys]
+
+    def areas_for_bbox(self, west, south, east, north):
+        """
+        Tile-aligned areas (x0, y0, x1, y1), end-exclusive, to fetch for a bbox:
+        one per tile, or a single area when the bbox covers too many tiles.
+        """
+        tiles = self.tiles_for_bbox(west, south, east, north)
+        if len(tiles) <= self.max_bbox_tiles:
+            return [(x, y, x + 1, y + 1) for x, y in tiles]
+        xs, ys = [x for x, _ in tiles], [y for _, y in tiles]
+        return [(min(xs), min(ys), max(xs) + 1, max(ys) + 1)]
+
+    def _area_bounds(self, area):
+        x0, y0, x1, y1 = area
+        t = self.tile_deg
+        return (x0 * t - 180, y0 * t - 90, min(180.0, x1 * t - 180), min(90.0, y1 * t - 90))
+
+    def _fetch_area(self, source_id, source_name, area, days):
+        west, south, east, north = self._area_bounds(area)
+        url = self.url_template.format(key=self.map_key, source=source_id, west=west, south=south,
+                                       east=east, north=north, days=days)
+        resp = self.session.get(url, timeout=30)
+        if resp.status_code != 200:
+            raise RuntimeError(f"{source_name}: HTTP {resp.status_code}")
+        text = resp.text
+        # FIRMS answers bad keys/queries with an HTML page
+        if "<!DOCTYPE" in text or "<html" in text:
+            raise RuntimeError(f"{source_name}: Invalid response")
+        features = csv_to_features(text, source_name)
+        for listener in self.listeners:
+            try:
+                listener(features)
+            except Exception as e:
+                # A consumer's failure must not fail (and uncache) the fetch
+                print(f"[FIRMS] Listener failed for {source_id} area {area}: {e}")
+        return features
+
+    def _load(self, source, area, days):
+        """(features, None), or ([], error) for an area that failed (not cached; retried next request)."""
+        source_id, source_name = source
+        key = (source_id, area, days)
+        try:
+            return self.cache.get_or_load(key, lambda: self._fetch_area(source_id, source_name, area, days)), None
+        except Exception as e:
+            print(f"[FIRMS] {source_id} area {area} failed: {e}")
+            return [], f"{source_name}: {e}"
+
+    def get_features(self, west, south, east, north, days=1):
+        """
+        Hotspots inside the bbox as a GeoJSON FeatureCollection.
+
+        If any area failed to load, the collection is partial and carries
+        the errors under "errors" (callers must not cache it).
+        """
+        days = max(1, min(10, int(days)))
+        jobs = [(source, area) for source in self.sources
+                for area in self.areas_for_bbox(west, south, east, north)]
+        results = self.executor.map(lambda job: self._load(job[0], job[1], days), jobs)
+
+        features = []
+        errors = []
+        for area_features, error in results:
+            if error:
+                errors.append(error)
+            for f in area_features:
+                lon, lat = f["geometry"]["coordinates"]
+                if west <= lon <= east and south <= lat <= north:
+                    features.append(f)
+        collection = {"type": "FeatureCollection", "features": features}
+        if errors:
+            collection["errors"] = errors
+        return collection
+
+    def stats(self):
+        return self.cache.stats()
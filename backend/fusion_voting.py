@@ -1,3 +1,63 @@
+import numpy as np
+
+# Decision codes used by fuse_batch (index into DECISIONS)
+SAFE, SMOKE_WITHOUT_FLAME, CRITICAL_FIRE = 0, 1, 2
+DECISIONS = ("SAFE", "SMOKE WITHOUT FLAME", "CRITICAL FIRE")
+
+# Decision rules, shared by score() (fuse_data) and fuse_batch.
+# Vision override: a clear sighting with a weak fused score is lifted to a warning
+VISION_OVERRIDE_CONF, VISION_OVERRIDE_BELOW, VISION_OVERRIDE_SCORE = 0.8, 0.6, 0.65
+# (effective score must exceed, decision code), most severe first; otherwise SAFE
+DECISION_THRESHOLDS = ((0.8, CRITICAL_FIRE), (0.5, SMOKE_WITHOUT_FLAME))
+# Fused score above which Level 3 (Multi-Modal) counts as passed
+MULTI_MODAL_SCORE = 0.5
+
+
+def _round2(x):
+    """Vectorized round(x, 2) that matches Python's correctly-rounded result."""
+    scaled = x * 100.0
+    out = np.round(scaled) / 100.0
+    # np.round can disagree with round() only right at a .5 tie; redo those exactly
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    for i in np.flatnonzero(frac < 1e-6):
+        out.flat[i] = round(float(x.flat[i]), 2)
+    return out
+
+
+class DecisionTraceBatch:
+    """
+    Columnar DecisionTrace for many fused rows.
+
+    Scores, decision codes and sniffer flags are arrays; the per-row dict
+    (identical to fuse_data's trace) and its reasoning string are only built
+    when a row is read.
+    """
+
+    def __init__(self, engine, vision_conf, audio_conf, chem_conf, final_score, effective_score, decision):
+        self.engine = engine
+        self.vision_conf = vision_conf
+        self.audio_conf = audio_conf
+        self.chem_conf = chem_conf
+        self.final_score = final_score
+        self.effective_score = effective_score
+        self.decision = decision
+        self.triggered_sniffer = decision != SAFE
+        self._reasoning = {}
+
+    def __len__(self):
+        return len(self.final_score)
+
+    def reasoning(self, i):
+        if i not in self._reasoning:
+            self._reasoning[i] = self.engine._generate_reasoning(
+                float(self.vision_conf[i]), float(self.audio_conf[i]),
+                float(self.chem_conf[i]), float(self.final_score[i]))
+        return self._reasoning[i]
+
+    def __getitem__(self, i):
+        return self.engine._trace(float(self.vision_conf[i]), float(self.audio_conf[i]), float(self.chem_conf[i]),
+                                  float(self.final_score[i]), int(self.decision[i]), self.reasoning(i))
+
 
 class FusionVoting:
     """
@@ -25,57 +85,70 @@ class FusionVoting:
         v_conf = vision_result.get("normalized_conf", 0.0)
         a_conf = audio_result.get("confidence", 0.0)
         c_conf = chem_result.get("confidence", 0.0)
-        
-        # Weighted Sum
-        final_score = (v_conf * self.weights["vision"]) + \
-                      (a_conf * self.weights["audio"]) + \
-                      (c_conf * self.weights["chemical"])
-                      
-        final_score = round(final_score, 2)
-        
-        # Decision Rules
-        decision = "NORMAL"
-        triggered_sniffer = False
-        
-        # Override: If Vision is VERY clear, force at least Warning
-        # This prevents "Safe" state when we clearly see fire but other sensors are lagging
-        effective_score = final_score
-        if v_conf > 0.8 and final_score < 0.6:
-            effective_score = 0.65
-        
-        if effective_score > 0.8:
-            decision = "CRITICAL FIRE"
-            triggered_sniffer = True # Urgent response
-        elif 0.5 < effective_score <= 0.8:
-            decision = "SMOKE WITHOUT FLAME"
-            triggered_sniffer = True # Sniffer needed to locate source
-        else:
-            decision = "SAFE"
-            triggered_sniffer = False
-            
-        # Explainability: Levels Passed & Reasoning
-        levels_passed = ["Level 1 (Satellite)", "Level 2 (Atmospheric)"]
-        if final_score > 0.5:
-             levels_passed.append("Level 3 (Multi-Modal)")
-        
+
+        final_score, _, code = self.score(v_conf, a_conf, c_conf)
         reasoning = self._generate_reasoning(v_conf, a_conf, c_conf, final_score)
+        decision_trace = self._trace(v_conf, a_conf, c_conf, final_score, code, reasoning)
+
+        print(f"[Level 3] Fusion Decision: {DECISIONS[code]} (Score: {final_score}) | Why: {reasoning}")
+        return decision_trace
 
-        # Explainability Artifact
-        decision_trace = {
+    def _weighted_sum(self, v, a, c):
+        """Unrounded weighted vote (floats or arrays)."""
+        return (v * self.weights["vision"]) + (a * self.weights["audio"]) + (c * self.weights["chemical"])
+
+    def score(self, v_conf, a_conf, c_conf):
+        """
+        Scores and decision code for one triple, without building a trace.
+
+        Returns:
+            (final_score, effective_score, decision code).
+        """
+        final_score = round(self._weighted_sum(v_conf, a_conf, c_conf), 2)
+        # Override: if vision is very clear, force at least a warning while other sensors lag
+        effective_score = final_score
+        if v_conf > VISION_OVERRIDE_CONF and final_score < VISION_OVERRIDE_BELOW:
+            effective_score = VISION_OVERRIDE_SCORE
+        for threshold, code in DECISION_THRESHOLDS:
+            if effective_score > threshold:
+                return final_score, effective_score, code
+        return final_score, effective_score, SAFE
+
+    def _trace(self, v_conf, a_conf, c_conf, final_score, code, reasoning):
+        """Explainability artifact (DecisionTrace) for one scored row."""
+        levels_passed = ["Level 1 (Satellite)", "Level 2 (Atmospheric)"]
+        if final_score > MULTI_MODAL_SCORE:
+            levels_passed.append("Level 3 (Multi-Modal)")
+        return {
             "vision_conf": v_conf,
             "audio_conf": a_conf,
             "chem_conf": c_conf,
             "weights": self.weights,
             "final_score": final_score,
-            "decision": decision,
+            "decision": DECISIONS[code],
             "min_levels_passed": levels_passed,
             "reasoning": reasoning,
-            "triggered_sniffer": triggered_sniffer,
+            "triggered_sniffer": code != SAFE,
             "framework_version": "v1.0"
         }
-        
-        print(f"[Level 3] Fusion Decision: {decision} (Score: {final_score}) | Why: {reasoning}")
-        return decision_trace
+
+    def fuse_batch(self, vision_conf, audio_conf, chem_conf):
+        """
+        Vectorized fuse_data over confidence arrays (no per-row logging).
+
+        Applies score()'s rules elementwise; returns a DecisionTraceBatch
+        whose rows equal fuse_data's traces.
+        """
+        v = np.asarray(vision_conf, dtype=np.float64)
+        a = np.asarray(audio_conf, dtype=np.float64)
+        c = np.asarray(chem_conf, dtype=np.float64)
+
+        final_score = _round2(self._weighted_sum(v, a, c))
+        effective_score = np.where((v > VISION_OVERRIDE_CONF) & (final_score < VISION_OVERRIDE_BELOW),
+                                   VISION_OVERRIDE_SCORE, final_score)
+        decision = np.select([effective_score > threshold for threshold, _ in DECISION_THRESHOLDS],
+                             [code for _, code in DECISION_THRESHOLDS], SAFE).astype(np.int8)
+        return DecisionTraceBatch(self, v, a, c, final_score, effective_score, decision)
 
     def _generate_reasoning(self, v, a, c, score):
         """Generate human-readable explanation."""
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+
+import requests
+
+DEFAULT_COORDS = (20.5937, 78.9629)  # Default Center of India
+GEO_CACHE_PATH = os.getenv(
+    "FIRE_GEO_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "fire-grid", "location.json")
+)
+
+
+def lookup_ip_location(timeout=5):
+    """IP-based geolocation via ipinfo.io; None on any failure."""
+    try:
+        resp = requests.get('https://ipinfo.io/json', timeout=timeout)
+        if resp.status_code == 200:
+            loc = resp.json().get('loc', '').split(',')
+            if len(loc) == 2:
+                return float(loc[0]), float(loc[1])
+    except Exception as e:
+        print(f"[Geo] Failed to get IP location: {e}")
+    return None
+
+
+def load_cached(path=GEO_CACHE_PATH):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return float(data["lat"]), float(data["lon"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached(coords, path=GEO_CACHE_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"lat": coords[0], "lon": coords[1]}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[Geo] Could not cache location: {e}")
+
+
+class DroneLocation:
+    """Current drone/camera coordinates; `coords` is swapped atomically."""
+
+    def __init__(self, lat, lon, source):
+        self.coords = (lat, lon)
+        self.source = source
+
+    @property
+    def lat(self):
+        return self.coords[0]
+
+    @property
+    def lon(self):
+        return self.coords[1]
+
+    def update(self, lat, lon, source):
+        self.coords = (lat, lon)
+        self.source = source
+
+
+def resolve_location(lat=None, lon=None, cache_path=GEO_CACHE_PATH, lookup=lookup_ip_location):
+    """
+    Resolve the drone position without blocking startup on the network.
+
+    Order: explicit lat/lon (CLI) > FIRE_DRONE_LAT/FIRE_DRONE_LON env >
+    last-known cached value > default. Unless an override is given, an IP
+    lookup runs in the background and refreshes both the returned location
+    and the cache.
+    """
+    if lat is None or lon is None:
+        env_lat, env_lon = os.getenv("FIRE_DRONE_LAT"), os.getenv("FIRE_DRONE_LON")
+        if env_lat and env_lon:
+            lat, lon = float(env_lat), float(env_lon)
+    if lat is not None and lon is not None:
+        print(f"[Geo] Using configured location: {lat}, {lon}")
+        return DroneLocation(float(lat), float(lon), "configured")
+
+    cached = load_cached(cache_path)
+    if cached:
+        location = DroneLocation(cached[0], cached[1], "cached")
+        print(f"[Geo] Using last-known location: {cached[0]}, {cached[1]}")
+    else:
+        location = DroneLocation(DEFAULT_COORDS[0], DEFAULT_COORDS[1], "default")
+        print("[Geo] Using default India coordinates until IP lookup completes.")
+
+    def refresh():
+        coords = lookup()
+        if coords:
+            print(f"[Geo] Automatically detected location: {coords[0]}, {coords[1]}")
+            location.update(coords[0], coords[1], "ip")
+            save_cached(coords, cache_path)
+
+    location.refresh_thread = threading.Thread(target=refresh, name="geo-lookup", daemon=True)
+    location.refresh_thread.start()
+    return location
@@ -1,3 +1,11 @@
+import uuid
+
+
+def new_mission_id():
+    """Unique mission id (random, so it never repeats across alerts or restarts)."""
+    return f"mission_{uuid.uuid4().hex}"
+
+
 
 class AdaptiveHandshake:
     """
@@ -39,7 +47,7 @@ class AdaptiveHandshake:
         }
         
         config = {
-            "mission_id": f"mission_{int(sat_confidence*100)}",
+            "mission_id": new_mission_id(),
             "sensitivity_level": "HIGH" if sat_confidence > 0.8 else "MEDIUM" if sat_confidence > 0.5 else "LOW",
             "adapted_thresholds": adapted_thresholds,
             "explanation": f"Satellite confidence {sat_confidence:.2f} adapted thresholds by -{int(tuning_factor*100)}%"
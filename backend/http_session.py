@@ -0,0 +1,18 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_session(pool_maxsize=16):
+    """
+    Keep-alive HTTP session with a connection pool sized for concurrent
+    upstream calls (FIRMS tiles, OAuth, weather).
+    """
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+# Shared across the process; requests.Session is safe for concurrent GET/POST
+session = build_session()
@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+
+
+class InferenceScheduler:
+    """
+    Adaptive motion/colour gate in front of YOLO inference (per stream).
+
+    Responsibility:
+    - Cheap checks on a downscaled frame: mean abs difference against the
+      last inferred frame (motion) and fraction of flame-coloured pixels.
+    - IDLE: infer only when the gate fires, or every `idle_interval` seconds
+      as a safety net for slow-growing fires.
+    - HOT: after a detection, infer every frame for `hot_hold` seconds.
+    - Never exceed `cpu_budget` (fraction of wall time spent in inference),
+      based on a moving average of inference cost.
+    """
+
+    def __init__(self, idle_interval=2.0, hot_hold=30.0, cpu_budget=0.5,
+                 motion_threshold=6.0, flame_fraction=0.002, downscale=8, clock=time.monotonic):
+        self.idle_interval = idle_interval
+        self.hot_hold = hot_hold
+        self.cpu_budget = cpu_budget
+        self.motion_threshold = motion_threshold
+        self.flame_fraction = flame_fraction
+        self.downscale = downscale
+        self.clock = clock
+
+        self._reference = None
+        self._last_infer_at = None
+        self._last_fire_at = None
+        self._infer_cost = 0.0  # EMA of seconds per inference
+
+        self.frames = 0
+        self.inferred = 0
+        self.gated = 0
+        self.reasons = {"hot": 0, "motion": 0, "flame": 0, "idle": 0}
+        self.budget_skips = 0
+
+    def _small(self, frame):
+        """Strided downscale to a float grayscale/BGR pair (no resize call)."""
+        small = np.asarray(frame)[::self.downscale, ::self.downscale]
+        return small.astype(np.float32)
+
+    def flame_score(self, small_bgr):
+        """Fraction of pixels that are bright and red-dominant (R > G > B)."""
+        b, g, r = small_bgr[..., 0], small_bgr[..., 1], small_bgr[..., 2]
+        flame = (r > 180) & (r > g + 20) & (g > b)
+        return float(flame.mean())
+
+    @property
+    def hot(self):
+        return self._last_fire_at is not None and self.clock() - self._last_fire_at < self.hot_hold
+
+    def should_infer(self, frame):
+        """Decide whether this frame gets full inference."""
+        self.frames += 1
+        now = self.clock()
+        small = self._small(frame)
+
+        # CPU budget: an inference costing c seconds needs c / budget of wall time
+        if self._last_infer_at is not None and self.cpu_budget:
+            if now - self._last_infer_at < self._infer_cost / self.cpu_budget:
+                self.budget_skips += 1
+                self.gated += 1
+                return False
+
+        reason = None
+        if self.hot:
+            reason = "hot"
+        else:
+            gray = small.mean(axis=2) if small.ndim == 3 else small
+            if self._reference is not None and self._reference.shape == gray.shape:
+                if float(np.abs(gray - self._reference).mean()) > self.motion_threshold:
+                    reason = "motion"
+            if reason is None and small.ndim == 3 and self.flame_score(small) > self.flame_fraction:
+                reason = "flame"
+            if reason is None and (self._last_infer_at is None or now - self._last_infer_at >= self.idle_interval):
+                reason = "idle"
+
+        if reason is None:
+            self.gated += 1
+            return False
+
+        self.reasons[reason] += 1
+        self.inferred += 1
+        self._last_infer_at = now
+        self._reference = small.mean(axis=2) if small.ndim == 3 else small
+        return True
+
+    def report(self, fire_detected, infer_seconds):
+        """Feed back the inference outcome and its cost."""
+        if fire_detected:
+            self._last_fire_at = self.clock()
+        self._infer_cost = infer_seconds if self._infer_cost == 0.0 else 0.8 * self._infer_cost + 0.2 * infer_seconds
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "inferred": self.inferred,
+            "gated": self.gated,
+            "gated_pct": round(100.0 * self.gated / self.frames, 1) if self.frames else 0.0,
+            "reasons": dict(self.reasons),
+            "budget_skips": self.budget_skips,
+            "mode": "HOT" if self.hot else "IDLE",
+        }
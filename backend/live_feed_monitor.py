@@ -1,67 +1,108 @@
-
+import argparse
 import cv2
+import sys
 import time
-import requests
-import base64
-import json
 import datetime
 import os
-from ultralytics import YOLO
+import socket
+
+from alert_uploader import AlertUploader
+from geolocation import resolve_location
+from inference_gate import InferenceScheduler
+from model_loader import LazyModel, ModelLoadError, load_in_background
+from spatial_index import SpatialIndex
+from stream_engine import MultiStreamEngine
 
 # Configuration
 # Default to localhost, but allow override for Azure deployment
 DEFAULT_URL = "http://127.0.0.1:8000/api/vision-trigger"
 API_URL = os.getenv("FIRE_BACKEND_URL", DEFAULT_URL)
 
-MODEL_DIR = "G:/Forest-fire-detection/final_model"
-MODEL_1_PATH = os.path.join(MODEL_DIR, "fire and person.pt")
-MODEL_2_PATH = os.path.join(MODEL_DIR, "aerial_images.pt")
+# Undelivered alerts wait here across outages and restarts
+SPOOL_DIR = os.getenv("FIRE_ALERT_SPOOL", os.path.join(os.path.dirname(os.path.abspath(__file__)), "alert_spool"))
+JPEG_QUALITY = 85
 
-# IP-Based Geolocation
-def get_real_coordinates():
-    try:
-        resp = requests.get('https://ipinfo.io/json', timeout=5)
-        if resp.status_code == 200:
-            data = resp.json()
-            loc = data.get('loc', '').split(',')
-            if len(loc) == 2:
-                print(f"[Geo] Automatically detected location: {loc}")
-                return float(loc[0]), float(loc[1])
-    except Exception as e:
-        print(f"[Geo] Failed to get IP location: {e}")
-    
-    print("[Geo] Using default India coordinates.")
-    return 20.5937, 78.9629 # Default Center of India
-
-# Dynamic Coordinates
-DRONE_LAT, DRONE_LON = get_real_coordinates()
+# Names this monitor's cameras to the backend (source_id "<monitor>/<stream>")
+MONITOR_ID = os.getenv("FIRE_MONITOR_ID") or socket.gethostname()
+
+MODEL_DIR = os.getenv("FIRE_MODEL_DIR", "G:/Forest-fire-detection/final_model")
+MODEL_1_FILE = "fire and person.pt"
+MODEL_2_FILE = "aerial_images.pt"
+# Optional CPU-optimized runtime: "onnx" or "openvino" (exported once, then cached)
+MODEL_FORMAT = os.getenv("FIRE_MODEL_FORMAT") or None
+
+ANIMAL_CLASSES = [14, 15, 16, 17, 18, 19, 20, 21, 22, 23] # COCO IDs
+
+# Adaptive inference: idle check interval (s) and max share of CPU time spent in YOLO
+IDLE_INTERVAL = float(os.getenv("FIRE_IDLE_INTERVAL", "2.0"))
+CPU_BUDGET = float(os.getenv("FIRE_CPU_BUDGET", "0.5"))
+
+# Alert dedup: a stream stays quiet while it already alerted within this
+# distance (0.1 km ~ the old 0.001 deg check) in the last minute
+ALERT_DEDUP_KM = 0.1
+ALERT_DEDUP_SECONDS = 60
 
 class CognitiveMonitor:
-    def __init__(self):
+    def __init__(self, model_dir=MODEL_DIR, model_format=MODEL_FORMAT, location=None):
         print("[System] Initializing Cognitive Fire-Grid Monitor...")
         
-        # Load Models
-        try:
-            print(f"[Loader] Loading Fire/Person Model: {MODEL_1_PATH}")
-            self.model1 = YOLO(MODEL_1_PATH)
-            print(f"[Loader] Loading Aerial Model: {MODEL_2_PATH}")
-            self.model2 = YOLO(MODEL_2_PATH)
-            print("[System] Models Loaded successfully.")
-        except Exception as e:
-            print(f"[Error] Failed to load models: {e}")
-            exit(1)
+        # Models load in the background; first inference waits for them.
+        # The aerial model is only used by run_multi, which starts its load.
+        self.model1 = LazyModel(os.path.join(model_dir, MODEL_1_FILE), "Fire/Person Model", model_format)
+        self.model2 = LazyModel(os.path.join(model_dir, MODEL_2_FILE), "Aerial Model", model_format)
+        self.model_loads = load_in_background([self.model1])
+
+        self.location = location or resolve_location()
             
-        self.last_alert_time = 0
-        self.last_lat = 0.0
-        self.last_lon = 0.0
-        self.alert_cooldown = 5 # seconds
+        # Recent alerts per stream (layer "stream-<id>"), expiring after ALERT_DEDUP_SECONDS
+        self.recent_alerts = SpatialIndex(cell_deg=0.01, merge_at=256)
+        # Per-stream motion/colour gates (stream 0 is the single-webcam loop)
+        self.schedulers = {}
+        self.uploader = AlertUploader(API_URL, SPOOL_DIR, on_response=self.print_response).start()
+
+    def summarize(self, result, model):
+        """Fire confidence and person/animal counts for one frame's result."""
+        fire_detected = False
+        max_conf = 0.0
+        person_count = 0
+        animal_count = 0
+
+        for box in result.boxes:
+            cls_id = int(box.cls[0])
+            conf = float(box.conf[0])
+            cls_name = model.names[cls_id].lower()
+
+            if 'fire' in cls_name:
+                fire_detected = True
+                max_conf = max(max_conf, conf)
+                # Box drawing is handled by plot()
+            elif cls_id == 0: # Person
+                person_count += 1
+            elif cls_id in ANIMAL_CLASSES:
+                animal_count += 1
+
+        return fire_detected, max_conf, person_count, animal_count
+
+    def scheduler(self, stream_id=0):
+        if stream_id not in self.schedulers:
+            self.schedulers[stream_id] = InferenceScheduler(idle_interval=IDLE_INTERVAL, cpu_budget=CPU_BUDGET)
+        return self.schedulers[stream_id]
+
+    def should_alert(self, stream_id=0):
+        """Rate limit: alert unless this stream alerted nearby within the last minute."""
+        lat, lon = self.location.coords
+        layer = f"stream-{stream_id}"
+        if self.recent_alerts.radius(lat, lon, ALERT_DEDUP_KM, layers=[layer], limit=1):
+            return False
+        self.recent_alerts.insert(lat, lon, layer, ttl=ALERT_DEDUP_SECONDS)
+        return True
+
+    def run(self):
         self.cap = cv2.VideoCapture(0) # 0 for Webcam
         
         if not self.cap.isOpened():
-            print("[Error] Could not open webcam.")
-            exit(1)
+            raise RuntimeError("Could not open webcam.")
 
-    def run(self):
         print("[System] Monitoring Feed... Press 'q' to quit.")
         
         while True:
@@ -69,47 +110,29 @@ class CognitiveMonitor:
             if not ret:
                 break
             
+            # Static scene and no recent fire: skip YOLO, just show the raw frame
+            gate = self.scheduler()
+            if not gate.should_infer(frame):
+                cv2.imshow("Cognitive Monitor (Live)", frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+
             # Run Inference
+            start = time.perf_counter()
             results1 = self.model1(frame, verbose=False, conf=0.6)
             # results2 = self.model2(frame, verbose=False, conf=0.6) # Optional: fuse both
             
-            fire_detected = False
-            max_conf = 0.0
-            
             # Check for Fire and Count Objects
-            person_count = 0
-            animal_count = 0
-            ANIMAL_CLASSES = [14, 15, 16, 17, 18, 19, 20, 21, 22, 23] # COCO IDs
-
-            for r in results1:
-                for box in r.boxes:
-                    cls_id = int(box.cls[0])
-                    conf = float(box.conf[0])
-                    cls_name = self.model1.names[cls_id].lower()
-
-                    if 'fire' in cls_name:
-                        fire_detected = True
-                        max_conf = max(max_conf, conf)
-                        # Box drawing is handled by plot()
-                    elif cls_id == 0: # Person
-                        person_count += 1
-                    elif cls_id in ANIMAL_CLASSES:
-                        animal_count += 1
+            fire_detected, max_conf, person_count, animal_count = self.summarize(results1[0], self.model1)
+            gate.report(fire_detected, time.perf_counter() - start)
 
             if fire_detected:
                 # ----------------
                 # SMART RATE LIMIT
                 # ----------------
-                current_time = time.time()
-                time_diff = current_time - self.last_alert_time
-                loc_delta = abs(DRONE_LAT - self.last_lat) + abs(DRONE_LON - self.last_lon)
-                
                 # Check if we should alert (New Loc OR Time > 60s)
-                if loc_delta > 0.001 or time_diff > 60:
-                    self.last_alert_time = current_time
-                    self.last_lat = DRONE_LAT
-                    self.last_lon = DRONE_LON
-                    
+                if self.should_alert():
                     # Pass results1[0] because plot() is a method of a Result object, and we have a list of one result
                     self.trigger_alert(frame, max_conf, person_count, animal_count, results1[0])
                 
@@ -122,45 +145,116 @@ class CognitiveMonitor:
                 
         self.cap.release()
         cv2.destroyAllWindows()
+        print(f"[System] Inference gate: {self.scheduler().stats()}")
+
+    def run_multi(self, sources, headless=True, max_batch=8, device="cpu"):
+        """
+        Monitor several cameras at once.
+
+        Each source gets a capture thread; frames from all streams go through
+        model1 and model2 in one batched call per model. Fire from either
+        model raises an alert, rate-limited per stream.
+        """
+        print(f"[System] Monitoring {len(sources)} streams (batch<={max_batch}, device={device})...")
+        if not self.model2.loaded:
+            self.model_loads += load_in_background([self.model2])
+
+        def on_result(stream_id, frame, results):
+            result1, result2 = results
+            fire1, conf1, persons, animals = self.summarize(result1, self.model1)
+            fire2, conf2, _, _ = self.summarize(result2, self.model2)
+            self.scheduler(stream_id).report(fire1 or fire2, engine.last_frame_seconds)
 
-    def trigger_alert(self, frame, confidence, person_count, animal_count, result):
+            if fire1 or fire2:
+                if self.should_alert(stream_id):
+                    print(f"[Stream {stream_id}] Fire detected")
+                    self.trigger_alert(frame, max(conf1, conf2), persons, animals,
+                                       result1 if conf1 >= conf2 else result2, source_id=stream_id)
+
+            if not headless:
+                cv2.imshow(f"Cognitive Monitor (Stream {stream_id})", result1.plot())
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    engine.stop()
+
+        engine = MultiStreamEngine(
+            [self.model1, self.model2], sources, on_result,
+            max_batch=max_batch,
+            infer_kwargs={"verbose": False, "conf": 0.6, "device": device},
+            gate=lambda stream_id, frame: self.scheduler(stream_id).should_infer(frame),
+        )
+        engine.run()
+        for sid, stats in engine.stats().items():
+            print(f"[Stream {sid}] {stats} | gate: {self.scheduler(sid).stats()}")
+        if not headless:
+            cv2.destroyAllWindows()
+
+    def fire_bbox(self, result):
+        """x1,y1,x2,y2 of the most confident fire box, or None."""
+        best = None
+        for box in result.boxes:
+            conf = float(box.conf[0])
+            if 'fire' in result.names[int(box.cls[0])].lower() and (best is None or conf > best[0]):
+                best = (conf, [round(float(v), 1) for v in box.xyxy[0]])
+        return best[1] if best else None
+
+    def trigger_alert(self, frame, confidence, person_count, animal_count, result, source_id=0):
         print(f"\n[ALERT] Fire Detected! Confidence: {confidence:.2f}")
         print(f"       Risk Assessment: {person_count} Persons, {animal_count} Animals nearby.")
         
         # Draw Bounding Boxes
         annotated_frame = result.plot()
         
-        # Encode Image
-        _, buffer = cv2.imencode('.jpg', annotated_frame)
-        img_b64 = base64.b64encode(buffer).decode('utf-8')
+        # Encode Image (sent as a raw JPEG part, no base64 inflation)
+        _, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
         
-        payload = {
-            "image": img_b64,
+        lat, lon = self.location.coords
+        meta = {
             "confidence": float(confidence),
-            "lat": DRONE_LAT,
-            "lon": DRONE_LON,
+            "lat": lat,
+            "lon": lon,
             "timestamp": datetime.datetime.now().isoformat(),
             "person_count": person_count,
-            "animal_count": animal_count
+            "animal_count": animal_count,
+            # Backend keeps per-camera vision state keyed by this
+            "source_id": f"{MONITOR_ID}/{source_id}",
         }
+        bbox = self.fire_bbox(result)
+        if bbox:
+            meta["bbox"] = ",".join(str(v) for v in bbox)
         
-        try:
-            resp = requests.post(API_URL, json=payload)
-            if resp.status_code == 200:
-                data = resp.json()
-                print("="*60)
-                print(f"✅ SYSTEM RESPONSE RECEIVED")
-                print(f"📍 Coordinates: {DRONE_LAT}, {DRONE_LON}")
-                print(f"📊 Confidence: {confidence*100:.1f}%")
-                print(f"🛡️ Levels Passed: {', '.join(data.get('levels_passed', []))}")
-                print(f"🧠 Reasoning: {data.get('reasoning', 'N/A')}")
-                print(f"📂 Evidence Saved: {data.get('saved_image')}")
-                print("="*60)
-            else:
-                print(f"[Error] Backend rejected alert: {resp.text}")
-        except Exception as e:
-            print(f"[Error] Failed to send alert: {e}")
+        # Spooled to disk and delivered by a background thread; never blocks inference
+        self.uploader.submit(meta, buffer.tobytes())
+
+    def print_response(self, data):
+        print("="*60)
+        print(f"✅ SYSTEM RESPONSE RECEIVED")
+        print(f"📍 Coordinates: {self.location.lat}, {self.location.lon}")
+        print(f"📊 Decision: {data.get('decision', 'N/A')} (Score: {data.get('final_score', 'N/A')})")
+        print(f"🛡️ Levels Passed: {', '.join(data.get('levels_passed', []))}")
+        print(f"🧠 Reasoning: {data.get('reasoning', 'N/A')}")
+        print(f"📂 Evidence Saved: {data.get('saved_image')}")
+        print("="*60)
 
 if __name__ == "__main__":
-    monitor = CognitiveMonitor()
-    monitor.run()
+    parser = argparse.ArgumentParser(description="Cognitive Fire-Grid live monitor")
+    parser.add_argument("--source", action="append",
+                        help="Camera index, video file or RTSP URL; repeat for multi-stream mode")
+    parser.add_argument("--headless", action="store_true", help="Do not open preview windows")
+    parser.add_argument("--max-batch", type=int, default=8, help="Max frames per batched inference call")
+    parser.add_argument("--device", default="cpu", help="Inference device (cpu, cuda:0, ...)")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Directory holding the .pt models (FIRE_MODEL_DIR)")
+    parser.add_argument("--model-format", choices=["onnx", "openvino"], default=MODEL_FORMAT,
+                        help="Export and cache models to a CPU-optimized format (FIRE_MODEL_FORMAT)")
+    parser.add_argument("--lat", type=float, help="Drone latitude (skips IP geolocation; FIRE_DRONE_LAT)")
+    parser.add_argument("--lon", type=float, help="Drone longitude (skips IP geolocation; FIRE_DRONE_LON)")
+    args = parser.parse_args()
+
+    try:
+        monitor = CognitiveMonitor(args.model_dir, args.model_format, resolve_location(args.lat, args.lon))
+        if args.source:
+            monitor.run_multi(args.source, headless=args.headless, max_batch=args.max_batch, device=args.device)
+        else:
+            monitor.run()
+    except (ModelLoadError, RuntimeError) as e:
+        print(f"[Error] {e}")
+        sys.exit(1)
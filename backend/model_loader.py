@@ -0,0 +1,101 @@
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Ultralytics export formats that run well on CPU-only field machines
+CPU_EXPORT_FORMATS = ("onnx", "openvino")
+
+
+class ModelLoadError(RuntimeError):
+    """A model file could not be loaded or exported."""
+
+
+def _fingerprint(path):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def exported_artifact(weights_path, export_format, cache_dir):
+    """
+    Path of the CPU-optimized export of `weights_path`, exporting it once.
+
+    Artifacts are keyed by the source file's path/size/mtime, so retraining
+    (a new .pt) triggers a fresh export and unchanged weights reuse the cache.
+    """
+    from ultralytics import YOLO
+
+    stem = os.path.splitext(os.path.basename(weights_path))[0].replace(" ", "_")
+    suffix = ".onnx" if export_format == "onnx" else "_openvino_model"
+    target = os.path.join(cache_dir, f"{stem}-{_fingerprint(weights_path)}{suffix}")
+    if os.path.exists(target):
+        return target
+
+    print(f"[Loader] Exporting {weights_path} to {export_format} (one-time)...")
+    os.makedirs(cache_dir, exist_ok=True)
+    produced = YOLO(weights_path).export(format=export_format)
+    shutil.move(str(produced), target)
+    return target
+
+
+class LazyModel:
+    """
+    YOLO model that loads on first use (or on an explicit/background load()).
+
+    Callable like the underlying model and exposes `names`, so it drops into
+    the monitor loop and MultiStreamEngine unchanged.
+    """
+
+    def __init__(self, weights_path, label, export_format=None, cache_dir=None):
+        if export_format and export_format not in CPU_EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        self.weights_path = weights_path
+        self.label = label
+        self.export_format = export_format
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(weights_path), ".export_cache")
+        self._model = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._model is not None:
+            return self._model
+        with self._lock:
+            if self._model is None:
+                if self._error is not None:
+                    raise self._error
+                try:
+                    from ultralytics import YOLO
+                    path = self.weights_path
+                    if self.export_format:
+                        path = exported_artifact(path, self.export_format, self.cache_dir)
+                    print(f"[Loader] Loading {self.label}: {path}")
+                    self._model = YOLO(path, task="detect")
+                except Exception as e:
+                    self._error = ModelLoadError(f"Failed to load {self.label} ({self.weights_path}): {e}")
+                    raise self._error
+        return self._model
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    @property
+    def names(self):
+        return self.load().names
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+def load_in_background(models):
+    """
+    Start loading all models in parallel; returns a Future per model so
+    callers can keep initialising (camera, uploader) meanwhile.
+    """
+    pool = ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="model-load")
+    futures = [pool.submit(m.load) for m in models]
+    pool.shutdown(wait=False)
+    return futures
@@ -0,0 +1,246 @@
+import base64
+import binascii
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+from sat_filter import sat_filter
+from handshake import handshake
+from vision_detector import DEFAULT_SOURCE, vision_model
+from dispatch_scheduler import dispatcher
+from evidence_store import EvidenceStore
+from fusion_voting import fusion_engine
+from sensor_fleet import sensor_fleet
+from fire_spread import fire_spread
+from sniffer_navigation import sniffer_nav
+from spatial_index import spatial_index
+from wind_field import DEFAULT_WIND, wind_field
+
+# How long detections/alerts stay queryable in the spatial index
+DETECTION_TTL_SECONDS = 6 * 3600
+ALERT_TTL_SECONDS = 24 * 3600
+
+
+class CognitivePipeline:
+    """
+    Ingest pipeline for live_feed_monitor alerts (Levels 1-4).
+
+    Responsibility:
+    - Decode the alert, hand the evidence JPEG to the content-addressed
+      evidence store (deduplicated, written and thumbnailed in the background).
+    - Feed vision_model and the sensor fleet (per source_id camera/drone,
+      so each source keeps its own acoustic/chemical state) and run
+      sat_filter -> handshake -> fusion_engine -> fire_spread/sniffer_nav.
+      Alerts may carry audio (fire_band_energy, wind_energy) and gas
+      (co, co2, nox) readings; missing ones are simulated per source.
+    - Publish the result as an immutable status snapshot, so /api/fusion-status
+      is a dictionary read, not a fusion run. Snapshots are swapped and
+      handed to listeners under one lock, so listeners see versions in order.
+    - Record located detections (with their satellite check) and alerts in
+      the shared spatial index.
+    - Plan triggered alerts (Level 4) on a single planner thread, off the
+      request path: wind from the alert or the shared wind field (a provider
+      failure falls back to DEFAULT_WIND), spread cone, sniffer path and a
+      dispatch incident (one per ~100 m location). The alert's snapshot is
+      published with "planning" set and republished with the plan, unless
+      a newer alert has replaced it by then.
+    """
+
+    def __init__(self, evidence_dir, evidence_url_prefix="/api/evidence", max_pending=64,
+                 index=spatial_index, wind=wind_field, dispatch=dispatcher, store=None, sensors=sensor_fleet):
+        self.store = store or EvidenceStore(evidence_dir, url_prefix=evidence_url_prefix, max_pending=max_pending)
+        self.index = index
+        self.wind = wind
+        self.dispatch = dispatch
+        self.sensors = sensors
+        self._lock = threading.Lock()
+        self._snapshot = self._idle_snapshot()
+        # One planner keeps dispatch decisions in alert order
+        self._planner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-plan")
+        self._plans = set()
+        # Called with each new snapshot (e.g. to push it to dashboard streams)
+        self.listeners = []
+
+    def _idle_snapshot(self):
+        return {
+            "version": 0,
+            "decision": "SAFE",
+            "previous_decision": "SAFE",
+            "final_score": 0.0,
+            "vision_conf": 0.0,
+            "audio_conf": 0.0,
+            "chem_conf": 0.0,
+            "min_levels_passed": [],
+            "reasoning": None,
+            "triggered_sniffer": False,
+            "planning": False,
+            "evidence_image": None,
+            "evidence_thumb": None,
+            "evidence_preview": None,
+            "lat": None,
+            "lon": None,
+            "persons": 0,
+            "animals": 0,
+            "updated_at": None,
+        }
+
+    def snapshot(self):
+        return self._snapshot
+
+    def ingest(self, payload, image=None):
+        """
+        Process one alert payload from live_feed_monitor.
+
+        Args:
+            payload: Alert fields; JSON alerts carry the JPEG base64-encoded
+                under "image".
+            image: Raw JPEG bytes (multipart uploads); takes precedence over
+                payload["image"].
+
+        Raises:
+            ValueError: if the payload is missing or has malformed fields.
+        """
+        try:
+            confidence = float(payload["confidence"])
+            lat = float(payload["lat"]) if payload.get("lat") not in (None, "") else None
+            lon = float(payload["lon"]) if payload.get("lon") not in (None, "") else None
+            persons = int(payload.get("person_count", 0))
+            animals = int(payload.get("animal_count", 0))
+            source = str(payload.get("source_id") or DEFAULT_SOURCE)
+            bbox = payload.get("bbox")
+            if bbox not in (None, ""):
+                bbox = [float(v) for v in (bbox.split(",") if isinstance(bbox, str) else bbox)]
+                if len(bbox) != 4:
+                    raise ValueError("bbox must have 4 values")
+            else:
+                bbox = None
+            if image is None and payload.get("image"):
+                image = base64.b64decode(payload["image"], validate=True)
+            audio = None
+            if payload.get("fire_band_energy") not in (None, ""):
+                audio = ([float(payload["fire_band_energy"])], [float(payload.get("wind_energy", 0.0))])
+            gas = None
+            if payload.get("co") not in (None, ""):
+                gas = ([float(payload["co"])], [float(payload["co2"])], [float(payload["nox"])])
+            wind = None
+            if payload.get("wind_speed_kmh") not in (None, ""):
+                wind = (float(payload["wind_speed_kmh"]), float(payload.get("wind_bearing", 0.0)))
+        except (KeyError, TypeError, ValueError, binascii.Error) as e:
+            raise ValueError(f"Invalid alert payload: {e}")
+
+        # Hashing is the only evidence work done on the request thread
+        digest = self.store.put(image) if image else None
+        evidence_url = self.store.url(digest) if digest else None
+
+        with self._lock:
+            vision_model.update_detection(confidence, evidence_url, lat=lat, lon=lon,
+                                          p_count=persons, a_count=animals, source=source, bbox=bbox)
+
+            # Level 1 -> 2
+            sat_result = sat_filter.analyze_temporal_persistence({
+                "latitude": lat,
+                "longitude": lon,
+                "brightness": float(payload.get("brightness", 0)),
+            })
+            drone_config = handshake.calculate_drone_config(sat_result.get("confidence", 0.0))
+
+            # Level 3
+            vision_result = vision_model.detect_fire(source=source)
+            v_conf = vision_result["normalized_conf"]
+            # Per-source acoustic/chemical state; readings without values are simulated
+            audio_batch = self.sensors.analyze_audio([source], *(audio or (None, None)), simulate_fire_intensity=v_conf)
+            chem_batch = self.sensors.analyze_gas([source], *(gas or (None, None, None)), simulate_fire_intensity=v_conf)
+            audio_result = {"confidence": float(audio_batch["confidence"][0])}
+            chem_result = {"confidence": float(chem_batch["confidence"][0])}
+            trace = fusion_engine.fuse_data(vision_result, audio_result, chem_result)
+            # Level 4 runs on the planner thread
+            planning = bool(trace["triggered_sniffer"]) and lat is not None and lon is not None
+
+            if image:
+                # This alert's frame, or none if the store dropped it: never the previous alert's
+                evidence = [self.store.url(digest, v) if digest else None for v in (None, "thumb", "preview")]
+            else:
+                evidence = [self._snapshot[k] for k in ("evidence_image", "evidence_thumb", "evidence_preview")]
+
+            snapshot = dict(trace)
+            snapshot.update({
+                "version": self._snapshot["version"] + 1,
+                "previous_decision": self._snapshot["decision"],
+                "planning": planning,
+                "evidence_image": evidence[0],
+                "evidence_thumb": evidence[1],
+                "evidence_preview": evidence[2],
+                "lat": lat,
+                "lon": lon,
+                "persons": persons,
+                "animals": animals,
+                "satellite": sat_result,
+                "drone_config": drone_config,
+                "spread_cone": None,
+                "sniffer_path": [],
+                "mission": None,
+                "updated_at": datetime.now().isoformat(),
+            })
+            self._swap(snapshot)
+
+        if lat is not None and lon is not None:
+            self.index.insert(lat, lon, "detection", ttl=DETECTION_TTL_SECONDS, data={
+                "confidence": confidence,
+                "satellite": sat_result,
+                "evidence_image": evidence_url,
+                "version": snapshot["version"],
+            })
+            if trace["triggered_sniffer"]:
+                self.index.insert(lat, lon, "alert", ttl=ALERT_TTL_SECONDS, data={
+                    "decision": trace["decision"],
+                    "final_score": trace["final_score"],
+                    "evidence_image": snapshot["evidence_image"],
+                    "updated_at": snapshot["updated_at"],
+                })
+
+        if planning:
+            future = self._planner.submit(self._plan, snapshot["version"], lat, lon, wind,
+                                          trace["final_score"], drone_config)
+            self._plans.add(future)
+            future.add_done_callback(self._plans.discard)
+        return snapshot
+
+    def _swap(self, snapshot):
+        """Install and publish a snapshot (lock held, so listeners see versions in order)."""
+        # Readers only ever see a complete snapshot (single reference swap)
+        self._snapshot = snapshot
+        for listener in self.listeners:
+            listener(snapshot)
+
+    def _plan(self, version, lat, lon, wind, score, drone_config):
+        """Level 4 for one triggered alert (planner thread)."""
+        plan = {"planning": False, "spread_cone": None, "sniffer_path": [], "mission": None}
+        try:
+            if wind is None:
+                try:
+                    wind = self.wind.sample_point(lat, lon)
+                except Exception as e:
+                    print(f"[Pipeline] Wind field unavailable, using default wind: {e}")
+                    wind = DEFAULT_WIND
+            wind_speed, wind_bearing = wind
+            plan["spread_cone"] = fire_spread.calculate_spread_cone(lat, lon, wind_speed, wind_bearing)
+            plan["sniffer_path"] = sniffer_nav.generate_sniffer_path(lat, lon, wind_bearing=wind_bearing)
+            incident_id = self.dispatch.submit_incident(
+                lat, lon, score, plan["spread_cone"]["ros_kmh"],
+                incident_id=f"fire_{lat:.3f}_{lon:.3f}", config=drone_config)
+            self.dispatch.dispatch()
+            plan["mission"] = self.dispatch.mission_for(incident_id)
+        except Exception as e:
+            print(f"[Pipeline] Planning failed for snapshot {version}: {e}")
+
+        with self._lock:
+            if self._snapshot["version"] != version:
+                return  # superseded; the incident stays with the dispatcher
+            snapshot = dict(self._snapshot, **plan)
+            snapshot["version"] = version + 1
+            snapshot["previous_decision"] = snapshot["decision"]
+            self._swap(snapshot)
+
+    def join(self):
+        """Block until every queued plan has been applied (tests/shutdown)."""
+        wait(list(self._plans))
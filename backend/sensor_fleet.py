@@ -0,0 +1,199 @@
+import time
+
+import numpy as np
+
+from acoustic_fft import AcousticFFT
+from chemical_ratio import ChemicalRatio
+
+
+class SensorFleet:
+    """
+    Level 3B/3C: Sensor Fleet (The Senses, many field nodes)
+
+    Responsibility:
+    - Keep per-node acoustic/chemical state in flat arrays indexed by a node
+      slot (node id -> slot), instead of one shared module-level state.
+    - Score batches of readings from thousands of nodes in one vectorized call
+      with the same ratio/confidence rules as AcousticFFT and ChemicalRatio.
+    - Fall back to the per-node simulation when a batch carries no readings.
+    """
+
+    FIELDS = {
+        "audio_energy": np.float32,   # smoothed fire-band energy (AcousticFFT.last_energy)
+        "wind_energy": np.float32,
+        "audio_conf": np.float32,
+        "co_ppm": np.float32,
+        "co2_ppm": np.float32,
+        "nox_ppm": np.float32,
+        "chem_conf": np.float32,
+        "audio_at": np.float64,
+        "chem_at": np.float64,
+    }
+
+    def __init__(self, capacity=1024, smoothing=1.0, seed=None, clock=time.time):
+        """
+        Args:
+            capacity: Initial number of node slots (grows by doubling).
+            smoothing: EWMA weight of a new fire-band reading; 1.0 keeps the
+                latest reading as is (AcousticFFT behaviour).
+        """
+        self.smoothing = smoothing
+        self.clock = clock
+        self.rng = np.random.default_rng(seed)
+        self.chemical = ChemicalRatio()  # per-slot rolling CO baselines
+        self.node_ids = []
+        self._index = {}
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        old = getattr(self, "state", None)
+        self.state = {}
+        for name, dtype in self.FIELDS.items():
+            column = np.full(capacity, np.nan, dtype=dtype)
+            if old is not None:
+                column[:len(old[name])] = old[name]
+            self.state[name] = column
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def register(self, node_ids):
+        """Map node ids to slots, adding unseen nodes. Returns an int array."""
+        slots = np.empty(len(node_ids), dtype=np.intp)
+        index = self._index
+        for i, node_id in enumerate(node_ids):
+            slot = index.get(node_id)
+            if slot is None:
+                slot = index[node_id] = len(self.node_ids)
+                self.node_ids.append(node_id)
+            slots[i] = slot
+        if len(self.node_ids) > self.capacity:
+            capacity = self.capacity
+            while capacity < len(self.node_ids):
+                capacity *= 2
+            self._alloc(capacity)
+        return slots
+
+    def _slots(self, nodes):
+        """Node ids, or an int array of slots already returned by register()."""
+        if isinstance(nodes, np.ndarray) and nodes.dtype.kind in "iu":
+            return nodes
+        return self.register(list(nodes))
+
+    def analyze_audio(self, nodes, fire_band_energy=None, wind_energy=None, simulate_fire_intensity=None):
+        """
+        Score one acoustic reading per node.
+
+        Args:
+            nodes: Node ids, or slots from register(). One reading per node
+                per call (a repeated node keeps its last reading).
+            fire_band_energy, wind_energy: Per-node band energies on the
+                AcousticFFT 0-100 scale, as computed on the node. Omit both
+                to simulate.
+            simulate_fire_intensity: Scalar or per-node vision confidence
+                biasing the simulation.
+
+        Returns:
+            dict of arrays: fire_band_energy, wind_energy, ratio, confidence.
+        """
+        slots = self._slots(nodes)
+        last = self.state["audio_energy"][slots].astype(np.float64)
+
+        if fire_band_energy is None:
+            fire, wind = self._simulate_audio(last, simulate_fire_intensity)
+        else:
+            reading = np.asarray(fire_band_energy, dtype=np.float64)
+            fire = np.where(np.isnan(last), reading, last + self.smoothing * (reading - last))
+            wind = np.asarray(wind_energy, dtype=np.float64)
+
+        ratio, confidence = AcousticFFT.confidence_from_energies(fire, wind)
+        self.state["audio_energy"][slots] = fire
+        self.state["wind_energy"][slots] = wind
+        self.state["audio_conf"][slots] = confidence
+        self.state["audio_at"][slots] = self.clock()
+        return {
+            "fire_band_energy": np.round(fire, 2),
+            "wind_energy": np.round(wind, 2),
+            "ratio": np.round(ratio, 2),
+            "confidence": np.round(confidence, 2),
+        }
+
+    def _simulate_audio(self, last, intensity):
+        """Vectorized AcousticFFT.analyze_audio simulation hook, per node."""
+        n = len(last)
+        last = np.where(np.isnan(last), 50.0, last)
+        intensity = np.broadcast_to(np.nan if intensity is None else np.asarray(intensity, dtype=np.float64), (n,))
+        hot = intensity > 0.6
+        walk = np.clip(last + self.rng.uniform(-5, 5, n), 0, 100)
+        toward = np.where(last < intensity * 100, last + 5, last - 2)
+        fire = np.where(hot, toward, walk)
+        return fire, self.rng.uniform(0, 50, n)
+
+    def analyze_gas(self, nodes, co=None, co2=None, nox=None, simulate_fire_intensity=None):
+        """
+        Score one gas reading (ppm) per node.
+
+        Args:
+            nodes: Node ids, or slots from register().
+            co, co2, nox: Per-node concentrations. Omit all three to simulate.
+            simulate_fire_intensity: Scalar or per-node vision confidence
+                biasing the simulation.
+
+        Returns:
+            dict of arrays: co_ppm, co2_ppm, nox_ppm, co_co2_ratio,
+            nox_co_ratio, co_zscore (vs. the node's rolling CO baseline),
+            confidence.
+        """
+        slots = self._slots(nodes)
+        if co is None:
+            co, co2, nox = self._simulate_gas(len(slots), simulate_fire_intensity)
+        co = np.asarray(co, dtype=np.float64)
+        co2 = np.asarray(co2, dtype=np.float64)
+        nox = np.asarray(nox, dtype=np.float64)
+
+        scored = self.chemical.analyze_batch(co, co2, nox, sensors=slots)
+        confidence = scored["confidence"]
+        self.state["co_ppm"][slots] = co
+        self.state["co2_ppm"][slots] = co2
+        self.state["nox_ppm"][slots] = nox
+        self.state["chem_conf"][slots] = confidence
+        self.state["chem_at"][slots] = self.clock()
+        return {
+            "co_ppm": np.round(co, 2),
+            "co2_ppm": np.round(co2, 2),
+            "nox_ppm": np.round(nox, 2),
+            "co_co2_ratio": np.round(scored["co_co2_ratio"], 4),
+            "nox_co_ratio": np.round(scored["nox_co_ratio"], 4),
+            "co_zscore": scored["co_zscore"],
+            "confidence": confidence,
+        }
+
+    def _simulate_gas(self, n, intensity):
+        """Vectorized ChemicalRatio.analyze_gas simulation hook, per node."""
+        u = self.rng.uniform
+        co, co2, nox = u(0, 5, n), u(400, 450, n), u(0, 10, n)
+        intensity = np.broadcast_to(np.nan if intensity is None else np.asarray(intensity, dtype=np.float64), (n,))
+        hot = intensity > 0.6
+        event = ~hot & (u(0, 1, n) > 0.8)
+        fire = event & (u(0, 1, n) > 0.5)
+        vehicle = event & ~fire
+
+        co = np.where(hot, u(50, 150, n), np.where(fire, u(20, 150, n), np.where(vehicle, u(10, 50, n), co)))
+        co2 = np.where(hot, u(600, 900, n), np.where(fire, u(500, 800, n), co2))
+        nox = np.where(hot, u(5, 20, n), np.where(vehicle, u(50, 100, n), nox))
+        return co, co2, nox
+
+    def node_state(self, node_id):
+        """Latest per-node state as plain floats (None where never reported)."""
+        slot = self._index.get(node_id)
+        if slot is None:
+            return None
+        state = {}
+        for name in self.FIELDS:
+            value = float(self.state[name][slot])
+            state[name] = None if np.isnan(value) else value
+        return state
+
+
+sensor_fleet = SensorFleet()
@@ -1,71 +1,291 @@
 
-import random
 import math
 
+import numpy as np
+
+KM_PER_DEG = 111.195
+# 1 ppm CO ~ 1.145 mg/m3 at 25 C
+CO_MG_M3_PER_PPM = 1.145
+
+# Per-drone status codes in plan_batch output
+SEARCHING, CONFIRMED, LOCALIZED = 0, 1, 2
+STATUSES = ("SEARCHING", "CONFIRMED", "LOCALIZED")
+
+_COMPASS = np.radians(np.arange(0, 360, 45))
+PROBE_NORTH, PROBE_EAST = np.cos(_COMPASS), np.sin(_COMPASS)
+
+
+class ConcentrationField:
+    """
+    Gridded gas concentration (ppm above background) for sniffer planning.
+
+    Rows run south -> north, columns west -> east (as TerrainRasters). The
+    gradient is precomputed once per field in ppm per km, so sampling it
+    for a batch of drones is two bilinear gathers.
+    """
+
+    def __init__(self, west, south, step_deg, values):
+        self.west = float(west)
+        self.south = float(south)
+        self.step_deg = float(step_deg)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.peak = float(self.values.max()) if self.values.size else 0.0
+        rows, cols = self.values.shape
+        lats = self.south + np.arange(rows) * self.step_deg
+        dy_km = self.step_deg * KM_PER_DEG
+        dx_km = dy_km * np.cos(np.radians(lats))[:, None]
+        self.grad_north = np.gradient(self.values, axis=0) / dy_km
+        self.grad_east = np.gradient(self.values, axis=1) / dx_km
+
+    @classmethod
+    def _grid(cls, bbox, step_deg):
+        west, south, east, north = bbox
+        rows = int(round((north - south) / step_deg)) + 1
+        cols = int(round((east - west) / step_deg)) + 1
+        lats = south + np.arange(rows) * step_deg
+        lons = west + np.arange(cols) * step_deg
+        return np.meshgrid(lats, lons, indexing="ij")
+
+    @classmethod
+    def from_readings(cls, lats, lons, ppm, bbox, step_deg, power=2.0, chunk=65536):
+        """Inverse-distance-weighted grid from scattered chemical readings."""
+        lat_grid, lon_grid = cls._grid(bbox, step_deg)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        ppm = np.asarray(ppm, dtype=np.float64)
+        coslat = math.cos(math.radians((bbox[1] + bbox[3]) / 2))
+        flat_lat, flat_lon = lat_grid.ravel(), lon_grid.ravel()
+        values = np.empty(flat_lat.size)
+        for start in range(0, flat_lat.size, chunk):
+            dy = flat_lat[start:start + chunk, None] - lats
+            dx = (flat_lon[start:start + chunk, None] - lons) * coslat
+            weights = 1.0 / np.maximum(dy * dy + dx * dx, 1e-18) ** (power / 2)
+            values[start:start + chunk] = (weights @ ppm) / weights.sum(axis=1)
+        return cls(bbox[0], bbox[1], step_deg, values.reshape(lat_grid.shape))
+
+    @classmethod
+    def from_plume(cls, sources, wind_speed_kmh, wind_bearing, bbox, step_deg, emission_gs=100.0, min_x_m=20.0):
+        """
+        Ground-level Gaussian plume (Briggs rural, neutral class D) summed
+        over point sources.
+
+        Args:
+            sources: List of (lat, lon).
+            wind_speed_kmh, wind_bearing: Scalars or one per source; the
+                bearing is where the wind blows towards.
+            emission_gs: CO emission per source in g/s.
+        """
+        lat_grid, lon_grid = cls._grid(bbox, step_deg)
+        n = len(sources)
+        speeds = np.broadcast_to(np.asarray(wind_speed_kmh, dtype=np.float64), (n,))
+        bearings = np.broadcast_to(np.asarray(wind_bearing, dtype=np.float64), (n,))
+        values = np.zeros(lat_grid.shape)
+        for (lat, lon), speed, bearing in zip(sources, speeds.tolist(), bearings.tolist()):
+            north_m = (lat_grid - lat) * KM_PER_DEG * 1000.0
+            east_m = (lon_grid - lon) * KM_PER_DEG * 1000.0 * math.cos(math.radians(lat))
+            theta = math.radians(bearing)
+            downwind = north_m * math.cos(theta) + east_m * math.sin(theta)
+            crosswind = -north_m * math.sin(theta) + east_m * math.cos(theta)
+            x = np.maximum(downwind, min_x_m)
+            sigma_y = 0.08 * x / np.sqrt(1 + 0.0001 * x)
+            sigma_z = 0.06 * x / np.sqrt(1 + 0.0015 * x)
+            u = max(speed / 3.6, 0.5)
+            grams = emission_gs / (math.pi * sigma_y * sigma_z * u) * np.exp(-crosswind ** 2 / (2 * sigma_y ** 2))
+            values += np.where(downwind > -min_x_m, grams * 1000.0 / CO_MG_M3_PER_PPM, 0.0)
+        return cls(bbox[0], bbox[1], step_deg, values)
+
+    def _bilinear(self, grid, lats, lons):
+        rows, cols = grid.shape
+        fy = np.clip((lats - self.south) / self.step_deg, 0, rows - 1)
+        fx = np.clip((lons - self.west) / self.step_deg, 0, cols - 1)
+        i0 = np.minimum(fy.astype(np.intp), max(rows - 2, 0))
+        j0 = np.minimum(fx.astype(np.intp), max(cols - 2, 0))
+        i1, j1 = np.minimum(i0 + 1, rows - 1), np.minimum(j0 + 1, cols - 1)
+        ty, tx = fy - i0, fx - j0
+        south = grid[i0, j0] * (1 - tx) + grid[i0, j1] * tx
+        north = grid[i1, j0] * (1 - tx) + grid[i1, j1] * tx
+        return south * (1 - ty) + north * ty
+
+    def sample(self, lats, lons):
+        return self._bilinear(self.values, lats, lons)
+
+    def gradient(self, lats, lons):
+        """(dC/dnorth, dC/deast) in ppm per km at point arrays."""
+        return self._bilinear(self.grad_north, lats, lons), self._bilinear(self.grad_east, lats, lons)
+
+
 class SnifferNavigation:
     """
     Level 4: Autonomous Localization (The Brain)
-    
+
     Responsibility:
     - Execute Sniffer Mode (Bio-Inspired Gradient Descent).
     - Zig-zag movement to follow max(dConcentration/dt).
     - Termination condition: Gradient stabilizes below epsilon or visual confirmation.
+    - Plan many drones at once over a ConcentrationField, with per-drone
+      position, step length and status arrays (no state shared between
+      calls or callers).
     """
-    
-    def __init__(self):
-        self.current_lat = 0
-        self.current_lon = 0
-        self.path_history = []
-        
-    def generate_sniffer_path(self, start_lat, start_lon, steps=10):
+
+    def plan_batch(self, start_lats, start_lons, field, steps=60, step_m=60.0, epsilon_m=5.0,
+                   wind_bearing=None, vision=None, confirm_conf=0.7, min_gradient=None, detect_ppm=None):
         """
-        Simulate a zig-zag path towards a source.
-        
-        Simulation Hook:
-        Generate a path that spirals/zig-zags towards a target point.
+        Climb the concentration gradient for every drone in lockstep.
+
+        Each step a drone moves along the local gradient (the direction of
+        max dC/dt). A move that does not raise the measured concentration
+        is rejected and the step is halved; accepted moves let it grow back
+        towards step_m. Once the step falls below epsilon_m, or the
+        gradient vanishes where the gas is strong, the gradient has
+        stabilized and the drone reports LOCALIZED. Drones in clean air
+        cast in widening crosswind zig-zags (wind_bearing known) or an
+        expanding square spiral until they pick the gas up again.
+        vision(lats, lons) -> conf above confirm_conf ends a drone's
+        search as CONFIRMED.
+
+        Returns:
+            dict of arrays: lat/lon (steps + 1, drones) positions, moved
+            (steps, drones) mask, status (drones) codes, steps_taken.
         """
-        path = []
-        lat, lon = start_lat, start_lon
-        
-        # Simulate localizing a source approx 0.005 degrees away (~500m)
-        target_lat = start_lat + 0.005
-        target_lon = start_lon + 0.003
-        
-        epsilon = 0.0001
-        vision_conf = 0.0
-        
+        lat = np.array(start_lats, dtype=np.float64, ndmin=1)
+        lon = np.array(start_lons, dtype=np.float64, ndmin=1)
+        n = len(lat)
+        if vision is None:
+            peak = field.peak or 1.0
+            vision = lambda la, lo: 0.1 + 0.8 * field.sample(la, lo) / peak
+        if min_gradient is None:
+            min_gradient = 1e-6 * (field.peak or 1.0)
+        if detect_ppm is None:
+            detect_ppm = 1e-3 * (field.peak or 1.0)
+        cast_heading = math.radians(wind_bearing + 180.0) if wind_bearing is not None else None
+        if cast_heading is not None:
+            leg_length = lambda leg: leg + 1
+        else:
+            leg_length = lambda leg: leg // 2 + 1
+
+        conc = field.sample(lat, lon)
+        step = np.full(n, float(step_m))
+        status = np.full(n, SEARCHING, dtype=np.int8)
+        steps_taken = np.zeros(n, dtype=np.int32)
+        cast_leg = np.zeros(n, dtype=np.int64)
+        cast_left = np.ones(n, dtype=np.int64)
+        track_lat = np.empty((steps + 1, n))
+        track_lon = np.empty((steps + 1, n))
+        moved = np.zeros((steps, n), dtype=bool)
+        track_lat[0], track_lon[0] = lat, lon
+
         for i in range(steps):
-             # 1. Zig-zag logic: Add noise perpendicular to direction
-             progress = i / steps
-             
-             # Lerp towards target
-             new_lat = lat + (target_lat - lat) * 0.2
-             new_lon = lon + (target_lon - lon) * 0.2
-             
-             # Add Zig-Zag (Sine wave modulation)
-             offset = math.sin(i) * 0.001 * (1.0 - progress) # Amplitude decreases as we get closer
-             new_lon += offset
-             
-             # 2. Check Exit Conditions
-             dist_to_target = math.sqrt((target_lat - new_lat)**2 + (target_lon - new_lon)**2)
-             
-             # Condition A: Gradient stabilizes (proximity)
-             if dist_to_target < epsilon:
-                 print("[Level 4] Sniffer Mode Terminated: Source Localized (Gradient Stabilized).")
-                 break
-                 
-             # Condition B: Visual Confirmation > 0.7
-             # Simulate vision getting clearer as we get closer
-             vision_conf = 0.1 + (progress * 0.8) 
-             if vision_conf > 0.7:
-                 print(f"[Level 4] Sniffer Mode Terminated: Visual Confirmation ({vision_conf:.2f}).")
-                 path.append({"lat": new_lat, "lon": new_lon, "step": i, "status": "CONFIRMED"})
-                 break
-            
-             path.append({"lat": new_lat, "lon": new_lon, "step": i, "status": "SEARCHING"})
-             lat, lon = new_lat, new_lon
-             
-        self.path_history = path
+            active = np.flatnonzero(status == SEARCHING)
+            if not len(active):
+                track_lat[i + 1:], track_lon[i + 1:] = lat, lon
+                break
+            steps_taken[active] += 1
+            g_north, g_east = field.gradient(lat[active], lon[active])
+            g_mag = np.hypot(g_north, g_east)
+            flat = g_mag <= min_gradient
+            # No slope left where the gas is strong: the gradient has stabilized
+            stable = flat & (conc[active] > detect_ppm)
+            status[active[stable]] = LOCALIZED
+            active, g_north, g_east, g_mag, lost = (
+                active[~stable], g_north[~stable], g_east[~stable], g_mag[~stable], flat[~stable])
+            a_lat, a_lon = lat[active], lon[active]
+
+            # Cast while lost: crosswind legs of growing length alternating sides
+            # (a widening zig-zag across the wind), or an expanding square
+            # spiral when the wind is unknown; reset once the gas is found.
+            leg = cast_leg[active]
+            if cast_heading is not None:
+                heading = cast_heading + math.pi / 2 + math.pi * (leg % 2)
+            else:
+                heading = (math.pi / 2) * leg
+            with np.errstate(invalid="ignore", divide="ignore"):
+                g_north, g_east = g_north / g_mag, g_east / g_mag
+            # Probe the gradient heading plus the 8 compass headings and keep
+            # the one with the largest concentration gain (max dC/dt); the
+            # probes cover for ridges narrower than the grid resolves.
+            probes = (len(active), len(PROBE_NORTH))
+            u_north = np.column_stack([np.where(lost, np.cos(heading), g_north), np.broadcast_to(PROBE_NORTH, probes)])
+            u_east = np.column_stack([np.where(lost, np.sin(heading), g_east), np.broadcast_to(PROBE_EAST, probes)])
+
+            d_km = (np.where(lost, step_m, step[active]) / 1000.0)[:, None]
+            probe_lat = a_lat[:, None] + u_north * d_km / KM_PER_DEG
+            probe_lon = a_lon[:, None] + u_east * d_km / (KM_PER_DEG * np.cos(np.radians(a_lat)))[:, None]
+            probe_conc = field.sample(probe_lat, probe_lon)
+            best = np.where(lost, 0, np.argmax(probe_conc, axis=1))
+            rows = np.arange(len(active))
+            new_lat, new_lon = probe_lat[rows, best], probe_lon[rows, best]
+            new_conc = probe_conc[rows, best]
+
+            casting, found = active[lost], active[~lost]
+            cast_left[casting] -= 1
+            turn = casting[cast_left[casting] == 0]
+            cast_leg[turn] += 1
+            cast_left[turn] = leg_length(cast_leg[turn])
+            cast_leg[found], cast_left[found] = 0, 1
+
+            # Keep a move only if dC/dt > 0 (casting always moves)
+            accept = lost | (new_conc > conc[active])
+            go = active[accept]
+            lat[go], lon[go], conc[go] = new_lat[accept], new_lon[accept], new_conc[accept]
+            step[go] = np.minimum(step[go] * 2.0, step_m)
+            moved[i, go] = True
+
+            rejected = active[~accept]
+            step[rejected] *= 0.5
+            status[rejected[step[rejected] < epsilon_m]] = LOCALIZED
+            confirmed = go[vision(lat[go], lon[go]) > confirm_conf]
+            status[confirmed] = CONFIRMED
+            track_lat[i + 1], track_lon[i + 1] = lat, lon
+
+        return {"lat": track_lat, "lon": track_lon, "moved": moved, "status": status, "steps_taken": steps_taken}
+
+    def plan(self, start_lats, start_lons, field, **kwargs):
+        """plan_batch as one path per drone (lists of {lat, lon, step, status} like generate_sniffer_path)."""
+        result = self.plan_batch(start_lats, start_lons, field, **kwargs)
+        track_lat, track_lon = result["lat"].T.tolist(), result["lon"].T.tolist()
+        paths = []
+        for d, (moved, code) in enumerate(zip(result["moved"].T, result["status"].tolist())):
+            idx = np.flatnonzero(moved).tolist()
+            path = [{"lat": track_lat[d][i + 1], "lon": track_lon[d][i + 1], "step": i, "status": "SEARCHING"}
+                    for i in idx]
+            if code != SEARCHING:
+                if path:
+                    path[-1]["status"] = STATUSES[code]
+                else:
+                    path.append({"lat": track_lat[d][0], "lon": track_lon[d][0], "step": 0,
+                                 "status": STATUSES[code]})
+            paths.append(path)
+        return paths
+
+    def generate_sniffer_path(self, start_lat, start_lon, steps=40, wind_bearing=None):
+        """
+        Simulate a sniffer path towards a source.
+
+        Simulation Hook:
+        Place a CO source approx 0.005 degrees (~500 m) away and plan over
+        its plume. With wind_bearing (where the wind blows towards, e.g.
+        from the wind field) the source sits upwind of the drone; otherwise
+        north-east of it, with the plume blowing towards the drone.
+        """
+        reach = math.hypot(0.005, 0.003)
+        if wind_bearing is None:
+            target_lat, target_lon = start_lat + 0.005, start_lon + 0.003
+            wind_bearing = math.degrees(math.atan2(-0.003, -0.005)) % 360.0
+        else:
+            upwind = math.radians(wind_bearing + 180.0)
+            target_lat = start_lat + reach * math.cos(upwind)
+            target_lon = start_lon + reach * math.sin(upwind)
+
+        pad = 2 * reach
+        bbox = (min(start_lon, target_lon) - pad, min(start_lat, target_lat) - pad,
+                max(start_lon, target_lon) + pad, max(start_lat, target_lat) + pad)
+        field = ConcentrationField.from_plume([(target_lat, target_lon)], 10.0, wind_bearing, bbox, 0.0002)
+        path = self.plan([start_lat], [start_lon], field, steps=steps, step_m=100.0,
+                         wind_bearing=wind_bearing)[0]
+        if path and path[-1]["status"] == "CONFIRMED":
+            print(f"[Level 4] Sniffer Mode Terminated: Visual Confirmation ({path[-1]['lat']:.5f}, {path[-1]['lon']:.5f}).")
+        elif path and path[-1]["status"] == "LOCALIZED":
+            print("[Level 4] Sniffer Mode Terminated: Source Localized (Gradient Stabilized).")
         return path
 
 sniffer_nav = SnifferNavigation()
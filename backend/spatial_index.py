@@ -0,0 +1,344 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.195
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance from one point to arrays of points."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Shared in-memory spatial index for hotspots, detections and alerts.
+
+    Responsibility:
+    - Points live in a fixed lat/lon grid (`cell_deg` buckets). The bulk of
+      them sit in a packed segment sorted by cell key, so a bbox becomes one
+      key range per grid row (two searchsorted calls).
+    - Incremental inserts go to a small unsorted segment that is scanned
+      directly and merged into the packed one once it outgrows `merge_at`.
+    - Every point has a layer ("hotspot", "detection", "alert", ...), an
+      optional key (re-inserting a key replaces the old point) and an
+      optional TTL; expired points are hidden from queries and dropped on
+      the next merge or expire().
+    - Queries: bbox, radius (haversine) and k-nearest (expanding radius).
+    """
+
+    COLUMNS = ("lat", "lon", "timestamp", "expires_at", "layer", "id")
+
+    def __init__(self, cell_deg=0.1, merge_at=65536, clock=time.time):
+        self.cell_deg = cell_deg
+        self.n_cols = int(math.ceil(360.0 / cell_deg))
+        self.n_rows = int(math.ceil(180.0 / cell_deg))
+        self.merge_at = merge_at
+        self.clock = clock
+        self.layers = []
+        self._layer_codes = {}
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._keys = {}      # user key -> (point id, lat, lon)
+        self._data = {}      # point id -> payload dict
+        self._packed = self._empty()
+        self._packed_keys = np.empty(0, dtype=np.int64)
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._pending = {name: [] for name in self.COLUMNS}
+        self._pending_pos = {}     # point id -> position in the pending lists
+        self._pending_cache = None
+
+    @staticmethod
+    def _empty():
+        return {
+            "lat": np.empty(0), "lon": np.empty(0), "timestamp": np.empty(0),
+            "expires_at": np.empty(0), "layer": np.empty(0, dtype=np.int16),
+            "id": np.empty(0, dtype=np.int64),
+        }
+
+    def _layer_code(self, layer):
+        code = self._layer_codes.get(layer)
+        if code is None:
+            code = self._layer_codes[layer] = len(self.layers)
+            self.layers.append(layer)
+        return code
+
+    def _cell_keys(self, lats, lons):
+        rows = np.clip(((np.asarray(lats) + 90.0) // self.cell_deg).astype(np.int64), 0, self.n_rows - 1)
+        cols = np.clip(((np.asarray(lons) + 180.0) // self.cell_deg).astype(np.int64), 0, self.n_cols - 1)
+        return rows * self.n_cols + cols
+
+    def __len__(self):
+        return int(self._alive(self._packed).sum()) + int(self._alive(self._pending_arrays()).sum())
+
+    # ---- writes -------------------------------------------------------
+
+    def bulk_load(self, lats, lons, layer, timestamps=None, ttl=None, data=None, keys=None):
+        """
+        Add many points of one layer at once (e.g. a FIRMS CSV or archive).
+
+        `keys` work as in insert(): a key already in the index replaces the
+        earlier point; within the batch the last row per key wins (earlier
+        duplicates are not added, so they get no id).
+
+        Returns:
+            int array of point ids.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        n = len(lats)
+        now = self.clock()
+        timestamps = np.full(n, now) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        if keys is not None:
+            last = {key: i for i, key in enumerate(keys)}
+            if len(last) < n:
+                keep = np.array(sorted(last.values()), dtype=np.int64)
+                lats, lons, timestamps = lats[keep], lons[keep], timestamps[keep]
+                keys = [keys[i] for i in keep.tolist()]
+                data = None if data is None else [data[i] for i in keep.tolist()]
+                n = len(keep)
+        expires_at = np.full(n, np.inf) if ttl is None else timestamps + ttl
+        with self._lock:
+            ids = np.arange(self._next_id, self._next_id + n, dtype=np.int64)
+            self._next_id += n
+            if keys is not None:
+                for key, point_id, lat, lon in zip(keys, ids.tolist(), lats.tolist(), lons.tolist()):
+                    old = self._keys.get(key)
+                    if old is not None:
+                        self._kill(*old)
+                    self._keys[key] = (point_id, lat, lon)
+            if data is not None:
+                self._data.update(zip(ids.tolist(), data))
+            batch = {
+                "lat": lats, "lon": lons, "timestamp": timestamps, "expires_at": expires_at,
+                "layer": np.full(n, self._layer_code(layer), dtype=np.int16), "id": ids,
+            }
+            self._merge(batch)
+        return ids
+
+    def insert(self, lat, lon, layer, data=None, key=None, ttl=None, timestamp=None):
+        """
+        Add one point. A `key` already in the index (e.g. a FIRMS hotspot id
+        or an alert id) replaces the earlier point. Returns the point id.
+        """
+        timestamp = self.clock() if timestamp is None else timestamp
+        with self._lock:
+            point_id = self._next_id
+            self._next_id += 1
+            if key is not None:
+                old = self._keys.get(key)
+                if old is not None:
+                    self._kill(*old)
+                self._keys[key] = (point_id, lat, lon)
+            if data is not None:
+                self._data[point_id] = data
+            row = (float(lat), float(lon), timestamp, math.inf if ttl is None else timestamp + ttl,
+                   self._layer_code(layer), point_id)
+            self._pending_pos[point_id] = len(self._pending["id"])
+            for name, value in zip(self.COLUMNS, row):
+                self._pending[name].append(value)
+            self._pending_cache = None
+            if len(self._pending["id"]) >= self.merge_at:
+                self._merge()
+        return point_id
+
+    def remove(self, key):
+        """Drop the point stored under `key`. Returns True if it existed."""
+        with self._lock:
+            old = self._keys.pop(key, None)
+            if old is None:
+                return False
+            self._kill(*old)
+            return True
+
+    def _kill(self, point_id, lat, lon):
+        """Mark a point expired; it is dropped for good on the next merge."""
+        self._data.pop(point_id, None)
+        pos = self._pending_pos.get(point_id)
+        if pos is not None:
+            self._pending["expires_at"][pos] = -math.inf
+            self._pending_cache = None
+            return
+        # Packed points are found through their grid cell, not a full scan
+        cell = int(self._cell_keys(lat, lon))
+        lo = np.searchsorted(self._packed_keys, cell, side="left")
+        hi = np.searchsorted(self._packed_keys, cell, side="right")
+        hit = lo + np.flatnonzero(self._packed["id"][lo:hi] == point_id)
+        self._packed["expires_at"][hit] = -np.inf
+
+    def expire(self, now=None):
+        """Drop expired points now instead of waiting for the next merge."""
+        with self._lock:
+            self._merge(now=now)
+
+    def _pending_arrays(self):
+        if self._pending_cache is not None:
+            return self._pending_cache
+        p = self._pending
+        self._pending_cache = {
+            "lat": np.asarray(p["lat"], dtype=np.float64), "lon": np.asarray(p["lon"], dtype=np.float64),
+            "timestamp": np.asarray(p["timestamp"], dtype=np.float64),
+            "expires_at": np.asarray(p["expires_at"], dtype=np.float64),
+            "layer": np.asarray(p["layer"], dtype=np.int16), "id": np.asarray(p["id"], dtype=np.int64),
+        }
+        return self._pending_cache
+
+    def _merge(self, batch=None, now=None):
+        """Fold pending (and an optional bulk batch) into the packed segment."""
+        parts = [self._packed, self._pending_arrays()]
+        if batch is not None:
+            parts.append(batch)
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in self.COLUMNS}
+        alive = merged["expires_at"] > (self.clock() if now is None else now)
+        if not alive.all():
+            dead = set(merged["id"][~alive].tolist())
+            for point_id in dead:
+                self._data.pop(point_id, None)
+            self._keys = {key: entry for key, entry in self._keys.items() if entry[0] not in dead}
+            merged = {name: column[alive] for name, column in merged.items()}
+        keys = self._cell_keys(merged["lat"], merged["lon"])
+        order = np.argsort(keys, kind="stable")
+        self._packed = {name: column[order] for name, column in merged.items()}
+        self._packed_keys = keys[order]
+        self._reset_pending()
+
+    # ---- queries ------------------------------------------------------
+
+    def _alive(self, segment, now=None):
+        return segment["expires_at"] > (self.clock() if now is None else now)
+
+    def _candidates(self, west, south, east, north):
+        """Packed-segment row indices in the grid cells covering the bbox."""
+        r0, r1 = ((np.array([south, north]) + 90.0) // self.cell_deg).astype(np.int64).clip(0, self.n_rows - 1)
+        c0, c1 = ((np.array([west, east]) + 180.0) // self.cell_deg).astype(np.int64).clip(0, self.n_cols - 1)
+        rows = np.arange(r0, r1 + 1, dtype=np.int64) * self.n_cols
+        lo = np.searchsorted(self._packed_keys, rows + c0, side="left")
+        hi = np.searchsorted(self._packed_keys, rows + c1, side="right")
+        spans = hi - lo
+        total = int(spans.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        # Concatenate the ranges [lo_i, hi_i) without a Python loop
+        starts = np.repeat(lo - np.concatenate(([0], np.cumsum(spans)[:-1])), spans)
+        return starts + np.arange(total)
+
+    def _select(self, west, south, east, north, layers, now):
+        """(segment, index array) pairs for live points inside the bbox."""
+        codes = None
+        if layers is not None:
+            codes = [self._layer_codes[l] for l in layers if l in self._layer_codes]
+        selected = []
+        for segment, idx in ((self._packed, self._candidates(west, south, east, north)),
+                             (self._pending_arrays(), None)):
+            lat = segment["lat"] if idx is None else segment["lat"][idx]
+            lon = segment["lon"] if idx is None else segment["lon"][idx]
+            keep = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+            rows = np.flatnonzero(keep) if idx is None else idx[keep]
+            rows = rows[segment["expires_at"][rows] > now]
+            if codes is not None:
+                rows = rows[np.isin(segment["layer"][rows], codes)]
+            if len(rows):
+                selected.append((segment, rows))
+        return selected
+
+    def _gather(self, selected):
+        if not selected:
+            return {name: np.empty(0) for name in self.COLUMNS}
+        return {name: np.concatenate([segment[name][rows] for segment, rows in selected])
+                for name in self.COLUMNS}
+
+    def _results(self, points, distances=None, order=None, limit=None):
+        if order is None:
+            order = np.arange(len(points["id"]))
+        if limit is not None:
+            order = order[:limit]
+        out = []
+        for i in order.tolist():
+            point_id = int(points["id"][i])
+            row = {
+                "id": point_id,
+                "layer": self.layers[int(points["layer"][i])],
+                "lat": float(points["lat"][i]),
+                "lon": float(points["lon"][i]),
+                "timestamp": float(points["timestamp"][i]),
+                "data": self._data.get(point_id),
+            }
+            if distances is not None:
+                row["distance_km"] = round(float(distances[i]), 3)
+            out.append(row)
+        return out
+
+    def bbox(self, west, south, east, north, layers=None, limit=None, now=None):
+        """Live points with west <= lon <= east and south <= lat <= north."""
+        with self._lock:
+            now = self.clock() if now is None else now
+            points = self._gather(self._select(west, south, east, north, layers, now))
+            return self._results(points, limit=limit)
+
+    @staticmethod
+    def _lon_ranges(west, east):
+        """Split a longitude span that crosses the antimeridian into in-range pieces."""
+        if east - west >= 360.0:
+            return [(-180.0, 180.0)]
+        if west < -180.0:
+            return [(west + 360.0, 180.0), (-180.0, east)]
+        if east > 180.0:
+            return [(west, 180.0), (-180.0, east - 360.0)]
+        return [(west, east)]
+
+    def _within(self, lat, lon, radius_km, layers, now):
+        dlat = radius_km / KM_PER_DEG_LAT
+        coslat = math.cos(math.radians(min(89.9, abs(lat) + dlat)))
+        dlon = min(180.0, radius_km / (KM_PER_DEG_LAT * max(coslat, 1e-6)))
+        selected = []
+        for west, east in self._lon_ranges(lon - dlon, lon + dlon):
+            selected.extend(self._select(west, lat - dlat, east, lat + dlat, layers, now))
+        points = self._gather(selected)
+        distances = haversine_km(lat, lon, points["lat"], points["lon"])
+        inside = distances <= radius_km
+        points = {name: column[inside] for name, column in points.items()}
+        return points, distances[inside]
+
+    def radius(self, lat, lon, radius_km, layers=None, limit=None, now=None):
+        """Live points within `radius_km` of (lat, lon), nearest first."""
+        with self._lock:
+            now = self.clock() if now is None else now
+            points, distances = self._within(lat, lon, radius_km, layers, now)
+            return self._results(points, distances, np.argsort(distances, kind="stable"), limit)
+
+    def nearest(self, lat, lon, k=1, layers=None, max_km=None, now=None):
+        """The k nearest live points, growing a radius search until k are found."""
+        with self._lock:
+            now = self.clock() if now is None else now
+            radius_km = self.cell_deg * KM_PER_DEG_LAT
+            limit_km = max_km if max_km is not None else math.pi * EARTH_RADIUS_KM
+            while True:
+                radius_km = min(radius_km, limit_km)
+                points, distances = self._within(lat, lon, radius_km, layers, now)
+                if len(distances) >= k or radius_km >= limit_km:
+                    break
+                radius_km *= 4
+            order = np.argsort(distances, kind="stable")
+            return self._results(points, distances, order, k)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "packed": len(self._packed_keys),
+                "pending": len(self._pending["id"]),
+                "keys": len(self._keys),
+                "layers": list(self.layers),
+                "cell_deg": self.cell_deg,
+            }
+
+
+spatial_index = SpatialIndex()
@@ -0,0 +1,300 @@
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from spread_grid import (GridSpreadSimulator, ISOCHRONE_HOURS, SimulationCancelled, TerrainRasters,
+                         mask_to_multipolygon)
+
+FRONT_LEVELS = (0.1, 0.5, 0.9)
+
+
+class ForecastCancelled(Exception):
+    """The ensemble run was cancelled (e.g. superseded by a newer forecast)."""
+
+
+def _run_members(spec):
+    """
+    Worker entry point: simulate one slice of ensemble members.
+
+    Only block names, shapes and scenario dicts are pickled; the terrain
+    window and the arrival grids live in shared memory.
+    """
+    try:
+        blocks = [SharedMemory(name=spec[key]) for key in ("terrain_block", "arrival_block", "control_block")]
+    except FileNotFoundError:
+        return 0  # run already cancelled and released
+    try:
+        return _simulate_members(spec, *blocks)
+    finally:
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # a view outlived the call; the mapping goes with it
+
+
+def _simulate_members(spec, terrain_block, arrival_block, control_block):
+    control = np.ndarray((1,), dtype=np.uint8, buffer=control_block.buf)
+    if control[0]:
+        return 0
+    names = spec["layers"]
+    n, h, w = spec["arrival_shape"]
+    layers = np.ndarray((len(names), h, w), dtype=np.float32, buffer=terrain_block.buf)
+    terrain = TerrainRasters(spec["bbox"], spec["cell_deg"], **dict(zip(names, layers)))
+    try:
+        result = GridSpreadSimulator(terrain, cycles=spec["cycles"]).simulate(
+            spec["ignitions"], spec["scenarios"], spec["horizon_hours"], cancelled=lambda: bool(control[0]))
+    except SimulationCancelled:
+        return 0
+    first, last = spec["members"]
+    _, rh, rw = result.arrival.shape
+    arrival = np.ndarray((n, h, w), dtype=np.float32, buffer=arrival_block.buf)
+    arrival[first:last, result.row0:result.row0 + rh, result.col0:result.col0 + rw] = result.arrival
+    return last - first
+
+
+class EnsembleResult:
+    """Burn probability grids (one per forecast hour) over the ensemble window."""
+
+    def __init__(self, terrain, probability, hours, row0, col0, scenarios, dx_km, dy_km):
+        self.terrain = terrain
+        self.probability = probability
+        self.hours = tuple(hours)
+        self.row0 = row0
+        self.col0 = col0
+        self.scenarios = scenarios
+        self.dx_km = dx_km
+        self.dy_km = dy_km
+
+    def probability_at(self, lat, lon):
+        """Probability of burning by each forecast hour at a point."""
+        row, col = self.terrain.cell_index(lat, lon)
+        row, col = row - self.row0, col - self.col0
+        if not (0 <= row < self.probability.shape[1] and 0 <= col < self.probability.shape[2]):
+            return np.zeros(len(self.hours))
+        return self.probability[:, row, col].astype(np.float64)
+
+    def fronts(self, levels=FRONT_LEVELS):
+        """
+        Percentile fire fronts as a GeoJSON FeatureCollection.
+
+        The front for level p at hour h encloses the cells that at least a
+        fraction p of the members burn by h: 0.1 is the pessimistic (P90
+        spread) outline, 0.9 the one nearly every member agrees on.
+        """
+        features = []
+        for i, h in enumerate(self.hours):
+            for level in levels:
+                mask = self.probability[i] >= level
+                features.append({
+                    "type": "Feature",
+                    "geometry": mask_to_multipolygon(mask, self.terrain, self.row0, self.col0),
+                    "properties": {
+                        "hours": h,
+                        "probability": level,
+                        "area_km2": round(float(mask.sum()) * self.dx_km * self.dy_km, 3),
+                        "members": len(self.scenarios),
+                    },
+                })
+        return {"type": "FeatureCollection", "features": features}
+
+
+class EnsembleRun:
+    """Handle for an ensemble forecast in flight (future-like)."""
+
+    def __init__(self, ensemble, key, futures, blocks, window, scenarios, hours):
+        self.ensemble = ensemble
+        self.key = key
+        self.futures = futures
+        self.blocks = blocks
+        self.window = window
+        self.scenarios = scenarios
+        self.hours = hours
+        self.cancelled = False
+        self._result = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Stop the run: queued slices are dropped, running ones stop at their next sweep."""
+        with self._lock:
+            if self.cancelled or self._result is not None:
+                return False
+            self.cancelled = True
+            np.ndarray((1,), dtype=np.uint8, buffer=self.blocks["control"].buf)[0] = 1
+            for future in self.futures:
+                future.cancel()
+            self._release()
+        self.ensemble._forget(self)
+        return True
+
+    def done(self):
+        return self.cancelled or all(f.done() for f in self.futures)
+
+    def result(self, timeout=None):
+        """Wait for every member and reduce them to an EnsembleResult."""
+        wait(self.futures, timeout=timeout)
+        with self._lock:
+            if self.cancelled:
+                raise ForecastCancelled(f"Ensemble forecast {self.key!r} was cancelled")
+            if self._result is not None:
+                return self._result
+            pending = [f for f in self.futures if not f.done()]
+            if pending:
+                raise TimeoutError(f"{len(pending)} ensemble slices still running")
+            try:
+                for future in self.futures:
+                    future.result()  # re-raise worker errors
+                self._result = self._reduce()
+            finally:
+                self._release()
+            self.ensemble._forget(self)
+            return self._result
+
+    def _reduce(self):
+        r0, r1, c0, c1, dx, dy = self.window
+        n = len(self.scenarios)
+        arrival = np.ndarray((n, r1 - r0, c1 - c0), dtype=np.float32, buffer=self.blocks["arrival"].buf)
+        probability = np.empty((len(self.hours), r1 - r0, c1 - c0), dtype=np.float32)
+        for i, h in enumerate(self.hours):
+            np.divide(np.count_nonzero(arrival <= h, axis=0), n, out=probability[i], casting="unsafe")
+        del arrival
+        return EnsembleResult(self.ensemble.terrain, probability, self.hours, r0, c0, self.scenarios, dx, dy)
+
+    def _release(self):
+        for block in self.blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = {}
+
+
+class SpreadEnsemble:
+    """
+    Level 4: Ensemble Spread Forecast (The Brain, under uncertain wind)
+
+    Responsibility:
+    - Sample N wind speed/bearing perturbations around a forecast wind and
+      run them through GridSpreadSimulator in parallel on a process pool.
+    - Share the terrain window and the members' arrival grids through
+      shared memory, so only small task specs are pickled.
+    - Reduce the members to burn-probability grids and percentile fronts.
+    - Cancel a run when a newer forecast for the same key supersedes it.
+    """
+
+    def __init__(self, terrain, max_workers=None, cycles=3, speed_sd=0.2, bearing_sd_deg=20.0, seed=None):
+        """
+        Args:
+            terrain: TerrainRasters (memory-mapped or in memory).
+            max_workers: Pool size (default: all cores).
+            speed_sd: Log-normal sigma of the wind speed multiplier.
+            bearing_sd_deg: Standard deviation of the bearing perturbation.
+        """
+        self.terrain = terrain
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cycles = cycles
+        self.speed_sd = speed_sd
+        self.bearing_sd_deg = bearing_sd_deg
+        self.rng = np.random.default_rng(seed)
+        self._executor = None
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            runs = list(self._runs.values())
+        for run in runs:
+            run.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def sample(self, wind_speed_kmh, wind_bearing, members):
+        """Perturbed wind scenarios; member 0 is the unperturbed forecast."""
+        speeds = wind_speed_kmh * self.rng.lognormal(0.0, self.speed_sd, members)
+        bearings = (wind_bearing + self.rng.normal(0.0, self.bearing_sd_deg, members)) % 360.0
+        speeds[0], bearings[0] = wind_speed_kmh, wind_bearing % 360.0
+        return [{"wind_speed_kmh": float(s), "wind_bearing": float(b)} for s, b in zip(speeds, bearings)]
+
+    def forecast(self, ignitions, wind_speed_kmh, wind_bearing, members=32, horizon_hours=max(ISOCHRONE_HOURS),
+                 hours=ISOCHRONE_HOURS, key=None):
+        """
+        Start an ensemble forecast; returns an EnsembleRun immediately.
+
+        Args:
+            ignitions: List of (lat, lon) shared by every member.
+            members: Ensemble size.
+            hours: Forecast hours reduced into burn probability grids.
+            key: Runs with the same key supersede each other (e.g. a fire
+                id); the previous run is cancelled.
+        """
+        scenarios = self.sample(wind_speed_kmh, wind_bearing, members)
+        hours = tuple(h for h in hours if h <= horizon_hours)
+        t = self.terrain
+        r0, r1, c0, c1, dx, dy = GridSpreadSimulator(t)._window([ignitions], scenarios, horizon_hours)
+        h, w = r1 - r0, c1 - c0
+        bbox = (t.west + c0 * t.cell_deg, t.south + r0 * t.cell_deg,
+                t.west + c1 * t.cell_deg, t.south + r1 * t.cell_deg)
+
+        names = [name for name in TerrainRasters.LAYERS
+                 if getattr(t, name) is not None and name not in ("wind_speed", "wind_dir")]
+        blocks = {
+            "terrain": SharedMemory(create=True, size=len(names) * h * w * 4),
+            "arrival": SharedMemory(create=True, size=max(1, members * h * w * 4)),
+            "control": SharedMemory(create=True, size=1),
+        }
+        layers = np.ndarray((len(names), h, w), dtype=np.float32, buffer=blocks["terrain"].buf)
+        for i, name in enumerate(names):
+            layers[i] = getattr(t, name)[r0:r1, c0:c1]
+        np.ndarray((members, h, w), dtype=np.float32, buffer=blocks["arrival"].buf).fill(np.inf)
+        blocks["control"].buf[0] = 0
+        del layers
+
+        with self._lock:
+            previous = self._runs.pop(key, None) if key is not None else None
+        if previous is not None:
+            previous.cancel()
+
+        per_task = int(math.ceil(members / self.max_workers))
+        base = {
+            "terrain_block": blocks["terrain"].name,
+            "arrival_block": blocks["arrival"].name,
+            "control_block": blocks["control"].name,
+            "layers": names,
+            "bbox": bbox,
+            "cell_deg": t.cell_deg,
+            "arrival_shape": (members, h, w),
+            "ignitions": [tuple(p) for p in ignitions],
+            "horizon_hours": horizon_hours,
+            "cycles": self.cycles,
+        }
+        pool = self._pool()
+        futures = []
+        for first in range(0, members, per_task):
+            last = min(members, first + per_task)
+            spec = dict(base, members=(first, last), scenarios=scenarios[first:last])
+            futures.append(pool.submit(_run_members, spec))
+
+        run = EnsembleRun(self, key, futures, blocks, (r0, r1, c0, c1, dx, dy), scenarios, hours)
+        if key is not None:
+            with self._lock:
+                self._runs[key] = run
+        return run
+
+    def _forget(self, run):
+        with self._lock:
+            if self._runs.get(run.key) is run:
+                del self._runs[run.key]
@@ -0,0 +1,398 @@
+import json
+import math
+import os
+
+import numpy as np
+
+KM_PER_DEG = 111.195
+
+# Spread-rate model (km/h), scaled per cell by the fuel raster (1.0 = moderate fuel):
+#   ROS(dir) = fuel * (R0 + WIND_COEF * max(0, wind component along dir)) * exp(SLOPE_COEF * slope along dir)
+# R0 + WIND_COEF * wind matches calculate_spread_cone's "10% of wind speed" head rate.
+R0_KMH = 0.1
+WIND_COEF = 0.1
+SLOPE_COEF = 0.069  # rate roughly doubles per 10 deg of upslope
+
+# Stand-in for "impassable" in cumulative sums (hours); anything this slow never burns
+BARRIER_HOURS = 1e6
+ISOCHRONE_HOURS = (1, 3, 6, 12)
+
+
+class SimulationCancelled(Exception):
+    """Raised by GridSpreadSimulator.simulate when its cancel check fires."""
+
+
+class TerrainRasters:
+    """
+    Fuel/slope/wind rasters for the grid spread simulator.
+
+    Layout (inside `path`, same convention as ThermalBaselineStore):
+    - fuel.f32: spread-rate multiplier per cell (0 = non-burnable).
+    - slope.f32 / aspect.f32: slope in degrees and downslope compass bearing.
+    - wind_speed.f32 / wind_dir.f32: optional wind field (km/h, bearing the
+      wind pushes the fire towards).
+    - meta.json: bbox, cell size, which layers exist and each layer's
+      maximum (so simulations bound their window without a raster scan).
+    Rows run south -> north, columns west -> east.
+    """
+
+    META_FILE = "meta.json"
+    LAYERS = ("fuel", "slope", "aspect", "wind_speed", "wind_dir")
+
+    def __init__(self, bbox, cell_deg, fuel, slope=None, aspect=None, wind_speed=None, wind_dir=None, maxima=None):
+        self.west, self.south, self.east, self.north = [float(v) for v in bbox]
+        self.cell_deg = float(cell_deg)
+        self.fuel = fuel
+        self.slope = slope
+        self.aspect = aspect
+        self.wind_speed = wind_speed
+        self.wind_dir = wind_dir
+        self.shape = tuple(fuel.shape)
+        self.maxima = dict(maxima or {})
+
+    def layer_max(self, name):
+        """Maximum of a layer (None if absent); from meta.json, else scanned once and cached."""
+        if name not in self.maxima:
+            data = getattr(self, name)
+            self.maxima[name] = None if data is None else float(np.max(data))
+        return self.maxima[name]
+
+    @classmethod
+    def create(cls, path, bbox, cell_deg, **layers):
+        """Write layers as memory-mapped float32 files and return them opened."""
+        os.makedirs(path, exist_ok=True)
+        present = []
+        maxima = {}
+        for name in cls.LAYERS:
+            data = layers.get(name)
+            if data is None:
+                continue
+            out = np.memmap(os.path.join(path, name + ".f32"), dtype=np.float32, mode="w+", shape=np.shape(data))
+            out[:] = data
+            out.flush()
+            present.append(name)
+            maxima[name] = float(np.max(out))
+        meta = {"bbox": [float(v) for v in bbox], "cell_deg": float(cell_deg),
+                "shape": list(np.shape(layers["fuel"])), "layers": present, "maxima": maxima}
+        with open(os.path.join(path, cls.META_FILE), "w") as f:
+            json.dump(meta, f)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path):
+        """Attach read-only to rasters created earlier at `path`; nothing is read up front."""
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        shape = tuple(meta["shape"])
+        layers = {name: np.memmap(os.path.join(path, name + ".f32"), dtype=np.float32, mode="r", shape=shape)
+                  for name in meta["layers"]}
+        return cls(meta["bbox"], meta["cell_deg"], maxima=meta.get("maxima"), **layers)
+
+    def cell_index(self, lat, lon):
+        return (int(math.floor((lat - self.south) / self.cell_deg)),
+                int(math.floor((lon - self.west) / self.cell_deg)))
+
+
+class SpreadResult:
+    """Arrival-time grids (hours) for a batch of scenarios over a raster window."""
+
+    def __init__(self, terrain, arrival, row0, col0, scenarios, dx_km, dy_km):
+        self.terrain = terrain
+        self.arrival = arrival
+        self.row0 = row0
+        self.col0 = col0
+        self.scenarios = scenarios
+        self.dx_km = dx_km
+        self.dy_km = dy_km
+
+    def arrival_at(self, lat, lon):
+        """Arrival time (hours, inf if never) at a point, per scenario."""
+        row, col = self.terrain.cell_index(lat, lon)
+        row, col = row - self.row0, col - self.col0
+        if not (0 <= row < self.arrival.shape[1] and 0 <= col < self.arrival.shape[2]):
+            return np.full(len(self.scenarios), np.inf)
+        return self.arrival[:, row, col].astype(np.float64)
+
+    def burned_area_km2(self, hours):
+        return (self.arrival <= hours).sum(axis=(1, 2)) * self.dx_km * self.dy_km
+
+    def isochrones(self, hours=ISOCHRONE_HOURS):
+        """GeoJSON FeatureCollection: one MultiPolygon per scenario and isochrone."""
+        features = []
+        for s, scenario in enumerate(self.scenarios):
+            for h in hours:
+                mask = self.arrival[s] <= h
+                features.append({
+                    "type": "Feature",
+                    "geometry": mask_to_multipolygon(mask, self.terrain, self.row0, self.col0),
+                    "properties": {
+                        "scenario": s,
+                        "hours": h,
+                        "area_km2": round(float(mask.sum()) * self.dx_km * self.dy_km, 3),
+                        "wind_speed_kmh": scenario.get("wind_speed_kmh"),
+                        "wind_bearing": scenario.get("wind_bearing"),
+                    },
+                })
+        return {"type": "FeatureCollection", "features": features}
+
+
+def _ring_area(ring):
+    a = np.asarray(ring, dtype=np.float64)
+    y, x = a[:, 0], a[:, 1]
+    return 0.5 * float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))
+
+
+def _contains(ring, point):
+    """Ray casting; ring and point are (row, col)."""
+    a = np.asarray(ring, dtype=np.float64)
+    y0, x0, y1, x1 = a[:-1, 0], a[:-1, 1], a[1:, 0], a[1:, 1]
+    py, px = point
+    crosses = (y0 > py) != (y1 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(crosses & (px < x_at)) % 2)
+
+
+def mask_to_polygons(mask):
+    """
+    Trace a boolean raster into polygons along cell edges.
+
+    Returns:
+        List of polygons, each [outer_ring, *hole_rings]; rings are closed
+        lists of (row, col) vertices, outer rings counter-clockwise.
+    """
+    if not mask.any():
+        return []
+    p = np.pad(mask, 1)
+    inner = p[1:-1, 1:-1]
+    # One directed edge per exposed cell side, interior on the left
+    sides = (
+        (inner & ~p[:-2, 1:-1], (0, 0), (0, 1)),    # south side, heading east
+        (inner & ~p[1:-1, 2:], (0, 1), (1, 1)),     # east side, heading north
+        (inner & ~p[2:, 1:-1], (1, 1), (1, 0)),     # north side, heading west
+        (inner & ~p[1:-1, :-2], (1, 0), (0, 0)),    # west side, heading south
+    )
+    outgoing = {}
+    for exposed, start, end in sides:
+        rows, cols = np.nonzero(exposed)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            outgoing.setdefault((r + start[0], c + start[1]), []).append((r + end[0], c + end[1]))
+
+    rings = []
+    while outgoing:
+        first = next(iter(outgoing))
+        ring = [first]
+        vertex = first
+        while True:
+            ends = outgoing[vertex]
+            nxt = ends.pop()
+            if not ends:
+                del outgoing[vertex]
+            if nxt == first:
+                break
+            ring.append(nxt)
+            vertex = nxt
+        # Drop vertices in the middle of straight runs
+        n = len(ring)
+        ring = [ring[i] for i in range(n)
+                if (ring[i][0] - ring[i - 1][0], ring[i][1] - ring[i - 1][1]) !=
+                   (ring[(i + 1) % n][0] - ring[i][0], ring[(i + 1) % n][1] - ring[i][1])]
+        ring.append(ring[0])
+        rings.append(ring)
+
+    outers = sorted((r for r in rings if _ring_area(r) > 0), key=_ring_area)
+    polygons = {id(o): [o] for o in outers}
+    for hole in (r for r in rings if _ring_area(r) <= 0):
+        probe = (hole[0][0] + 1e-3, hole[0][1] + 1e-3)
+        for outer in outers:
+            if _contains(outer, probe):
+                polygons[id(outer)].append(hole)
+                break
+    return [polygons[id(o)] for o in reversed(outers)]
+
+
+def mask_to_multipolygon(mask, terrain, row0=0, col0=0):
+    """GeoJSON MultiPolygon (lon/lat) of a mask over a terrain window at (row0, col0)."""
+    t = terrain
+    polygons = []
+    for rings in mask_to_polygons(mask):
+        polygons.append([
+            [[round(t.west + (col0 + c) * t.cell_deg, 6), round(t.south + (row0 + r) * t.cell_deg, 6)]
+             for r, c in ring]
+            for ring in rings
+        ])
+    return {"type": "MultiPolygon", "coordinates": polygons}
+
+
+class GridSpreadSimulator:
+    """
+    Level 4: Raster Fire Spread (The Brain, beyond the 1-hour cone)
+
+    Responsibility:
+    - Minimum-travel-time arrival grids over fuel/slope/wind rasters, via
+      vectorized fast sweeping: row-by-row relaxation from the previous row
+      (straight and diagonal moves), and exact along-row propagation with a
+      cumulative-sum/minimum.accumulate pass in each direction.
+    - Batch scenarios (ignition sets x wind) along a leading axis, so every
+      row operation covers all scenarios at once.
+    - Only the window reachable within the horizon is read from the
+      memory-mapped rasters.
+    """
+
+    def __init__(self, terrain, cycles=3):
+        self.terrain = terrain
+        self.cycles = cycles
+
+    def _window(self, ignitions, scenarios, horizon_hours):
+        t = self.terrain
+        n_rows, n_cols = t.shape
+        cells = [t.cell_index(lat, lon) for ign in ignitions for lat, lon in ign]
+        cells = [(r, c) for r, c in cells if 0 <= r < n_rows and 0 <= c < n_cols]
+        if not cells:
+            raise ValueError("No ignition falls inside the terrain rasters")
+
+        # Fastest conceivable spread bounds how far the fire can get
+        max_wind = max(s.get("wind_speed_kmh") or 0.0 for s in scenarios)
+        if t.wind_speed is not None and any(s.get("wind_speed_kmh") is None for s in scenarios):
+            max_wind = max(max_wind, t.layer_max("wind_speed"))
+        max_slope = t.layer_max("slope") or 0.0
+        max_ros = t.layer_max("fuel") * (R0_KMH + WIND_COEF * max_wind) * math.exp(SLOPE_COEF * max_slope)
+        lat_mid = t.south + (sum(r for r, _ in cells) / len(cells) + 0.5) * t.cell_deg
+        dy = t.cell_deg * KM_PER_DEG
+        dx = dy * math.cos(math.radians(lat_mid))
+        reach_r = int(math.ceil(horizon_hours * max_ros / dy)) + 1
+        reach_c = int(math.ceil(horizon_hours * max_ros / dx)) + 1
+
+        rows = [r for r, _ in cells]
+        cols = [c for _, c in cells]
+        r0, r1 = max(0, min(rows) - reach_r), min(n_rows, max(rows) + reach_r + 1)
+        c0, c1 = max(0, min(cols) - reach_c), min(n_cols, max(cols) + reach_c + 1)
+        return r0, r1, c0, c1, dx, dy
+
+    def simulate(self, ignitions, scenarios=None, horizon_hours=max(ISOCHRONE_HOURS), cancelled=None):
+        """
+        Args:
+            ignitions: List of (lat, lon) shared by every scenario, or one
+                such list per scenario (len(scenarios) lists).
+            scenarios: List of dicts with wind_speed_kmh / wind_bearing
+                (omit both to use the wind rasters). Default: raster wind.
+            horizon_hours: Cells beyond this stay unsimulated (inf).
+            cancelled: Optional callable polled before every sweep; when it
+                returns True the run stops with SimulationCancelled.
+
+        Returns:
+            SpreadResult with arrival hours per scenario.
+        """
+        scenarios = list(scenarios) if scenarios else [{}]
+        if ignitions and isinstance(ignitions[0][0], (int, float)):
+            ignitions = [ignitions] * len(scenarios)
+        if len(ignitions) != len(scenarios):
+            raise ValueError("Need one ignition list per scenario")
+
+        t = self.terrain
+        r0, r1, c0, c1, dx, dy = self._window(ignitions, scenarios, horizon_hours)
+        h, w = r1 - r0, c1 - c0
+        n = len(scenarios)
+
+        # Only the window is read from the memory-mapped rasters
+        def layer(raster, default=0.0):
+            if raster is None:
+                return np.full((h, w), default, dtype=np.float32)
+            return np.asarray(raster[r0:r1, c0:c1], dtype=np.float32)
+
+        fuel = layer(t.fuel)
+        slope = layer(t.slope)
+        upslope = np.radians(layer(t.aspect) + 180.0)
+        # Slope exponent split into north/east components: k*slope*cos(dir - upslope)
+        slope_n = (SLOPE_COEF * slope * np.cos(upslope)).astype(np.float32)
+        slope_e = (SLOPE_COEF * slope * np.sin(upslope)).astype(np.float32)
+
+        wind_n = np.zeros((n, 1, 1), dtype=np.float32)
+        wind_e = np.zeros((n, 1, 1), dtype=np.float32)
+        raster_wind = None
+        for s, scenario in enumerate(scenarios):
+            if scenario.get("wind_speed_kmh") is None:
+                if t.wind_speed is None:
+                    continue
+                if raster_wind is None:
+                    speed = layer(t.wind_speed)
+                    bearing = np.radians(layer(t.wind_dir))
+                    raster_wind = (speed * np.cos(bearing), speed * np.sin(bearing))
+                    wind_n = np.broadcast_to(wind_n, (n, h, w)).copy()
+                    wind_e = np.broadcast_to(wind_e, (n, h, w)).copy()
+                wind_n[s], wind_e[s] = raster_wind
+            else:
+                bearing = math.radians(scenario.get("wind_bearing", 0.0))
+                wind_n[s] = scenario["wind_speed_kmh"] * math.cos(bearing)
+                wind_e[s] = scenario["wind_speed_kmh"] * math.sin(bearing)
+
+        def wind_row(grid, r):
+            return grid[:, 0 if grid.shape[1] == 1 else r, :]
+
+        diag = math.hypot(dx, dy)
+        # (d_row, d_col) -> (distance, north and east unit components)
+        moves = {}
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr or dc:
+                    dist = math.hypot(dr * dy, dc * dx)
+                    moves[(dr, dc)] = (dist, dr * dy / dist, dc * dx / dist)
+
+        def cost(r, move):
+            """Hours to burn into each cell of row r when arriving via `move`."""
+            dist, un, ue = moves[move]
+            along = wind_row(wind_n, r) * un + wind_row(wind_e, r) * ue
+            ros = fuel[r] * (R0_KMH + WIND_COEF * np.maximum(along, 0.0))
+            ros = ros * np.exp(np.clip(slope_n[r] * un + slope_e[r] * ue, -5.0, 5.0))
+            with np.errstate(divide="ignore"):
+                return np.where(ros > 0, dist / ros, np.inf)
+
+        def along_row(row, r):
+            """Exact eastward then westward propagation inside one row."""
+            for dc in (1, -1):
+                c = cost(r, (0, dc)).astype(np.float64)
+                if dc < 0:
+                    row, c = row[:, ::-1], c[:, ::-1]
+                c = np.minimum(c, BARRIER_HOURS)
+                c[:, 0] = 0.0
+                cum = np.cumsum(c, axis=1)
+                row = np.minimum(row, cum + np.minimum.accumulate(row - cum, axis=1))
+                if dc < 0:
+                    row = row[:, ::-1]
+            return row
+
+        arrival = np.full((n, h, w), np.inf, dtype=np.float32)
+        for s, ign in enumerate(ignitions):
+            for lat, lon in ign:
+                r, c = t.cell_index(lat, lon)
+                if r0 <= r < r1 and c0 <= c < c1:
+                    arrival[s, r - r0, c - c0] = 0.0
+
+        for _ in range(self.cycles):
+            changed = False
+            for dr, order in ((1, range(h)), (-1, range(h - 1, -1, -1))):
+                if cancelled is not None and cancelled():
+                    raise SimulationCancelled()
+                prev = None
+                for r in order:
+                    row = arrival[:, r, :].astype(np.float64)
+                    if (prev is None or not np.isfinite(prev).any()) and not np.isfinite(row).any():
+                        prev = row  # nothing burning here yet: skip the row
+                        continue
+                    before = row.copy()
+                    if prev is not None:
+                        row = np.minimum(row, prev + cost(r, (dr, 0)))
+                        # From the previous row's cell to the west (moving east) / east (moving west)
+                        row[:, 1:] = np.minimum(row[:, 1:], prev[:, :-1] + cost(r, (dr, 1))[:, 1:])
+                        row[:, :-1] = np.minimum(row[:, :-1], prev[:, 1:] + cost(r, (dr, -1))[:, :-1])
+                    row = along_row(row, r)
+                    if (row < before - 1e-9).any():
+                        changed = True
+                        arrival[:, r, :] = row
+                    prev = row
+            if not changed:
+                break
+
+        arrival[arrival >= BARRIER_HOURS / 2] = np.inf
+        arrival[arrival > horizon_hours] = np.inf
+        return SpreadResult(t, arrival, r0, c0, scenarios, dx, dy)
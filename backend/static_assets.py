@@ -0,0 +1,191 @@
+import glob
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Everything the dashboard may load from the repo; any other path is a 404
+ASSET_ALLOWLIST = (
+    "index.html",
+    "style.css",
+    "map icon.png",
+    "scripts/*.js",
+    "frontend/alert_system.html",
+)
+
+# Pages are requested by their plain URL, so they are revalidated instead of fingerprinted
+ENTRY_PAGES = ("index.html", "frontend/alert_system.html")
+
+TEXT_TYPES = {"text/html", "text/css", "text/javascript", "application/javascript"}
+FINGERPRINTED_MAX_AGE = 365 * 86400
+COMPRESS_MIN_BYTES = 256
+
+
+class Asset:
+    """One allowlisted file with its precompressed bodies."""
+
+    def __init__(self, path, data, mimetype, url, mtime):
+        self.path = path
+        self.data = data
+        self.mimetype = mimetype
+        self.url = url
+        self.mtime = mtime
+        self.etag = hashlib.sha256(data).hexdigest()[:20]
+        self.bodies = {"identity": data}
+        if len(data) >= COMPRESS_MIN_BYTES and mimetype in TEXT_TYPES:
+            packed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(packed) < len(data):
+                self.bodies["gzip"] = packed
+            if brotli is not None:
+                packed = brotli.compress(data, quality=11)
+                if len(packed) < len(data):
+                    self.bodies["br"] = packed
+
+
+class StaticAssets:
+    """
+    Static asset pipeline for the dashboard.
+
+    Responsibility:
+    - Serve only files matching the allowlist (never .env, .cache.sqlite
+      or source files).
+    - Load them once at startup, rewrite references between them to
+      fingerprinted URLs (<name>.<hash>.<ext>) and precompress text assets
+      with gzip (and brotli when installed).
+    - Fingerprinted URLs are cached as immutable for a year; plain URLs
+      (entry pages, old links) must revalidate. Both answer If-None-Match
+      with 304.
+    """
+
+    def __init__(self, root, allowlist=ASSET_ALLOWLIST, entry_pages=ENTRY_PAGES):
+        self.root = os.path.abspath(root)
+        self.allowlist = allowlist
+        self.entry_pages = set(entry_pages)
+        self.build()
+
+    def _allowed_paths(self):
+        paths = set()
+        for pattern in self.allowlist:
+            for match in glob.glob(os.path.join(self.root, pattern)):
+                if os.path.isfile(match):
+                    paths.add(os.path.relpath(match, self.root).replace(os.sep, "/"))
+        return sorted(paths)
+
+    def build(self):
+        """(Re)load, rewrite, fingerprint and compress every allowlisted file."""
+        paths = self._allowed_paths()
+        raw = {}
+        for path in paths:
+            full = os.path.join(self.root, path)
+            with open(full, "rb") as f:
+                raw[path] = (f.read(), os.path.getmtime(full))
+        assets = {}
+
+        def load(path, stack=()):
+            if path in assets:
+                return assets[path]
+            data, mtime = raw[path]
+            mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if mimetype in TEXT_TYPES:
+                data = self._rewrite(path, data, lambda dep: load(dep, stack + (path,)).url,
+                                     [p for p in paths if p != path and p not in stack])
+            stem, ext = os.path.splitext(path)
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            url = "/" + quote(path if path in self.entry_pages else f"{stem}.{digest}{ext}")
+            assets[path] = Asset(path, data, mimetype, url, mtime)
+            return assets[path]
+
+        for path in paths:
+            load(path)
+        self.assets = assets
+        self.routes = {}
+        for asset in assets.values():
+            self.routes[asset.path] = (asset, False)
+            self.routes[asset.url.lstrip("/").replace("%20", " ")] = (asset, asset.path not in self.entry_pages)
+        return self
+
+    @staticmethod
+    def _rewrite(path, data, url_of, candidates):
+        """
+        Point quoted references to other assets at their fingerprinted URLs.
+        Paths are matched relative to the file and to the site root (scripts
+        inserted by bootstrap.js resolve against the page, not the script).
+        """
+        text = data.decode("utf-8")
+        base = os.path.dirname(path)
+        for dep in candidates:
+            rel = os.path.relpath(dep, base).replace(os.sep, "/") if base else dep
+            forms = {dep, "./" + dep, "/" + dep, rel, "./" + rel}
+            pattern = re.compile(r"""(["'(])(%s)(["')])""" % "|".join(re.escape(f) for f in sorted(forms, key=len, reverse=True)))
+            if pattern.search(text):
+                url = url_of(dep)
+                text = pattern.sub(lambda m: m.group(1) + url + m.group(3), text)
+        return text.encode("utf-8")
+
+    def refresh(self):
+        """Rebuild if an allowlisted file changed on disk (debug servers)."""
+        current = self._allowed_paths()
+        if current != sorted(self.assets) or any(
+                os.path.getmtime(os.path.join(self.root, p)) != self.assets[p].mtime for p in current):
+            self.build()
+
+    def url(self, path):
+        return self.assets[path].url
+
+    @staticmethod
+    def _encoding(accept_encoding):
+        offered = {}
+        for part in (accept_encoding or "").split(","):
+            name, _, params = part.strip().partition(";")
+            q = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    q = float(params.strip()[2:])
+                except ValueError:
+                    q = 0.0
+            offered[name.strip().lower()] = q
+        for name in ("br", "gzip"):
+            if offered.get(name, 0.0) > 0:
+                yield name
+        yield "identity"
+
+    def response(self, path, request):
+        """Response for a request path (no leading slash), or None if it is not an asset."""
+        route = self.routes.get(path)
+        if route is None:
+            return None
+        asset, immutable = route
+        encoding = next(e for e in self._encoding(request.headers.get("Accept-Encoding")) if e in asset.bodies)
+        etag = asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}"
+
+        if etag in request.if_none_match or asset.etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(asset.bodies[encoding], mimetype=asset.mimetype)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        if len(asset.bodies) > 1:
+            response.vary.add("Accept-Encoding")
+        if immutable:
+            response.cache_control.public = True
+            response.cache_control.max_age = FINGERPRINTED_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response
+
+    def stats(self):
+        return {
+            asset.path: {"url": asset.url, **{enc: len(body) for enc, body in asset.bodies.items()}}
+            for asset in self.assets.values()
+        }
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import deque
+
+
+def open_capture(source):
+    """Default capture factory: device index ("0"), file path or RTSP URL."""
+    import cv2
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    return cv2.VideoCapture(source)
+
+
+class StreamStats:
+    """Per-stream counters: capture/inference FPS, drops, end-to-end latency."""
+
+    def __init__(self, window=256):
+        self.captured = 0
+        self.inferred = 0
+        self.dropped = 0
+        self.gated = 0
+        self._latency = deque(maxlen=window)
+        self._inferred_at = deque(maxlen=window)
+
+    def record(self, latency_s, now):
+        self.inferred += 1
+        self._latency.append(latency_s)
+        self._inferred_at.append(now)
+
+    def fps(self):
+        if len(self._inferred_at) < 2:
+            return 0.0
+        span = self._inferred_at[-1] - self._inferred_at[0]
+        return (len(self._inferred_at) - 1) / span if span > 0 else 0.0
+
+    def latency_ms(self, pct):
+        if not self._latency:
+            return None
+        ordered = sorted(self._latency)
+        return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))] * 1000
+
+    def report(self):
+        return {
+            "captured": self.captured,
+            "inferred": self.inferred,
+            "dropped": self.dropped,
+            "gated": self.gated,
+            "fps": round(self.fps(), 2),
+            "latency_p50_ms": self.latency_ms(50),
+            "latency_p95_ms": self.latency_ms(95),
+        }
+
+
+class StreamReader(threading.Thread):
+    """
+    Capture thread for one camera/file/RTSP stream.
+
+    Frames land in a small bounded buffer; when inference falls behind the
+    oldest frame is dropped so the batcher always sees fresh frames.
+    """
+
+    def __init__(self, stream_id, source, wakeup, buffer_size=2, capture_factory=open_capture):
+        super().__init__(name=f"capture-{stream_id}", daemon=True)
+        self.stream_id = stream_id
+        self.source = source
+        self.wakeup = wakeup
+        self.capture_factory = capture_factory
+        self.buffer = deque(maxlen=buffer_size)
+        self.stats = StreamStats()
+        self.finished = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        cap = self.capture_factory(self.source)
+        try:
+            if not cap.isOpened():
+                print(f"[Stream {self.stream_id}] Could not open source: {self.source}")
+                return
+            while not self._stop_event.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                with self.wakeup:
+                    if len(self.buffer) == self.buffer.maxlen:
+                        self.stats.dropped += 1
+                    self.buffer.append((frame, time.perf_counter()))
+                    self.stats.captured += 1
+                    self.wakeup.notify()
+        finally:
+            cap.release()
+            with self.wakeup:
+                self.finished = True
+                self.wakeup.notify()
+
+    def take_latest(self):
+        """Pop the newest frame; older buffered frames count as dropped. Caller holds wakeup."""
+        if not self.buffer:
+            return None
+        item = self.buffer.pop()
+        self.stats.dropped += len(self.buffer)
+        self.buffer.clear()
+        return item
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class MultiStreamEngine:
+    """
+    Multi-camera inference engine for the Cognitive Monitor.
+
+    - One StreamReader thread per source.
+    - Dynamic micro-batching: once any stream has a frame, wait up to
+      `max_wait_ms` for the others, then run the newest frame of every ready
+      stream through each model in a single batched call.
+    - `on_result(stream_id, frame, results_per_model)` is called per frame,
+      on the engine thread, so it can draw/display without locking.
+    - Optional `gate(stream_id, frame) -> bool` skips inference for frames it
+      rejects (e.g. InferenceScheduler motion gating).
+    """
+
+    def __init__(self, models, sources, on_result, max_batch=8, max_wait_ms=10,
+                 infer_kwargs=None, capture_factory=open_capture, buffer_size=2, gate=None):
+        self.models = list(models)
+        self.on_result = on_result
+        self.gate = gate
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.infer_kwargs = infer_kwargs or {}
+        self.wakeup = threading.Condition()
+        self.readers = [
+            StreamReader(i, src, self.wakeup, buffer_size=buffer_size, capture_factory=capture_factory)
+            for i, src in enumerate(sources)
+        ]
+        self.batches = 0
+        self.last_frame_seconds = 0.0
+        self._stop = threading.Event()
+        self._cursor = 0
+
+    def stats(self):
+        return {r.stream_id: dict(r.stats.report(), source=str(r.source)) for r in self.readers}
+
+    def _collect(self):
+        """Block until at least one frame is ready; return up to max_batch (reader, frame, t) items."""
+        with self.wakeup:
+            while not self._stop.is_set():
+                ready = [r for r in self.readers if r.buffer]
+                if ready:
+                    break
+                if all(r.finished for r in self.readers):
+                    return None
+                self.wakeup.wait(0.1)
+            else:
+                return None
+
+            # Give the remaining streams a moment to fill the batch
+            deadline = time.perf_counter() + self.max_wait_s
+            while len(ready) < min(self.max_batch, len(self.readers)):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or all(r.buffer or r.finished for r in self.readers):
+                    break
+                self.wakeup.wait(remaining)
+                ready = [r for r in self.readers if r.buffer]
+
+            # Round-robin start so no stream is starved when > max_batch are ready
+            n = len(self.readers)
+            order = [self.readers[(self._cursor + k) % n] for k in range(n)]
+            self._cursor = (self._cursor + 1) % n
+            batch = []
+            for r in order:
+                if len(batch) == self.max_batch:
+                    break
+                item = r.take_latest()
+                if item is not None:
+                    batch.append((r, item[0], item[1]))
+            return batch
+
+    def step(self):
+        """Run one micro-batch. Returns False once all streams have ended."""
+        batch = self._collect()
+        if batch is None:
+            return False
+        if self.gate is not None:
+            kept = []
+            for item in batch:
+                if self.gate(item[0].stream_id, item[1]):
+                    kept.append(item)
+                else:
+                    item[0].stats.gated += 1
+            batch = kept
+            if not batch:
+                return True
+        frames = [frame for _, frame, _ in batch]
+        start = time.perf_counter()
+        per_model = [model(frames, **self.infer_kwargs) for model in self.models]
+        self.batches += 1
+        # Per-frame share of the batch cost, for CPU-budget feedback
+        self.last_frame_seconds = (time.perf_counter() - start) / len(batch)
+
+        now = time.perf_counter()
+        for i, (reader, frame, captured_at) in enumerate(batch):
+            reader.stats.record(now - captured_at, now)
+            self.on_result(reader.stream_id, frame, [results[i] for results in per_model])
+        return True
+
+    def run(self, report_every=10.0):
+        for r in self.readers:
+            r.start()
+        last_report = time.perf_counter()
+        try:
+            while not self._stop.is_set() and self.step():
+                if report_every and time.perf_counter() - last_report >= report_every:
+                    last_report = time.perf_counter()
+                    for sid, s in self.stats().items():
+                        print(f"[Stream {sid}] {s['fps']:.1f} FPS | p95 latency {s['latency_p95_ms'] or 0:.0f} ms "
+                              f"| dropped {s['dropped']} | {s['source']}")
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        for r in self.readers:
+            r.stop()
+        with self.wakeup:
+            self.wakeup.notify_all()
@@ -0,0 +1,181 @@
+import math
+import sys
+from array import array
+
+from fusion_voting import DECISIONS, SAFE, fusion_engine
+
+MODALITIES = {"vision": 0, "audio": 1, "chem": 2}
+
+
+class _Window:
+    """One location's ring of (bucket, modality) sums/counts plus window totals."""
+
+    __slots__ = ("sums", "counts", "total_sum", "total_count", "head", "watermark", "decision")
+
+    def __init__(self, n_buckets, head, watermark):
+        self.sums = array("d", bytes(8 * 3 * n_buckets))
+        self.counts = array("i", bytes(4 * 3 * n_buckets))
+        self.total_sum = [0.0, 0.0, 0.0]
+        self.total_count = [0, 0, 0]
+        self.head = head            # newest bucket number in the window
+        self.watermark = watermark  # newest event time seen
+        self.decision = SAFE
+
+    def means(self):
+        s, n = self.total_sum, self.total_count
+        return (s[0] / n[0] if n[0] else 0.0,
+                s[1] / n[1] if n[1] else 0.0,
+                s[2] / n[2] if n[2] else 0.0)
+
+    def nbytes(self):
+        return (sys.getsizeof(self) + sys.getsizeof(self.sums) + sys.getsizeof(self.counts)
+                + sys.getsizeof(self.total_sum) + sys.getsizeof(self.total_count))
+
+
+class TemporalFusion:
+    """
+    Level 3D: Temporal Fusion (The Senses, over time)
+
+    Responsibility:
+    - Keep a sliding window of timestamped vision/audio/chem evidence per
+      location, as a fixed-size ring of time buckets (per-modality sum and
+      count in flat arrays) plus running window totals.
+    - Update the windowed scores incrementally per event: an arrival adds to
+      one bucket, and buckets leaving the window are subtracted from the
+      totals. The window is never rescanned.
+    - Accept late/out-of-order events up to `max_lateness` seconds behind the
+      newest event seen for that location; older ones are dropped (counted).
+    - Score windowed mean confidences with FusionVoting's weights and rules
+      and emit a decision only when a location's decision changes.
+    """
+
+    def __init__(self, window_seconds=30.0, bucket_seconds=1.0, max_lateness=5.0, engine=fusion_engine):
+        if max_lateness > window_seconds:
+            raise ValueError("max_lateness must not exceed window_seconds")
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_lateness = max_lateness
+        self.n_buckets = int(math.ceil(window_seconds / bucket_seconds))
+        self.engine = engine
+        self.listeners = []
+        self.windows = {}
+
+        self.events = 0
+        self.late_dropped = 0
+        self.transitions = 0
+
+    def _expire(self, w, bucket):
+        """Slide the window head forward to `bucket`, retiring old buckets."""
+        head = w.head
+        if bucket <= head:
+            return
+        n_buckets = self.n_buckets
+        sums, counts, total_sum, total_count = w.sums, w.counts, w.total_sum, w.total_count
+        for b in range(max(head + 1, bucket - n_buckets + 1), bucket + 1):
+            base = (b % n_buckets) * 3
+            for m in range(3):
+                if counts[base + m]:
+                    total_sum[m] -= sums[base + m]
+                    total_count[m] -= counts[base + m]
+                    sums[base + m] = 0.0
+                    counts[base + m] = 0
+                    if not total_count[m]:
+                        total_sum[m] = 0.0  # no float drift once a modality is empty
+        w.head = bucket
+
+    def ingest(self, location, modality, timestamp, confidence):
+        """
+        Add one evidence event.
+
+        Args:
+            location: Any hashable key (e.g. a grid cell or node id).
+            modality: "vision", "audio" or "chem".
+            timestamp: Event time in seconds (epoch or monotonic).
+            confidence: Modality confidence in [0, 1].
+
+        Returns:
+            A transition dict when the location's decision changed, else None.
+        """
+        m = MODALITIES[modality]
+        self.events += 1
+        bucket = int(timestamp // self.bucket_seconds)
+        w = self.windows.get(location)
+        if w is None:
+            w = self.windows[location] = _Window(self.n_buckets, bucket, timestamp)
+        elif bucket <= w.head - self.n_buckets or timestamp < w.watermark - self.max_lateness:
+            # Older than the window (advance() may have moved head past the
+            # watermark), or too far behind the newest event
+            self.late_dropped += 1
+            return None
+        elif timestamp > w.watermark:
+            self._expire(w, bucket)
+            w.watermark = timestamp
+
+        i = (bucket % self.n_buckets) * 3 + m
+        w.sums[i] += confidence
+        w.counts[i] += 1
+        w.total_sum[m] += confidence
+        w.total_count[m] += 1
+        return self._evaluate(location, w, timestamp)
+
+    def advance(self, timestamp):
+        """
+        Move every location's window up to `timestamp` (e.g. on a timer) so
+        evidence that aged out can drop a location back to SAFE. Returns the
+        transitions it caused.
+        """
+        bucket = int(timestamp // self.bucket_seconds)
+        transitions = []
+        for location, w in self.windows.items():
+            if w.head < bucket:
+                self._expire(w, bucket)
+                transition = self._evaluate(location, w, timestamp)
+                if transition is not None:
+                    transitions.append(transition)
+        return transitions
+
+    def window_means(self, location):
+        """Windowed mean confidence per modality (0.0 without evidence)."""
+        return self.windows[location].means()
+
+    def _evaluate(self, location, w, timestamp):
+        v, a, c = w.means()
+        final_score, effective_score, code = self.engine.score(v, a, c)
+        previous = w.decision
+        if code == previous:
+            return None
+        w.decision = code
+        self.transitions += 1
+        transition = {
+            "location": location,
+            "decision": DECISIONS[code],
+            "previous": DECISIONS[previous],
+            "final_score": final_score,
+            "effective_score": effective_score,
+            "vision_conf": v,
+            "audio_conf": a,
+            "chem_conf": c,
+            "evidence": dict(zip(MODALITIES, w.total_count)),
+            "timestamp": timestamp,
+        }
+        for listener in self.listeners:
+            listener(transition)
+        return transition
+
+    def decision(self, location):
+        w = self.windows.get(location)
+        return DECISIONS[SAFE if w is None else w.decision]
+
+    def bytes_per_location(self):
+        """Approximate window state per location (excludes the dict entry)."""
+        w = next(iter(self.windows.values()), None) or _Window(self.n_buckets, 0, 0.0)
+        return w.nbytes()
+
+    def stats(self):
+        return {
+            "locations": len(self.windows),
+            "events": self.events,
+            "late_dropped": self.late_dropped,
+            "transitions": self.transitions,
+            "bytes_per_location": self.bytes_per_location(),
+        }
@@ -0,0 +1,249 @@
+import io
+import itertools
+import json
+import os
+import threading
+
+import numpy as np
+
+# VIIRS I-band pixel is ~375 m at nadir -> ~0.003375 deg of latitude
+VIIRS_CELL_DEG = 0.375 / 111.0
+
+
+class ThermalBaselineStore:
+    """
+    Level 1 support: Gridded 30-day thermal baseline (The Eye's memory)
+
+    Responsibility:
+    - Hold a rolling window of brightness observations on a fixed lat/lon grid.
+    - Serve O(1) vectorized baseline lookups for whole hotspot batches.
+    - Persist as memory-mapped NumPy files so the store survives restarts;
+      every ingest is flushed before it returns.
+
+    Layout (inside `path`):
+    - day_sum.f32 / day_count.u16: one (window_days, n_lat, n_lon) slab per day slot.
+    - total_sum.f64 / total_count.u32: running window totals, updated
+      incrementally so a lookup is a single gather, and recomputed from the
+      day slabs whenever a day expires (no subtraction drift).
+    - meta.json: grid definition and which day each slot currently holds.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, path, bbox, cell_deg=VIIRS_CELL_DEG, window_days=30, _meta=None):
+        """
+        Create (or, via open(), attach to) a store.
+
+        Args:
+            path: Directory for the memory-mapped arrays.
+            bbox: (west, south, east, north) in degrees.
+            cell_deg: Grid cell size in degrees.
+            window_days: Rolling window length.
+        """
+        self.path = path
+        self.west, self.south, self.east, self.north = [float(v) for v in bbox]
+        self.cell_deg = float(cell_deg)
+        self.window_days = int(window_days)
+        self.n_lat = int(np.ceil((self.north - self.south) / self.cell_deg))
+        self.n_lon = int(np.ceil((self.east - self.west) / self.cell_deg))
+        self._lock = threading.Lock()
+
+        mode = "r+" if _meta is not None else "w+"
+        if _meta is None:
+            os.makedirs(path, exist_ok=True)
+        grid = (self.n_lat, self.n_lon)
+        slabs = (self.window_days,) + grid
+        self.day_sum = np.memmap(os.path.join(path, "day_sum.f32"), dtype=np.float32, mode=mode, shape=slabs)
+        self.day_count = np.memmap(os.path.join(path, "day_count.u16"), dtype=np.uint16, mode=mode, shape=slabs)
+        self.total_sum = np.memmap(os.path.join(path, "total_sum.f64"), dtype=np.float64, mode=mode, shape=grid)
+        self.total_count = np.memmap(os.path.join(path, "total_count.u32"), dtype=np.uint32, mode=mode, shape=grid)
+
+        if _meta is None:
+            self.slot_days = np.full(self.window_days, -1, dtype=np.int64)
+            self.current_day = None
+            self.flush()
+        else:
+            self.slot_days = np.asarray(_meta["slot_days"], dtype=np.int64)
+            self.current_day = _meta["current_day"]
+        # Keys of FIRMS observations added by ingest_features -> day number
+        self._seen = {}
+
+    @classmethod
+    def open(cls, path):
+        """Attach to an existing store created earlier at `path`."""
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        return cls(path, meta["bbox"], meta["cell_deg"], meta["window_days"], _meta=meta)
+
+    def flush(self):
+        """Write arrays and slot bookkeeping to disk."""
+        with self._lock:
+            for arr in (self.day_sum, self.day_count, self.total_sum, self.total_count):
+                arr.flush()
+            meta = {
+                "bbox": [self.west, self.south, self.east, self.north],
+                "cell_deg": self.cell_deg,
+                "window_days": self.window_days,
+                "slot_days": self.slot_days.tolist(),
+                "current_day": self.current_day,
+            }
+            tmp = os.path.join(self.path, self.META_FILE + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp, os.path.join(self.path, self.META_FILE))
+
+    def cell_index(self, lats, lons):
+        """
+        Map coordinates to (row, col) grid indices.
+
+        Returns:
+            rows, cols, inside: int arrays plus a mask of points within the bbox.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        rows = np.floor((lats - self.south) / self.cell_deg).astype(np.int64)
+        cols = np.floor((lons - self.west) / self.cell_deg).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.n_lat) & (cols >= 0) & (cols < self.n_lon)
+        return np.where(inside, rows, 0), np.where(inside, cols, 0), inside
+
+    def _advance_to(self, day):
+        """Roll the window forward so `day` is the newest slot, expiring old slots."""
+        if self.current_day is not None and day <= self.current_day:
+            return
+        start = day - self.window_days + 1
+        if self.current_day is not None:
+            start = max(start, self.current_day + 1)
+        expired = False
+        for d in range(start, day + 1):
+            slot = d % self.window_days
+            if self.slot_days[slot] >= 0:
+                self.day_sum[slot] = 0
+                self.day_count[slot] = 0
+                expired = True
+            self.slot_days[slot] = d
+        if expired:
+            # Rebuild rather than subtract, so totals never drift from the slabs
+            self.day_sum.sum(axis=0, dtype=np.float64, out=self.total_sum)
+            self.day_count.sum(axis=0, dtype=np.uint32, out=self.total_count)
+        self.current_day = int(day)
+
+    def ingest(self, lats, lons, brightness, days, flush=True):
+        """
+        Add a pass of observations to the rolling window.
+
+        Args:
+            lats, lons, brightness: 1-D arrays of equal length.
+            days: Observation day per row, as datetime64[D] or integer day numbers.
+                Rows older than the window are dropped.
+            flush: Persist before returning (bulk loaders pass False and
+                call flush() once at the end).
+        """
+        added = self._add(lats, lons, brightness, days)
+        if flush:
+            self.flush()
+        return added
+
+    def _add(self, lats, lons, brightness, days):
+        days = np.asarray(days)
+        if np.issubdtype(days.dtype, np.datetime64):
+            days = days.astype("datetime64[D]").astype(np.int64)
+        days = np.broadcast_to(days.astype(np.int64), np.shape(lats))
+        brightness = np.asarray(brightness, dtype=np.float64)
+        rows, cols, inside = self.cell_index(lats, lons)
+        inside &= ~np.isnan(brightness)
+
+        with self._lock:
+            if inside.any():
+                self._advance_to(int(days[inside].max()))
+            oldest = self.current_day - self.window_days + 1 if self.current_day is not None else 0
+            keep = inside & (days >= oldest)
+            if not keep.any():
+                return 0
+
+            # Totals add the stored float32 values, so they equal the sum of the slabs
+            rows, cols, days = rows[keep], cols[keep], days[keep]
+            brightness = brightness[keep].astype(np.float32)
+            flat = rows * self.n_lon + cols
+            for d in np.unique(days):
+                sel = days == d
+                slot = int(d) % self.window_days
+                np.add.at(self.day_sum[slot].reshape(-1), flat[sel], brightness[sel])
+                np.add.at(self.day_count[slot].reshape(-1), flat[sel], 1)
+            np.add.at(self.total_sum.reshape(-1), flat, brightness)
+            np.add.at(self.total_count.reshape(-1), flat, 1)
+            return int(keep.sum())
+
+    def ingest_features(self, features):
+        """
+        Add FIRMS hotspot features (firms_service.csv_to_features output).
+
+        FIRMS areas are refetched every cache TTL and overlap, so an
+        observation this store has already seen (same source, position, date
+        and time) is skipped. Features without a valid acq date are ignored.
+        """
+        lats, lons, bright, days = [], [], [], []
+        with self._lock:
+            oldest = self.current_day - self.window_days + 1 if self.current_day is not None else None
+            for f in features:
+                lon, lat = f["geometry"]["coordinates"]
+                props = f["properties"]
+                key = (props.get("source"), lat, lon, props.get("date"), props.get("time"))
+                if key in self._seen:
+                    continue
+                try:
+                    day = int(np.datetime64(props["date"], "D").astype(np.int64))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._seen[key] = day
+                lats.append(lat)
+                lons.append(lon)
+                bright.append(props.get("brightness", np.nan))
+                days.append(day)
+            if oldest is not None:
+                self._seen = {k: d for k, d in self._seen.items() if d >= oldest}
+        if not lats:
+            return 0
+        return self.ingest(np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64),
+                           np.array(bright, dtype=np.float64), np.array(days, dtype=np.int64))
+
+    def lookup(self, lats, lons):
+        """
+        Window-mean brightness per point; NaN where there is no history.
+        """
+        rows, cols, inside = self.cell_index(lats, lons)
+        count = self.total_count[rows, cols]
+        total = self.total_sum[rows, cols]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            baseline = total / count
+        return np.where(inside & (count > 0), baseline, np.nan)
+
+    def load_firms_archive(self, paths, chunk_rows=200_000):
+        """
+        Build/extend the store from archived FIRMS CSVs.
+
+        Files are streamed `chunk_rows` lines at a time, so an archive larger
+        than RAM can be ingested. Rows are added in file order; pass archives
+        oldest-first so the window does not drop data it will later need.
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        total = 0
+        for path in paths:
+            with open(path) as f:
+                header = f.readline().strip().lower().split(",")
+                lat_idx = header.index("latitude")
+                lon_idx = header.index("longitude")
+                date_idx = header.index("acq_date")
+                bright_idx = next(i for i, h in enumerate(header) if "bright" in h)
+                while True:
+                    lines = list(itertools.islice(f, chunk_rows))
+                    if not lines:
+                        break
+                    data = np.loadtxt(io.StringIO("".join(lines)), delimiter=",",
+                                      usecols=(lat_idx, lon_idx, bright_idx), dtype=np.float64, ndmin=2)
+                    days = np.array([line.split(",")[date_idx] for line in lines if line.strip()],
+                                    dtype="datetime64[D]")
+                    total += self.ingest(data[:, 0], data[:, 1], data[:, 2], days, flush=False)
+        self.flush()
+        print(f"[Level 1] Baseline store loaded {total} observations into {self.n_lat}x{self.n_lon} grid")
+        return total
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class TileCache:
+    """
+    Thread-safe TTL + LRU cache with single-flight loading.
+
+    Concurrent misses on the same key share one loader call, so N viewers
+    panning over the same tile cost one upstream fetch.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=600, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}            # key -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.hits += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,127 @@
+import threading
+import time
+
+from http_session import session as shared_session
+
+# Token lifetime (s) assumed when the endpoint omits a usable expires_in
+DEFAULT_EXPIRES_IN = 300
+
+
+class TokenRequestError(Exception):
+    """Upstream OAuth endpoint refused or failed the token request."""
+
+    def __init__(self, status_code, details):
+        super().__init__(f"Token request failed ({status_code})")
+        self.status_code = status_code
+        self.details = details
+
+
+class OAuthTokenCache:
+    """
+    In-process client-credentials token cache.
+
+    - Honours `expires_in` (DEFAULT_EXPIRES_IN when missing) and refreshes
+      `refresh_margin` seconds early, but never earlier than half-way
+      through a short-lived token's lifetime.
+    - Single-flight: concurrent callers during a refresh wait for the one
+      in-flight request instead of each hitting the OAuth endpoint.
+    - All calls share one keep-alive session.
+    """
+
+    def __init__(self, token_url, client_id, client_secret, session=None,
+                 refresh_margin=60, timeout=20, clock=time.monotonic):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.session = session or shared_session
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.clock = clock
+
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.refresh_seconds_total = 0.0
+        self.last_refresh_seconds = None
+
+    def _fresh(self):
+        return self._token is not None and self.clock() < self._refresh_at
+
+    def _response(self):
+        token = dict(self._token)
+        token["expires_in"] = max(0, int(self._expires_at - self.clock()))
+        return token
+
+    def get_token(self):
+        """
+        Return the cached token payload, refreshing it if needed.
+
+        Raises:
+            TokenRequestError: if the OAuth endpoint rejects the request.
+        """
+        if self._fresh():
+            self.hits += 1
+            return self._response()
+
+        with self._refresh_lock:
+            # Another caller may have refreshed while we waited
+            if self._fresh():
+                self.hits += 1
+                return self._response()
+            self.misses += 1
+            self._refresh()
+            return self._response()
+
+    def _refresh(self):
+        start = time.perf_counter()
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        try:
+            response = self.session.post(self.token_url, data=data, timeout=self.timeout)
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            self.refresh_failures += 1
+            raise TokenRequestError(response.status_code, response.text)
+
+        token = response.json()
+        try:
+            lifetime = float(token.get("expires_in", DEFAULT_EXPIRES_IN))
+        except (TypeError, ValueError):
+            lifetime = DEFAULT_EXPIRES_IN
+        if not lifetime > 0:
+            lifetime = DEFAULT_EXPIRES_IN
+        self._token = token
+        self._expires_at = self.clock() + lifetime
+        self._refresh_at = self._expires_at - min(self.refresh_margin, lifetime / 2)
+        self.refreshes += 1
+        self.refresh_seconds_total += elapsed
+        self.last_refresh_seconds = elapsed
+
+    def invalidate(self):
+        with self._refresh_lock:
+            self._token = None
+            self._expires_at = 0.0
+            self._refresh_at = 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "last_refresh_ms": None if self.last_refresh_seconds is None else round(self.last_refresh_seconds * 1000, 2),
+            "avg_refresh_ms": round(self.refresh_seconds_total / self.refreshes * 1000, 2) if self.refreshes else None,
+            "expires_in": max(0, int(self._expires_at - self.clock())) if self._token else 0,
+        }
@@ -1,84 +1,188 @@
-
 import random
 import datetime
+import threading
+import time
+
+import numpy as np
+
+from spatial_index import SpatialIndex
+
+# A real detection overrides the simulation for this long
+FRESH_SECONDS = 10.0
+DEFAULT_SOURCE = "default"
+DEFAULT_BBOX = (100, 100, 200, 200)
+
+# One ring-buffer slot per detection
+DETECTION_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("confidence", "f4"),     # raw model confidence
+    ("smoothed", "f4"),       # per-source EMA
+    ("bbox", "f4", (4,)),
+    ("persons", "i4"),
+    ("animals", "i4"),
+])
+
+
+class SourceBuffer:
+    """
+    Recent detections of one camera/drone.
+
+    A fixed-size structured array used as a ring buffer, written under the
+    source's own lock. Readers get `latest`, an immutable dict swapped in by
+    reference after each write, so detect_fire never takes a lock.
+    """
+
+    def __init__(self, source, size=64):
+        self.source = source
+        self.records = np.zeros(size, dtype=DETECTION_DTYPE)
+        self.count = 0
+        self.latest = None
+        self.lock = threading.Lock()
+
+    def append(self, timestamp, confidence, bbox, persons, animals, image_path, lat, lon):
+        with self.lock:
+            previous = self.latest
+            fresh = previous is not None and timestamp - previous["ts"] < FRESH_SECONDS
+            current = previous["confidence"] if fresh else 0.0
+            # EMA for stability: new value 30%, old 70%; jump up at once (react fast to fire), decay slowly
+            smoothed = confidence if confidence > current else 0.7 * current + 0.3 * confidence
+
+            slot = self.count % len(self.records)
+            self.records[slot] = (timestamp, confidence, smoothed, bbox, persons, animals)
+            self.count += 1
+            self.latest = {
+                "source": self.source,
+                "confidence": smoothed,
+                "raw_confidence": confidence,
+                "bbox": list(bbox),
+                "image_path": image_path,
+                "lat": lat,
+                "lon": lon,
+                "persons": persons,
+                "animals": animals,
+                "ts": timestamp,
+                "timestamp": datetime.datetime.fromtimestamp(timestamp),
+            }
+            return self.latest
+
+    def history(self, n=None):
+        """Up to n most recent records, oldest first (a copy)."""
+        with self.lock:
+            size = len(self.records)
+            n = min(self.count, size) if n is None else min(n, self.count, size)
+            slots = (np.arange(self.count - n, self.count)) % size
+            return self.records[slots].copy()
+
 
 class VisionDetector:
     """
     Level 3A: Vision Module (The Senses)
-    
+
     Responsibility:
     - Detect visual anomalies (Fire/Smoke).
     - Can run in Simulation Mode OR Real Mode (if updated externally).
+    - Keep real detections per source (camera/drone id) in fixed-size ring
+      buffers with their own EMA, so streams never overwrite each other.
+    - Answer "strongest fresh detection within a radius" from a spatial
+      index of source positions.
     """
 
-    def __init__(self):
+    def __init__(self, buffer_size=64, clock=time.time):
         # Simulation parameters
         self.simulated_conf = 0.85
-        
-        # Real detection state
-        self.last_real_detection = {
-            "confidence": None,
-            "image_path": None,
-            "timestamp": None
+        self.buffer_size = buffer_size
+        self.clock = clock
+
+        # Real detection state: source id -> SourceBuffer
+        self.sources = {}
+        self.positions = SpatialIndex(cell_deg=0.01, merge_at=1024, clock=clock)
+        self._latest_source = None
+        self._registry_lock = threading.Lock()
+
+    def _buffer(self, source):
+        buffer = self.sources.get(source)
+        if buffer is None:
+            with self._registry_lock:
+                buffer = self.sources.setdefault(source, SourceBuffer(source, self.buffer_size))
+        return buffer
+
+    def _fresh(self, detection, now=None):
+        now = self.clock() if now is None else now
+        return detection is not None and now - detection["ts"] < FRESH_SECONDS
+
+    @staticmethod
+    def _as_result(detection):
+        return {
+            "normalized_conf": detection["confidence"],
+            "bbox": detection["bbox"],
+            "source": "REAL_YOLO_FEED",
+            "source_id": detection["source"],
+            "image_path": detection["image_path"],
+            "timestamp": detection["timestamp"].isoformat(),
         }
 
-    def detect_fire(self, frame=None):
+    def detect_fire(self, frame=None, source=None):
         """
         Level 3A: Vision Analysis.
-        If real detection data is available (within last 10s), use it.
+        If real detection data is available (within last 10s) for `source`
+        (default: the source that reported last), use it.
         Otherwise, fall back to simulation.
         """
-        # Check for recent real detection (valid for 10 seconds)
-        if self.last_real_detection["confidence"] is not None:
-             time_diff = datetime.datetime.now() - self.last_real_detection["timestamp"]
-             if time_diff.total_seconds() < 10:
-                 return {
-                     "normalized_conf": self.last_real_detection["confidence"],
-                     "bbox": [100, 100, 200, 200], # Placeholder or pass real bbox
-                     "source": "REAL_YOLO_FEED",
-                     "image_path": self.last_real_detection["image_path"],
-                     "timestamp": self.last_real_detection["timestamp"].isoformat()
-                 }
-             else:
-                 # Reset if too old
-                 self.last_real_detection["confidence"] = None
+        detection = self.get_last_detection(source)
+        if self._fresh(detection):
+            return self._as_result(detection)
 
         # Fallback to Simulation
         # Simulate high confidence if triggered for test, else random low/med
         # For this demo, we'll randomize a bit but kept high for easy verification
         conf = random.uniform(0.7, 0.95)
-        
+
         return {
             "normalized_conf": conf,
             "bbox": [10, 20, 100, 150],
             "source": "SIMULATION"
         }
 
-    def update_detection(self, confidence, image_path, lat=None, lon=None, p_count=0, a_count=0):
-        """Override simulation with real data from live_monitor.py"""
-        
-        # Exponential Moving Average (EMA) for stability
-        # New value affects 30%, old value kept 70%
-        current_conf = self.last_real_detection.get("confidence") or 0.0
-        if current_conf is None: current_conf = 0.0
-        smoothed_conf = (0.7 * current_conf) + (0.3 * confidence)
-        
-        # Immediate jump up for safety, slow decay down
-        if confidence > current_conf:
-             smoothed_conf = confidence # React fast to fire
-        
-        self.last_real_detection = {
-            "confidence": smoothed_conf,
-            "image_path": image_path,
-            "lat": lat,
-            "lon": lon,
-            "persons": p_count,
-            "animals": a_count,
-            "timestamp": datetime.datetime.now()
-        }
-        print(f"[Vision] Updated with Real Detection: {confidence} -> {smoothed_conf:.2f} (Image: {image_path}) | P:{p_count} A:{a_count}")
+    def detect_near(self, lat, lon, radius_km):
+        """
+        Strongest fresh detection among the sources within radius_km
+        (detect_fire's result shape), or None when no nearby source has one.
+        """
+        now = self.clock()
+        best = None
+        for point in self.positions.radius(lat, lon, radius_km):
+            buffer = self.sources.get(point["data"])
+            detection = buffer.latest if buffer is not None else None
+            if self._fresh(detection, now) and (best is None or detection["confidence"] > best["confidence"]):
+                best = detection
+        return self._as_result(best) if best is not None else None
+
+    def update_detection(self, confidence, image_path, lat=None, lon=None, p_count=0, a_count=0,
+                         source=DEFAULT_SOURCE, bbox=None):
+        """Override simulation with real data from live_monitor.py (one source's stream)."""
+        buffer = self._buffer(source)
+        previous = buffer.latest
+        detection = buffer.append(self.clock(), float(confidence), DEFAULT_BBOX if bbox is None else bbox,
+                                  p_count, a_count, image_path, lat, lon)
+        self._latest_source = source
+        # Keyed, so a source has one position; only a move touches the index
+        if lat is not None and lon is not None and (previous is None or (previous["lat"], previous["lon"]) != (lat, lon)):
+            self.positions.insert(lat, lon, "source", key=source, data=source)
+        print(f"[Vision] Updated with Real Detection ({source}): {confidence} -> {detection['confidence']:.2f} "
+              f"(Image: {image_path}) | P:{p_count} A:{a_count}")
+
+    def get_last_detection(self, source=None):
+        source = self._latest_source if source is None else source
+        buffer = self.sources.get(source)
+        return buffer.latest if buffer is not None else None
+
+    def history(self, source, n=None):
+        """Recent detections of one source as a structured array (oldest first)."""
+        buffer = self.sources.get(source)
+        return buffer.history(n) if buffer is not None else np.zeros(0, dtype=DETECTION_DTYPE)
 
-    def get_last_detection(self):
-        return self.last_real_detection
+    @property
+    def last_real_detection(self):
+        return self.get_last_detection() or {"confidence": None, "image_path": None, "timestamp": None}
 
 vision_model = VisionDetector()
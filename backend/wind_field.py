@@ -0,0 +1,274 @@
+import glob
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+from http_session import session as shared_session
+from tile_cache import TileCache
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+# (speed km/h, bearing) used when the wind field cannot be sampled
+DEFAULT_WIND = (10.0, 0.0)
+
+
+def to_components(speed_kmh, bearing):
+    """(speed, bearing the wind pushes towards) -> (east, north) components."""
+    theta = np.radians(bearing)
+    return speed_kmh * np.sin(theta), speed_kmh * np.cos(theta)
+
+
+def from_components(u, v):
+    """(east, north) components -> (speed_kmh, bearing 0-360, 0 = towards north)."""
+    return np.hypot(u, v), np.degrees(np.arctan2(u, v)) % 360.0
+
+
+class WindGrid:
+    """
+    Wind components on a regular lat/lon node grid.
+
+    Rows run south -> north, columns west -> east (as TerrainRasters);
+    u/v are the east/north components in km/h of the wind's push, so a
+    bearing derived from them is the direction the fire is driven towards.
+    """
+
+    def __init__(self, west, south, step_deg, u, v, valid_at=None):
+        self.west = float(west)
+        self.south = float(south)
+        self.step_deg = float(step_deg)
+        self.u = np.asarray(u, dtype=np.float32)
+        self.v = np.asarray(v, dtype=np.float32)
+        self.valid_at = valid_at
+
+    @property
+    def shape(self):
+        return self.u.shape
+
+    def node_coords(self):
+        rows, cols = self.shape
+        return (self.south + np.arange(rows) * self.step_deg,
+                self.west + np.arange(cols) * self.step_deg)
+
+    def interpolate(self, lats, lons):
+        """Bilinear (u, v) at point arrays; points off the grid are clamped to its edge."""
+        rows, cols = self.shape
+        fy = np.clip((np.asarray(lats, dtype=np.float64) - self.south) / self.step_deg, 0, rows - 1)
+        fx = np.clip((np.asarray(lons, dtype=np.float64) - self.west) / self.step_deg, 0, cols - 1)
+        i0 = np.minimum(fy.astype(np.intp), max(rows - 2, 0))
+        j0 = np.minimum(fx.astype(np.intp), max(cols - 2, 0))
+        i1, j1 = np.minimum(i0 + 1, rows - 1), np.minimum(j0 + 1, cols - 1)
+        ty, tx = fy - i0, fx - j0
+        out = []
+        for grid in (self.u, self.v):
+            south = grid[i0, j0] * (1 - tx) + grid[i0, j1] * tx
+            north = grid[i1, j0] * (1 - tx) + grid[i1, j1] * tx
+            out.append(south * (1 - ty) + north * ty)
+        return out[0], out[1]
+
+
+class StubWindProvider:
+    """Uniform wind everywhere (offline runs and tests)."""
+
+    def __init__(self, speed_kmh=10.0, bearing=0.0):
+        self.speed_kmh = speed_kmh
+        self.bearing = bearing
+
+    def fetch(self, west, south, rows, cols, step_deg, valid_at):
+        u, v = to_components(self.speed_kmh, self.bearing)
+        return np.full((rows, cols), u), np.full((rows, cols), v)
+
+
+class FileWindProvider:
+    """
+    Gridded wind from a local .npz file.
+
+    Keys: lats (ascending), lons (ascending), u and v (km/h, east/north
+    push components) shaped (lats, lons), or (times, lats, lons) together
+    with a `times` array of epoch seconds. The latest slice at or before
+    the requested time is used; tiles are resampled from it bilinearly.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.lats = data["lats"].astype(np.float64)
+            self.lons = data["lons"].astype(np.float64)
+            self.u = data["u"].astype(np.float32)
+            self.v = data["v"].astype(np.float32)
+            self.times = data["times"].astype(np.float64) if "times" in data else None
+        self.step_deg = float(self.lats[1] - self.lats[0]) if len(self.lats) > 1 else 1.0
+
+    def fetch(self, west, south, rows, cols, step_deg, valid_at):
+        u, v = self.u, self.v
+        if self.times is not None:
+            i = max(0, int(np.searchsorted(self.times, valid_at, side="right")) - 1)
+            u, v = u[i], v[i]
+        source = WindGrid(self.lons[0], self.lats[0], self.step_deg, u, v)
+        lats = south + np.arange(rows) * step_deg
+        lons = west + np.arange(cols) * step_deg
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+        return source.interpolate(lat_grid, lon_grid)
+
+
+class OpenMeteoWindProvider:
+    """
+    Current 10 m wind from Open-Meteo, one request per tile (many points per
+    call) over the shared keep-alive session.
+    """
+
+    def __init__(self, url=OPEN_METEO_URL, session=None, max_points=100):
+        self.url = url
+        self.session = session or shared_session
+        self.max_points = max_points
+
+    def fetch(self, west, south, rows, cols, step_deg, valid_at):
+        lats = np.clip(south + np.arange(rows) * step_deg, -90.0, 90.0)
+        lons = (west + np.arange(cols) * step_deg + 180.0) % 360.0 - 180.0
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+        points = list(zip(lat_grid.ravel().tolist(), lon_grid.ravel().tolist()))
+
+        speed, direction = [], []
+        for start in range(0, len(points), self.max_points):
+            chunk = points[start:start + self.max_points]
+            resp = self.session.get(self.url, timeout=30, params={
+                "latitude": ",".join(f"{lat:.4f}" for lat, _ in chunk),
+                "longitude": ",".join(f"{lon:.4f}" for _, lon in chunk),
+                "current": "wind_speed_10m,wind_direction_10m",
+                "wind_speed_unit": "kmh",
+            })
+            if resp.status_code != 200:
+                raise RuntimeError(f"Open-Meteo: HTTP {resp.status_code}")
+            body = resp.json()
+            for location in body if isinstance(body, list) else [body]:
+                speed.append(location["current"]["wind_speed_10m"])
+                direction.append(location["current"]["wind_direction_10m"])
+        # Meteorological direction is where the wind comes from; flip to the push bearing
+        bearing = (np.asarray(direction, dtype=np.float64) + 180.0) % 360.0
+        u, v = to_components(np.asarray(speed, dtype=np.float64), bearing)
+        return u.reshape(rows, cols), v.reshape(rows, cols)
+
+
+class WindFieldService:
+    """
+    Level 4 support: Wind field (The Brain's weather)
+
+    Responsibility:
+    - Fetch gridded wind per fixed lat/lon tile and time bucket from one
+      provider (Open-Meteo, a local file, or a uniform stub).
+    - Cache tiles in memory (TTL + LRU, single-flight) and on disk as .npz
+      arrays per time bucket, so restarts and N fires in the same area cost
+      one upstream fetch per tile, not one weather call per fire.
+    - Serve vectorized bilinear interpolation for arbitrary point batches.
+    """
+
+    def __init__(self, provider, tile_deg=5.0, step_deg=0.25, bucket_seconds=3600, ttl_seconds=3600,
+                 cache_dir=None, max_tiles=64, clock=time.time):
+        """
+        Args:
+            provider: Object with fetch(west, south, rows, cols, step_deg,
+                valid_at) -> (u, v) node arrays in km/h.
+            tile_deg: Tile size; each tile holds tile_deg / step_deg + 1
+                nodes per side (edges shared with the neighbours).
+            bucket_seconds: Time bucket a fetched tile stands for.
+            cache_dir: Directory for the on-disk tile store (None = memory only).
+        """
+        self.provider = provider
+        self.tile_deg = float(tile_deg)
+        self.step_deg = float(step_deg)
+        self.nodes = int(round(self.tile_deg / self.step_deg)) + 1
+        self.bucket_seconds = bucket_seconds
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self.clock = clock
+        self.cache = TileCache(max_entries=max_tiles, ttl_seconds=ttl_seconds, clock=clock)
+        self.upstream_fetches = 0
+        self.disk_hits = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _tile_path(self, key):
+        bucket, ty, tx = key
+        return os.path.join(self.cache_dir, f"wind_{bucket}_{ty}_{tx}.npz")
+
+    def _load_tile(self, key):
+        bucket, ty, tx = key
+        west, south = tx * self.tile_deg - 180.0, ty * self.tile_deg - 90.0
+        path = self._tile_path(key) if self.cache_dir else None
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                if self.clock() - float(data["fetched_at"]) < self.ttl_seconds and data["u"].shape == (self.nodes,) * 2:
+                    with self._lock:
+                        self.disk_hits += 1
+                    return WindGrid(west, south, self.step_deg, data["u"], data["v"], float(data["valid_at"]))
+
+        valid_at = bucket * self.bucket_seconds
+        u, v = self.provider.fetch(west, south, self.nodes, self.nodes, self.step_deg, valid_at)
+        with self._lock:
+            self.upstream_fetches += 1
+        grid = WindGrid(west, south, self.step_deg, u, v, valid_at)
+        if path:
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, u=grid.u, v=grid.v, valid_at=valid_at, fetched_at=self.clock())
+            os.replace(tmp, path)
+            self.prune(keep_bucket=bucket)
+        return grid
+
+    def tile(self, ty, tx, timestamp=None):
+        """WindGrid for one tile and the time bucket of `timestamp` (default: now)."""
+        timestamp = self.clock() if timestamp is None else timestamp
+        key = (int(timestamp // self.bucket_seconds), ty, tx)
+        return self.cache.get_or_load(key, lambda: self._load_tile(key))
+
+    def sample(self, lats, lons, timestamp=None):
+        """
+        Wind at many points with one tile lookup per distinct tile.
+
+        Returns:
+            (speed_kmh, bearing) arrays; bearing is where the wind pushes
+            towards (fire_spread's convention).
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = (np.atleast_1d(np.asarray(lons, dtype=np.float64)) + 180.0) % 360.0 - 180.0
+        ty = np.clip(np.floor((lats + 90.0) / self.tile_deg), 0, math.ceil(180.0 / self.tile_deg) - 1).astype(np.intp)
+        tx = np.floor((lons + 180.0) / self.tile_deg).astype(np.intp)
+        u = np.empty(len(lats))
+        v = np.empty(len(lats))
+        # Group points by tile: one sort, then one interpolation call per tile
+        codes = ty * (int(math.ceil(360.0 / self.tile_deg)) + 1) + tx
+        order = np.argsort(codes, kind="stable")
+        starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+        for first, last in zip(starts.tolist(), np.append(starts[1:], len(order)).tolist()):
+            members = order[first:last]
+            grid = self.tile(int(ty[members[0]]), int(tx[members[0]]), timestamp)
+            u[members], v[members] = grid.interpolate(lats[members], lons[members])
+        return from_components(u, v)
+
+    def sample_point(self, lat, lon, timestamp=None):
+        speed, bearing = self.sample([lat], [lon], timestamp)
+        return float(speed[0]), float(bearing[0])
+
+    def prune(self, keep_bucket):
+        """Drop on-disk tiles from buckets older than the TTL allows."""
+        oldest = keep_bucket - int(math.ceil(self.ttl_seconds / self.bucket_seconds))
+        for path in glob.glob(os.path.join(self.cache_dir, "wind_*.npz")):
+            try:
+                bucket = int(os.path.basename(path).split("_")[1])
+            except (IndexError, ValueError):
+                continue
+            if bucket < oldest:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats.update({"upstream_fetches": self.upstream_fetches, "disk_hits": self.disk_hits})
+        return stats
+
+
+# Pipeline default (the old 10 km/h, bearing 0 fallback); app.py builds one from the environment
+wind_field = WindFieldService(StubWindProvider())
@@ -0,0 +1,51 @@
+"""
+Throughput benchmark for AcousticFFT's streaming STFT.
+
+Feeds 100 ms chunks of synthetic 16 kHz audio (fire-band tone + wind rumble +
+noise) through AcousticFFT.stream for 1, 8 and 64 microphone channels and
+reports audio-seconds processed per CPU-second (summed over channels).
+
+Usage: python benchmarks/bench_acoustic_fft.py [--seconds 60]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from acoustic_fft import AcousticFFT
+
+RATE = 16000
+CHUNK = RATE // 10
+
+
+def chunks(channels, seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(CHUNK) / RATE
+    base = 0.3 * np.sin(2 * np.pi * 120 * t) + 0.2 * np.sin(2 * np.pi * 25 * t)
+    for _ in range(int(seconds * RATE / CHUNK)):
+        yield (base + 0.05 * rng.standard_normal((channels, CHUNK))).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    for channels in (1, 8, 64):
+        data = list(chunks(channels, args.seconds))
+        module = AcousticFFT(sample_rate=RATE)
+        start = time.process_time()
+        for _ in module.stream(data):
+            pass
+        cpu = time.process_time() - start
+        audio_s = args.seconds * channels
+        print(f"{channels:3d} channels: {audio_s:7.0f} audio-s in {cpu:.3f} CPU-s "
+              f"-> {audio_s / cpu:,.0f} audio-s per CPU-s")
+
+
+if __name__ == "__main__":
+    main()
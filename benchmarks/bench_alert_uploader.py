@@ -0,0 +1,85 @@
+"""
+Detection FPS while the backend is down: inline requests.post vs AlertUploader.
+
+A stand-in detection loop burns ~10 ms of CPU per frame and raises an alert
+every 10th frame. The "backend" is a local server that accepts connections
+but stalls for 2 s before answering 503, i.e. the worst case for a blocking
+client.
+
+Usage: python benchmarks/bench_alert_uploader.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from alert_uploader import AlertUploader
+
+FRAMES = 200
+ALERT_EVERY = 10
+JPEG = b"\xff\xd8" + os.urandom(60_000) + b"\xff\xd9"
+
+
+class StalledBackend(BaseHTTPRequestHandler):
+    def do_POST(self):
+        time.sleep(2)
+        self.send_response(503)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def fake_inference():
+    end = time.perf_counter() + 0.01
+    while time.perf_counter() < end:
+        pass
+
+
+def run_loop(send_alert):
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        fake_inference()
+        if i % ALERT_EVERY == 0:
+            send_alert()
+    return FRAMES / (time.perf_counter() - start)
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StalledBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/vision-trigger"
+
+    baseline = run_loop(lambda: None)
+
+    def inline():
+        try:
+            requests.post(url, files={"image": ("a.jpg", JPEG, "image/jpeg")}, timeout=30)
+        except requests.RequestException:
+            pass
+
+    blocking = run_loop(inline)
+
+    with tempfile.TemporaryDirectory() as spool, contextlib.redirect_stdout(io.StringIO()):
+        uploader = AlertUploader(url, spool, backoff_base=0.5).start()
+        background = run_loop(lambda: uploader.submit({"confidence": 0.9}, JPEG))
+        queued = uploader.pending_count()
+        uploader.stop()
+
+    server.shutdown()
+    print(f"{'mode':<22} | {'detection FPS':>13}")
+    print(f"{'no alerts':<22} | {baseline:>13.1f}")
+    print(f"{'inline requests.post':<22} | {blocking:>13.1f}")
+    print(f"{'AlertUploader':<22} | {background:>13.1f}   ({queued} alerts spooled for retry)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Throughput benchmark for ChemicalRatio.analyze_batch (one core).
+
+Scores batches of CO/CO2/NOx readings with the vectorized ratio rules, with
+and without per-sensor rolling baselines (readings spread over --sensors, so
+each sensor appears many times per batch), and compares with the scalar
+analyze_gas loop on a sample.
+
+Usage: python benchmarks/bench_chemical_ratio.py [--readings 1000000 --sensors 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from chemical_ratio import ChemicalRatio
+
+
+def best_of(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readings", type=int, default=1_000_000)
+    parser.add_argument("--sensors", type=int, default=10_000)
+    args = parser.parse_args()
+
+    n = args.readings
+    rng = np.random.default_rng(0)
+    sensors = rng.integers(0, args.sensors, n)
+    timestamps = np.sort(rng.uniform(0, 3600, n))
+    co = rng.uniform(0, 150, n)
+    co2 = rng.uniform(400, 900, n)
+    nox = rng.uniform(0, 100, n)
+    module = ChemicalRatio()
+
+    rules = best_of(lambda: module.analyze_batch(co, co2, nox))
+    baseline = best_of(lambda: module.analyze_batch(co, co2, nox, sensors=sensors))
+    ordered = best_of(lambda: module.analyze_batch(co, co2, nox, sensors=sensors, timestamps=timestamps))
+
+    sample = 20000
+    readings = [{"co": co[i], "co2": co2[i], "nox": nox[i]} for i in range(sample)]
+    scalar = best_of(lambda: [module.analyze_gas(r) for r in readings], repeats=1) / sample * n
+
+    print(f"{n:,} readings from {args.sensors:,} sensors")
+    for label, seconds in (("ratio rules only", rules), ("+ rolling baselines", baseline),
+                           ("+ timestamp ordering", ordered), ("scalar analyze_gas (extrap.)", scalar)):
+        print(f"{label:30s} {seconds * 1000:9.1f} ms  {n / seconds / 1e6:7.2f} M readings/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Dispatch scheduler benchmark: --incidents concurrent incidents, --drones drones.
+
+1. Cold start: every incident is waiting and every drone idle; one
+   dispatch() pairs the top incidents with the fleet by auction. Total ETA
+   is compared with greedy nearest-drone in priority order.
+2. Steady state: each event completes one mission, opens one new incident
+   and calls dispatch(), which only re-plans the freed drone against the
+   waiting queue. Reported per event, next to what re-planning the whole
+   fleet from scratch would cost.
+
+Usage: python benchmarks/bench_dispatch_scheduler.py [--incidents 1000 --drones 200 --events 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from dispatch_scheduler import DispatchScheduler, auction_assign, distance_matrix_km
+
+REGION = (-121.0, 38.0, -120.0, 39.0)  # ~110 km square
+
+
+def random_points(rng, n):
+    west, south, east, north = REGION
+    return rng.uniform(south, north, n), rng.uniform(west, east, n)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--incidents", type=int, default=1000)
+    parser.add_argument("--drones", type=int, default=200)
+    parser.add_argument("--events", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scheduler = DispatchScheduler(range_km=400.0)
+    d_lat, d_lon = random_points(rng, args.drones)
+    scheduler.add_drones([f"drone_{i}" for i in range(args.drones)], d_lat, d_lon)
+    i_lat, i_lon = random_points(rng, args.incidents)
+    scores, ros = rng.uniform(0.5, 1.0, args.incidents), rng.uniform(0.1, 6.0, args.incidents)
+
+    start = time.perf_counter()
+    for k in range(args.incidents):
+        scheduler.submit_incident(i_lat[k], i_lon[k], scores[k], ros[k], incident_id=f"incident_{k}")
+    submit = time.perf_counter() - start
+
+    start = time.perf_counter()
+    missions = scheduler.dispatch()
+    cold = time.perf_counter() - start
+    auction_eta = sum(m["eta_min"] for m in missions)
+
+    # Greedy baseline on the same incidents: nearest free drone, highest priority first
+    served = sorted(missions, key=lambda m: -m["priority"])
+    dist = distance_matrix_km(np.array([m["lat"] for m in served]), np.array([m["lon"] for m in served]), d_lat, d_lon)
+    free = np.ones(args.drones, dtype=bool)
+    greedy_eta = 0.0
+    for row in dist:
+        j = int(np.argmin(np.where(free, row, np.inf)))
+        free[j] = False
+        greedy_eta += row[j] / scheduler.cruise_kmh * 60.0
+
+    print(f"{args.incidents:,} incidents, {args.drones} drones")
+    print(f"submit:            {submit * 1e6 / args.incidents:8.1f} us per incident")
+    print(f"cold dispatch:     {cold * 1000:8.1f} ms for {len(missions)} missions")
+    print(f"total ETA:         {auction_eta:8.0f} min auction vs {greedy_eta:.0f} min greedy nearest-drone")
+
+    open_missions = list(scheduler.missions)
+    latencies = []
+    for e in range(args.events):
+        scheduler.complete_mission(open_missions[e % len(open_missions)])
+        lat, lon = random_points(rng, 1)
+        scheduler.submit_incident(lat[0], lon[0], rng.uniform(0.5, 1.0), rng.uniform(0.1, 6.0))
+        start = time.perf_counter()
+        new = scheduler.dispatch()
+        latencies.append(time.perf_counter() - start)
+        open_missions.extend(m["mission_id"] for m in new)
+    latencies = np.array(latencies) * 1000
+
+    waiting = [i for i in scheduler.incidents.values() if i["mission_id"] is None]
+    top = sorted(waiting, key=lambda i: -i["priority"])[:args.drones]
+    start = time.perf_counter()
+    cost = distance_matrix_km(np.array([i["lat"] for i in top]), np.array([i["lon"] for i in top]),
+                              scheduler.lat, scheduler.lon) / scheduler.cruise_kmh * 60.0
+    auction_assign(cost, eps=scheduler.eps_min)
+    full = (time.perf_counter() - start) * 1000
+
+    print(f"incremental event: {np.median(latencies):8.3f} ms median, {np.percentile(latencies, 99):.3f} ms P99 "
+          f"over {args.events} events")
+    print(f"full re-plan:      {full:8.1f} ms per event (top {len(top)} waiting x {args.drones} drones)")
+    print("stats:", scheduler.stats())
+
+
+if __name__ == "__main__":
+    main()
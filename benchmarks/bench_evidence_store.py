@@ -0,0 +1,113 @@
+"""
+Evidence store vs. the old fire_<epoch>.jpg files behind the static route.
+
+Stores --frames alert frames, --repeat identical copies each (a burst), both
+ways. It then reports bytes on disk and p50/p95 latency for:
+- the old static-folder route (a bare Flask app, since the dashboard no
+  longer serves arbitrary files);
+- GET /api/evidence (full image);
+- a conditional re-GET (304);
+- the thumbnail.
+
+When opencv is installed, frames are real 1280x720 JPEGs and thumbnails are
+real. Without it, frames are random bytes of the same size and variants
+redirect to the original.
+
+Usage: python benchmarks/bench_evidence_store.py [--frames 200 --repeat 5 --requests 2000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import app as backend_app
+from evidence_store import EvidenceStore
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+def make_frames(n, rng):
+    frames = []
+    for _ in range(n):
+        if cv2 is not None:
+            image = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+            image = cv2.GaussianBlur(image, (31, 31), 0)
+            frames.append(cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 85])[1].tobytes())
+        else:
+            frames.append(rng.integers(0, 256, 150_000, dtype=np.uint8).tobytes())
+    return frames
+
+
+def timed_gets(client, urls, etags=None):
+    latencies = []
+    transferred = 0
+    for i, url in enumerate(urls):
+        headers = {"If-None-Match": f'"{etags[i]}"'} if etags else None
+        start = time.perf_counter()
+        resp = client.get(url, headers=headers, follow_redirects=True)
+        transferred += len(resp.data)
+        latencies.append(time.perf_counter() - start)
+    ms = np.array(latencies) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 95), transferred
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = make_frames(args.frames, rng)
+    burst = [f for f in frames for _ in range(args.repeat)]
+
+    with tempfile.TemporaryDirectory() as root:
+        legacy_dir = os.path.join(root, "frontend", "assets", "detected_fires")
+        os.makedirs(legacy_dir)
+        for i, data in enumerate(burst):
+            with open(os.path.join(legacy_dir, f"fire_{1700000000 + i}.jpg"), "wb") as f:
+                f.write(data)
+        legacy_bytes = sum(len(f) for f in burst)
+
+        store = EvidenceStore(os.path.join(root, "evidence"), workers=2, max_pending=len(burst))
+        start = time.perf_counter()
+        digests = [store.put(data) for data in burst]
+        put_us = (time.perf_counter() - start) * 1e6 / len(burst)
+        store.join()
+        stats = store.stats()
+
+        pick = rng.integers(0, len(burst), args.requests).tolist()
+        client = backend_app.app.test_client()
+        legacy = Flask("legacy", static_folder=root, static_url_path="").test_client()
+        static = timed_gets(legacy, [f"/frontend/assets/detected_fires/fire_{1700000000 + i}.jpg" for i in pick])
+        with mock.patch.object(backend_app.pipeline, "store", store):
+            full = timed_gets(client, [store.url(digests[i]) for i in pick])
+            thumb = timed_gets(client, [store.url(digests[i], "thumb") for i in pick])
+            revalidate = timed_gets(client, [store.url(digests[i]) for i in pick], [digests[i] for i in pick])
+
+    print(f"{len(burst)} frames ({args.frames} distinct x {args.repeat}), "
+          f"{'real JPEGs + opencv thumbnails' if cv2 is not None else 'no opencv: random bytes, no thumbnails'}")
+    print(f"disk: {legacy_bytes / 1e6:8.2f} MB fire_<epoch>.jpg vs {stats['total_bytes'] / 1e6:.2f} MB store "
+          f"(originals + variants), {stats['bytes_deduplicated'] / 1e6:.2f} MB deduplicated; put {put_us:.0f} us/frame")
+    print(f"{'route':<28s} {'p50 ms':>8s} {'p95 ms':>8s} {'MB sent':>9s}")
+    for label, (p50, p95, sent) in (("old static folder", static), ("/api/evidence full", full),
+                                    ("/api/evidence thumb", thumb), ("/api/evidence If-None-Match", revalidate)):
+        print(f"{label:<28s} {p50:8.3f} {p95:8.3f} {sent / 1e6:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
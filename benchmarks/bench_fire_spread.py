@@ -0,0 +1,60 @@
+"""
+Spread-cone throughput: calculate_spread_cones vs. one calculate_spread_cone per fire.
+
+Scores --fires active detections (fire-season scale) in one vectorized call,
+with and without GeoJSON polygons, against the per-fire scalar loop (its
+per-call print goes to /dev/null, so terminal I/O is not counted).
+
+Usage: python benchmarks/bench_fire_spread.py [--fires 10000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from fire_spread import fire_spread
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fires", type=int, default=10000)
+    args = parser.parse_args()
+
+    n = args.fires
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(-40, 60, n), rng.uniform(-120, 150, n)
+    speeds, bearings = rng.uniform(0, 60, n), rng.uniform(0, 360, n)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        cones = fire_spread.calculate_spread_cones(lats, lons, speeds, bearings)
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fire_spread.calculate_spread_cones(lats, lons, speeds, bearings, geojson=True)
+        batch_geojson = time.perf_counter() - start
+
+    lat_list, lon_list = lats.tolist(), lons.tolist()
+    speed_list, bearing_list = speeds.tolist(), bearings.tolist()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for i in range(n):
+            fire_spread.calculate_spread_cone(lat_list[i], lon_list[i], speed_list[i], bearing_list[i])
+        scalar = time.perf_counter() - start
+        cone = fire_spread.calculate_spread_cone(lat_list[-1], lon_list[-1], speed_list[-1], bearing_list[-1])
+    assert abs(cone["head"]["lat"] - cones["head_lat"][-1]) < 1e-12
+
+    print(f"{n:,} fires")
+    print(f"calculate_spread_cones:           {batch * 1000:8.2f} ms")
+    print(f"calculate_spread_cones + GeoJSON: {batch_geojson * 1000:8.2f} ms")
+    print(f"calculate_spread_cone per fire:   {scalar * 1000:8.2f} ms (printing to /dev/null)")
+
+
+if __name__ == "__main__":
+    main()
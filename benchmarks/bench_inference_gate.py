@@ -0,0 +1,111 @@
+"""
+Replay benchmark for InferenceScheduler: CPU saved vs. detection recall.
+
+By default replays a synthetic 10-minute, 10 FPS forest clip with three fire
+episodes and a 30 ms stand-in detector that "sees" fire on episode frames.
+With --video (and optionally --model, needs opencv + ultralytics) it replays a
+recorded clip; recall is then measured against ungated YOLO on every frame.
+
+Recall is reported per frame and per fire episode (episode counts as caught
+if any of its frames was inferred and detected fire within 2 s of onset).
+
+Usage: python benchmarks/bench_inference_gate.py [--video clip.mp4 --model best.pt]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from inference_gate import InferenceScheduler
+
+FPS = 10
+INFER_COST_S = 0.03
+
+
+def synthetic_clip(minutes=10, seed=0):
+    rng = np.random.default_rng(seed)
+    n = minutes * 60 * FPS
+    base = np.zeros((240, 320, 3), dtype=np.uint8)
+    base[..., 0], base[..., 1], base[..., 2] = 40, 95, 50
+    episodes = [(1200, 1500), (3000, 3100), (5000, 5800)]
+    truth = np.zeros(n, dtype=bool)
+    for a, b in episodes:
+        truth[a:b] = True
+    for i in range(n):
+        frame = base + rng.integers(0, 6, base.shape, dtype=np.uint8)  # sensor noise
+        if truth[i]:
+            start = next(a for a, b in episodes if a <= i < b)
+            size = min(60, 4 + (i - start) // 5)  # fire grows from a few pixels
+            frame[120:120 + size, 160:160 + size] = (30, 140, 250)
+        yield frame, bool(truth[i])
+
+
+def video_clip(path, model):
+    import cv2
+    cap = cv2.VideoCapture(path)
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        results = model(frame, verbose=False, conf=0.6)[0]
+        fire = any('fire' in model.names[int(b.cls[0])].lower() for b in results.boxes)
+        yield frame, fire
+    cap.release()
+
+
+def episodes_of(truth):
+    eps, start = [], None
+    for i, t in enumerate(truth + [False]):
+        if t and start is None:
+            start = i
+        elif not t and start is not None:
+            eps.append((start, i))
+            start = None
+    return eps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video")
+    parser.add_argument("--model")
+    args = parser.parse_args()
+
+    if args.video:
+        from ultralytics import YOLO
+        clip = list(video_clip(args.video, YOLO(args.model)))
+    else:
+        clip = list(synthetic_clip())
+
+    now = [0.0]
+    gate = InferenceScheduler(clock=lambda: now[0])
+    truth, inferred_fire = [], []
+    busy = 0.0
+    for frame, fire in clip:
+        now[0] += 1.0 / FPS
+        run = gate.should_infer(frame)
+        if run:
+            busy += INFER_COST_S
+            gate.report(fire, INFER_COST_S)
+        truth.append(fire)
+        inferred_fire.append(run and fire)
+
+    n = len(clip)
+    fire_frames = sum(truth)
+    caught = sum(inferred_fire)
+    eps = episodes_of(truth)
+    eps_caught = sum(any(inferred_fire[a:min(b, a + 2 * FPS)]) for a, b in eps)
+    stats = gate.stats()
+
+    print(f"frames: {n} ({n / FPS / 60:.1f} min @ {FPS} FPS), fire frames: {fire_frames}, episodes: {len(eps)}")
+    print(f"inferred: {stats['inferred']} | gated: {stats['gated']} ({stats['gated_pct']}%) | reasons: {stats['reasons']}")
+    print(f"inference CPU: {busy:.1f}s gated vs {n * INFER_COST_S:.1f}s ungated "
+          f"({100 * (1 - busy / (n * INFER_COST_S)):.1f}% saved)")
+    print(f"recall: {100 * caught / max(1, fire_frames):.1f}% of fire frames, "
+          f"{eps_caught}/{len(eps)} episodes caught within 2 s of onset")
+
+
+if __name__ == "__main__":
+    main()
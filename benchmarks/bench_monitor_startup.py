@@ -0,0 +1,58 @@
+"""
+Monitor startup time, cold vs warm.
+
+Each measurement runs in a fresh interpreter:
+- import:  `import live_feed_monitor` (no network, no model load any more).
+- ready:   CognitiveMonitor() until the single-stream model is loaded
+           (the aerial model loads when run_multi starts).
+"cold" uses an empty geolocation/export cache, "warm" reuses the cache the
+cold run produced. Set FIRE_MODEL_DIR (and optionally FIRE_MODEL_FORMAT=onnx)
+to include model loading; without model files only import time is reported.
+
+Usage: FIRE_MODEL_DIR=/path/to/final_model python benchmarks/bench_monitor_startup.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+IMPORT_SNIPPET = """
+import time; t = time.perf_counter()
+import live_feed_monitor
+print(time.perf_counter() - t)
+"""
+
+READY_SNIPPET = """
+import time; t = time.perf_counter()
+import live_feed_monitor
+m = live_feed_monitor.CognitiveMonitor(location=live_feed_monitor.resolve_location(12.9, 77.6))
+for f in m.model_loads:
+    f.result()
+print(time.perf_counter() - t)
+"""
+
+
+def timed(snippet, env):
+    out = subprocess.run([sys.executable, "-c", snippet], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    model_dir = os.getenv("FIRE_MODEL_DIR")
+    with_models = bool(model_dir) and os.path.isdir(model_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, FIRE_GEO_CACHE=os.path.join(tmp, "location.json"),
+                   FIRE_ALERT_SPOOL=os.path.join(tmp, "spool"), PYTHONDONTWRITEBYTECODE="1")
+        print(f"{'phase':<8} | {'cold s':>8} | {'warm s':>8}")
+        print(f"{'import':<8} | {timed(IMPORT_SNIPPET, env):>8.3f} | {timed(IMPORT_SNIPPET, env):>8.3f}")
+        if with_models:
+            print(f"{'ready':<8} | {timed(READY_SNIPPET, env):>8.3f} | {timed(READY_SNIPPET, env):>8.3f}")
+        else:
+            print("(set FIRE_MODEL_DIR to time model loading)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Dashboard load: 2 s polling of /api/fusion-status vs. SSE push (/api/events).
+
+Simulates 500 open dashboards for 60 s of wall time during which the fusion
+state changes 3 times. Both modes run in-process (Flask test client for
+polling, EventBroadcaster mailboxes for push), so numbers compare server
+work and bytes, not network latency.
+
+Usage: python benchmarks/bench_push_vs_poll.py
+"""
+import base64
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import app as backend_app
+from event_stream import EventBroadcaster
+from pipeline import CognitivePipeline
+
+CLIENTS = 500
+DURATION_S = 60
+POLL_INTERVAL_S = 2
+CHANGES = 3
+HEARTBEAT_S = 15
+
+
+def alert(conf):
+    return {"image": base64.b64encode(b"jpeg").decode(), "confidence": conf, "lat": 12.9, "lon": 77.5}
+
+
+def run_polling(client):
+    ticks = DURATION_S // POLL_INTERVAL_S
+    change_every = ticks // CHANGES
+    requests_made, bytes_out = 0, 0
+    cpu = time.process_time()
+    for tick in range(ticks):
+        if tick % change_every == 0:
+            backend_app.pipeline.ingest(alert(0.6 + 0.1 * (tick // change_every)))
+        for _ in range(CLIENTS):
+            bytes_out += len(client.get("/api/fusion-status").data)
+            requests_made += 1
+    return requests_made, bytes_out, time.process_time() - cpu
+
+
+def run_push():
+    backend_app.events = EventBroadcaster(coalesce_window=0)
+    backend_app.pipeline.listeners[:] = [backend_app.publish_snapshot]
+    subs = [backend_app.events.subscribe() for _ in range(CLIENTS)]
+    bytes_out = 0
+    cpu = time.process_time()
+    for change in range(CHANGES):
+        backend_app.pipeline.ingest(alert(0.6 + 0.1 * change))
+        for sub in subs:
+            bytes_out += sum(len(f) for f in sub.drain())
+    # Idle connections only see heartbeats
+    bytes_out += CLIENTS * (DURATION_S // HEARTBEAT_S) * len(": keep-alive\n\n")
+    return CLIENTS, bytes_out, time.process_time() - cpu
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        backend_app.pipeline = CognitivePipeline(tmp)
+        poll = run_polling(backend_app.app.test_client())
+        backend_app.pipeline = CognitivePipeline(tmp)
+        push = run_push()
+
+    print(f"{CLIENTS} clients, {DURATION_S}s, {CHANGES} state changes")
+    print(f"{'mode':<8} | {'requests':>9} | {'bytes out':>12} | {'server CPU s':>12}")
+    for name, (reqs, nbytes, cpu) in (("polling", poll), ("push", push)):
+        print(f"{name:<8} | {reqs:>9} | {nbytes:>12,} | {cpu:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Level 1 throughput: scalar analyze_temporal_persistence vs. analyze_batch.
+
+Usage: python benchmarks/bench_sat_filter.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from sat_filter import SatelliteFilter
+
+
+def make_pull(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(-60, 70, n)
+    lon = rng.uniform(-180, 180, n)
+    bright = rng.uniform(295, 380, n)
+    return lat, lon, bright
+
+
+def to_csv(lat, lon, bright):
+    lines = ["latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,confidence,frp"]
+    for la, lo, b in zip(lat, lon, bright):
+        lines.append(f"{la:.5f},{lo:.5f},{b:.2f},0.39,0.36,2026-01-01,0412,N,n,4.2")
+    return "\n".join(lines)
+
+
+def bench_scalar(sf, lat, lon, bright):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for la, lo, b in zip(lat.tolist(), lon.tolist(), bright.tolist()):
+            sf.analyze_temporal_persistence({"latitude": la, "longitude": lo, "brightness": b})
+    return time.perf_counter() - start
+
+
+def bench_batch(sf, lat, lon, bright):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sf.analyze_batch(lat, lon, bright)
+    return time.perf_counter() - start
+
+
+def main():
+    sf = SatelliteFilter()
+    print(f"{'rows':>9} | {'scalar rows/s':>14} | {'batch rows/s':>14} | {'csv+batch rows/s':>16}")
+    for n in (10_000, 100_000, 1_000_000):
+        lat, lon, bright = make_pull(n)
+        # The scalar loop is only timed on up to 100k rows to keep the run short
+        scalar_n = min(n, 100_000)
+        t_scalar = bench_scalar(sf, lat[:scalar_n], lon[:scalar_n], bright[:scalar_n])
+        t_batch = bench_batch(sf, lat, lon, bright)
+
+        csv_text = to_csv(lat, lon, bright)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.analyze_firms_csv(csv_text)
+        t_csv = time.perf_counter() - start
+
+        print(f"{n:>9} | {scalar_n / t_scalar:>14,.0f} | {n / t_batch:>14,.0f} | {n / t_csv:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
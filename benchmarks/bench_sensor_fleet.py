@@ -0,0 +1,69 @@
+"""
+Fleet benchmark: 10k field nodes reporting once per second.
+
+Each simulated second every node sends fire/wind band energies and a CO/CO2/
+NOx reading; SensorFleet scores the whole batch. Compared with the old path
+(one analyze_audio + analyze_gas call per reading on the shared singletons),
+run on a subset and extrapolated.
+
+Usage: python benchmarks/bench_sensor_fleet.py [--nodes 10000 --seconds 30]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from acoustic_fft import AcousticFFT
+from chemical_ratio import ChemicalRatio
+from sensor_fleet import SensorFleet
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--seconds", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ids = [f"node-{i:05d}" for i in range(args.nodes)]
+    fleet = SensorFleet(seed=0)
+
+    by_id = by_slot = 0.0
+    slots = fleet.register(ids)
+    for second in range(args.seconds):
+        fire = rng.uniform(0, 100, args.nodes)
+        wind = rng.uniform(0, 50, args.nodes)
+        co = rng.uniform(0, 150, args.nodes)
+        co2 = rng.uniform(400, 900, args.nodes)
+        nox = rng.uniform(0, 100, args.nodes)
+
+        start = time.perf_counter()
+        fleet.analyze_audio(ids, fire, wind)
+        fleet.analyze_gas(ids, co, co2, nox)
+        by_id += time.perf_counter() - start
+
+        start = time.perf_counter()
+        fleet.analyze_audio(slots, fire, wind)
+        fleet.analyze_gas(slots, co, co2, nox)
+        by_slot += time.perf_counter() - start
+
+    acoustic, chemical = AcousticFFT(), ChemicalRatio()
+    sample = min(args.nodes, 2000)
+    start = time.perf_counter()
+    for _ in range(sample):
+        acoustic.analyze_audio()
+        chemical.analyze_gas()
+    scalar = (time.perf_counter() - start) / sample * args.nodes
+
+    print(f"{args.nodes} nodes x {args.seconds} reports")
+    print(f"fleet (node ids):  {1000 * by_id / args.seconds:8.2f} ms per fleet-second")
+    print(f"fleet (slots):     {1000 * by_slot / args.seconds:8.2f} ms per fleet-second")
+    print(f"per-reading loop:  {1000 * scalar:8.2f} ms per fleet-second (extrapolated, shared state)")
+
+
+if __name__ == "__main__":
+    main()
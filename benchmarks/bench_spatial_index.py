@@ -0,0 +1,92 @@
+"""
+SpatialIndex benchmark on 1M points.
+
+Bulk-loads --points hotspots (clustered like real fire seasons), streams
+incremental inserts with a TTL, then times bbox, radius and k-NN queries
+against a NumPy brute-force scan over the same arrays.
+
+Usage: python benchmarks/bench_spatial_index.py [--points 1000000 --queries 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from spatial_index import SpatialIndex, haversine_km
+
+
+def clustered_points(n, rng):
+    centers = np.column_stack([rng.uniform(-40, 60, 200), rng.uniform(-120, 150, 200)])
+    which = rng.integers(0, len(centers), n)
+    lats = np.clip(centers[which, 0] + rng.normal(0, 1.5, n), -89.9, 89.9)
+    lons = np.clip(centers[which, 1] + rng.normal(0, 1.5, n), -179.9, 179.9)
+    return lats, lons, centers
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(*q)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats, lons, centers = clustered_points(args.points, rng)
+    index = SpatialIndex(cell_deg=0.1)
+
+    start = time.perf_counter()
+    index.bulk_load(lats, lons, "hotspot")
+    load = time.perf_counter() - start
+
+    inserts = 50_000
+    ins_lat, ins_lon, _ = clustered_points(inserts, rng)
+    start = time.perf_counter()
+    for lat, lon in zip(ins_lat.tolist(), ins_lon.tolist()):
+        index.insert(lat, lon, "detection", ttl=3600)
+    insert_rate = inserts / (time.perf_counter() - start)
+    index.expire()
+
+    picks = centers[rng.integers(0, len(centers), args.queries)] + rng.normal(0, 1, (args.queries, 2))
+    bbox_q = [(lon - 0.5, lat - 0.5, lon + 0.5, lat + 0.5) for lat, lon in picks]
+    radius_q = [(lat, lon, 25.0) for lat, lon in picks]
+    knn_q = [(lat, lon, 10) for lat, lon in picks]
+
+    all_lat = np.concatenate([lats, ins_lat])
+    all_lon = np.concatenate([lons, ins_lon])
+
+    def brute_bbox(w, s, e, n):
+        return np.flatnonzero((all_lat >= s) & (all_lat <= n) & (all_lon >= w) & (all_lon <= e))
+
+    def brute_radius(lat, lon, km):
+        return np.flatnonzero(haversine_km(lat, lon, all_lat, all_lon) <= km)
+
+    def brute_knn(lat, lon, k):
+        return np.argpartition(haversine_km(lat, lon, all_lat, all_lon), k)[:k]
+
+    # Correctness spot check
+    for q in radius_q[:20]:
+        assert len(index.radius(*q, limit=None)) == len(brute_radius(*q))
+
+    sample = max(1, args.queries // 10)
+    print(f"{len(index):,} points | bulk load {load:.2f} s | incremental insert {insert_rate:,.0f}/s")
+    print(f"{'query':10s} {'index ms':>10s} {'brute ms':>10s}")
+    for name, fn, brute, qs in (
+        ("bbox 1deg", lambda *q: index.bbox(*q, limit=None), brute_bbox, bbox_q),
+        ("radius 25km", lambda *q: index.radius(*q, limit=None), brute_radius, radius_q),
+        ("knn k=10", lambda *q: index.nearest(*q), brute_knn, knn_q),
+    ):
+        print(f"{name:10s} {timed(fn, qs):10.2f} {timed(brute, qs[:sample]):10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+SpreadEnsemble scaling benchmark.
+
+Runs the same --members ensemble on a --size x --size raster with 1, 2,
+4, ... up to all cores and reports wall time, speedup and scaling
+efficiency (T1 / (workers * Tn)). Pools are warmed up before timing.
+
+Usage: python benchmarks/bench_spread_ensemble.py [--size 1024 --members 32 --workers 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from spread_ensemble import SpreadEnsemble
+from spread_grid import TerrainRasters
+
+CELL_DEG = 0.0003  # ~33 m
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--members", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--horizon", type=float, default=6.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.size
+    terrain = TerrainRasters(
+        (-120.0, 38.0, -120.0 + n * CELL_DEG, 38.0 + n * CELL_DEG), CELL_DEG,
+        rng.uniform(0.5, 1.5, (n, n)).astype(np.float32),
+        slope=rng.uniform(0, 15, (n, n)).astype(np.float32),
+        aspect=rng.uniform(0, 360, (n, n)).astype(np.float32),
+    )
+    ignition = [(38.0 + n * CELL_DEG / 2, -120.0 + n * CELL_DEG / 2)]
+
+    counts = []
+    workers = 1
+    while workers < args.workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(args.workers)
+
+    print(f"{n}x{n} raster, {args.members} members, horizon {args.horizon:g} h, {os.cpu_count()} cores")
+    print(f"{'workers':>7s} {'seconds':>8s} {'speedup':>8s} {'efficiency':>10s}")
+    base = None
+    for workers in counts:
+        ensemble = SpreadEnsemble(terrain, max_workers=workers, cycles=1, seed=1)
+        try:
+            ensemble.forecast(ignition, 20.0, 45.0, members=workers, horizon_hours=0.5).result()  # warm-up
+            start = time.perf_counter()
+            result = ensemble.forecast(ignition, 20.0, 45.0, members=args.members,
+                                       horizon_hours=args.horizon).result()
+            elapsed = time.perf_counter() - start
+        finally:
+            ensemble.shutdown()
+        base = base or elapsed
+        print(f"{workers:7d} {elapsed:8.2f} {base / elapsed:8.2f} {base / (workers * elapsed):10.0%}")
+
+    areas = [f["properties"]["area_km2"] for f in result.fronts()["features"] if f["properties"]["hours"] == 6]
+    print("6 h front areas (km2) at P10/P50/P90 levels:", areas)
+
+
+if __name__ == "__main__":
+    main()
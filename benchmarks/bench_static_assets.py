@@ -0,0 +1,92 @@
+"""
+Dashboard first-load vs. repeat-load: old static folder vs. the asset pipeline.
+
+A "load" fetches index.html, then every asset the page pulls in (style.css,
+bootstrap.js, the globe scripts and the map icon), the way a browser with
+Accept-Encoding: gzip, br would. Four scenarios are reported, as bytes on
+the wire and p50/p95 latency per page load:
+- old first load: send_from_directory, no compression;
+- old repeat load: If-None-Match, which is what browsers send back to
+  send_from_directory's weak-validator ETags;
+- new first load: precompressed bodies;
+- new repeat load: fingerprinted assets come from the browser cache (no
+  request at all) and only index.html is revalidated (304).
+
+Usage: python benchmarks/bench_static_assets.py [--loads 500]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import app as backend_app
+
+HEADERS = {"Accept-Encoding": "gzip, deflate, br"}
+OLD_URLS = ["/index.html", "/style.css", "/scripts/bootstrap.js", "/scripts/globe.js", "/scripts/globe.layers.js",
+            "/scripts/globe.controls.js", "/scripts/globe.switcher.js", "/scripts/globe.weather.js",
+            "/scripts/globe.coords.js", "/scripts/extensions.js", "/map icon.png"]
+
+
+def page_load(client, urls, etags=None):
+    """Fetch urls in order; returns (seconds, bytes on the wire, etags seen)."""
+    sent = 0
+    seen = {}
+    start = time.perf_counter()
+    for url in urls:
+        headers = dict(HEADERS)
+        if etags and url in etags:
+            headers["If-None-Match"] = etags[url]
+        resp = client.get(url, headers=headers)
+        assert resp.status_code in (200, 304), (url, resp.status_code)
+        sent += len(resp.data)
+        if "ETag" in resp.headers:
+            seen[url] = resp.headers["ETag"]
+    return time.perf_counter() - start, sent, seen
+
+
+def run(client, urls, loads, etags=None):
+    times = []
+    for _ in range(loads):
+        seconds, sent, seen = page_load(client, urls, etags)
+        times.append(seconds)
+    ms = np.array(times) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 95), sent, seen
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loads", type=int, default=500)
+    args = parser.parse_args()
+
+    assets = backend_app.assets
+    new_urls = ["/index.html"] + [assets.url(p).replace("%20", " ") for p in
+                                  ("style.css", "scripts/bootstrap.js", "scripts/globe.js", "scripts/globe.layers.js",
+                                   "scripts/globe.controls.js", "scripts/globe.switcher.js", "scripts/globe.weather.js",
+                                   "scripts/globe.coords.js", "scripts/extensions.js", "map icon.png")]
+
+    legacy = Flask("legacy", static_folder=backend_app.BASE_DIR, static_url_path="").test_client()
+    client = backend_app.app.test_client()
+
+    old_first = run(legacy, OLD_URLS, args.loads)
+    old_repeat = run(legacy, OLD_URLS, args.loads, etags=old_first[3])
+    new_first = run(client, new_urls, args.loads)
+    new_repeat = run(client, new_urls[:1], args.loads, etags=new_first[3])
+
+    encodings = sorted({enc for asset in assets.assets.values() for enc in asset.bodies} - {"identity"})
+    print(f"{len(OLD_URLS)} files per page load, {args.loads} loads, precompressed: {', '.join(encodings)}")
+    print(f"{'scenario':<22s} {'p50 ms':>8s} {'p95 ms':>8s} {'KB sent':>9s}")
+    for label, (p50, p95, sent, _) in (("old first load", old_first), ("old repeat load", old_repeat),
+                                       ("new first load", new_first), ("new repeat load", new_repeat)):
+        print(f"{label:<22s} {p50:8.3f} {p95:8.3f} {sent / 1e3:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Baseline store: ingest and vectorized lookup rate on a 375 m grid.
+
+Usage: python benchmarks/bench_thermal_baseline.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from thermal_baseline import ThermalBaselineStore
+from sat_filter import SatelliteFilter
+
+BBOX = (76.0, 10.0, 80.0, 14.0)  # ~1200x1200 VIIRS cells
+
+
+def main():
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ThermalBaselineStore(os.path.join(tmp, "store"), BBOX)
+        n = 1_000_000
+        lat = rng.uniform(BBOX[1], BBOX[3], n)
+        lon = rng.uniform(BBOX[0], BBOX[2], n)
+        bright = rng.normal(300, 3, n)
+        days = rng.integers(20000, 20030, n)
+
+        start = time.perf_counter()
+        store.ingest(lat, lon, bright, days)
+        store.flush()
+        t_ingest = time.perf_counter() - start
+        print(f"ingest: {n / t_ingest:,.0f} obs/s into {store.n_lat}x{store.n_lon} grid")
+
+        for batch in (1_000, 100_000, 1_000_000):
+            start = time.perf_counter()
+            store.lookup(lat[:batch], lon[:batch])
+            t = time.perf_counter() - start
+            print(f"lookup batch={batch:>9}: {batch / t:,.0f} hotspots/s")
+
+        sf = SatelliteFilter(store)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.analyze_batch(lat, lon, bright + 25)
+        t = time.perf_counter() - start
+        print(f"analyze_batch with store: {n / t:,.0f} hotspots/s")
+
+
+if __name__ == "__main__":
+    main()
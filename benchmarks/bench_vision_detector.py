@@ -0,0 +1,75 @@
+"""
+VisionDetector per-source state: update throughput and query latency.
+
+--threads writers post detections for --sources cameras (each writer owns
+a slice of them) with printing sent to /dev/null; then detect_fire(source)
+and detect_near(radius) are timed against the populated detector.
+
+Usage: python benchmarks/bench_vision_detector.py [--sources 1000 --threads 8 --updates 200000]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from vision_detector import VisionDetector
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(37.0, 39.0, args.sources).tolist()
+    lons = rng.uniform(-121.0, -119.0, args.sources).tolist()
+    conf = rng.uniform(0.3, 1.0, args.updates).tolist()
+    vision = VisionDetector()
+
+    def writer(t):
+        mine = range(t, args.sources, args.threads)
+        per_thread = args.updates // args.threads
+        for i in range(per_thread):
+            s = mine[i % len(mine)]
+            vision.update_detection(conf[i], None, lat=lats[s], lon=lons[s], source=f"cam-{s}")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(args.threads)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        updates = time.perf_counter() - start
+
+    names = [f"cam-{s}" for s in rng.integers(0, args.sources, args.queries).tolist()]
+    start = time.perf_counter()
+    for name in names:
+        vision.detect_fire(source=name)
+    detect = time.perf_counter() - start
+
+    points = rng.integers(0, args.sources, args.queries // 10).tolist()
+    start = time.perf_counter()
+    found = 0
+    for s in points:
+        found += vision.detect_near(lats[s], lons[s], radius_km=5.0) is not None
+    near = time.perf_counter() - start
+
+    total = args.updates // args.threads * args.threads
+    print(f"{args.sources:,} sources, {args.threads} writer threads")
+    print(f"update_detection: {total / updates:10,.0f} updates/s")
+    print(f"detect_fire:      {detect * 1e6 / len(names):10.2f} us per call")
+    print(f"detect_near 5 km: {near * 1e6 / len(points):10.2f} us per call ({found}/{len(points)} found)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+WindFieldService throughput: batched bilinear sampling vs. one lookup per fire.
+
+Samples --points fire locations spread over a fire-season region (cold
+cache, then warm) and compares with calling sample_point() per fire. The
+provider is the offline stub, so the numbers are cache + interpolation cost.
+
+Usage: python benchmarks/bench_wind_field.py [--points 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from wind_field import StubWindProvider, WindFieldService
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(30, 50, args.points)
+    lons = rng.uniform(-125, -100, args.points)
+    field = WindFieldService(StubWindProvider(20.0, 45.0))
+
+    start = time.perf_counter()
+    field.sample(lats, lons)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    field.sample(lats, lons)
+    warm = time.perf_counter() - start
+
+    sample = min(args.points, 5000)
+    start = time.perf_counter()
+    for lat, lon in zip(lats[:sample].tolist(), lons[:sample].tolist()):
+        field.sample_point(lat, lon)
+    scalar = (time.perf_counter() - start) / sample * args.points
+
+    stats = field.stats()
+    print(f"{args.points:,} points, {stats['upstream_fetches']} tile fetches")
+    print(f"sample (cold):        {cold * 1000:9.1f} ms")
+    print(f"sample (warm):        {warm * 1000:9.1f} ms")
+    print(f"sample_point per fire:{scalar * 1000:9.1f} ms (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
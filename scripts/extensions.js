@@ -14,8 +14,6 @@
 
     // Fetch fire data from FIRMS API
     async function fetchFireData() {
-        const apiKey = CONFIG.FIRMS_MAP_KEY;
-        
         // Get current map bounds to fetch only visible area (more efficient)
         const bounds = map.getBounds();
         const west = bounds.getWest().toFixed(2);
@@ -23,93 +21,24 @@
         const east = bounds.getEast().toFixed(2);
         const north = bounds.getNorth().toFixed(2);
         
-        // FIRMS API endpoints for different satellites
-        const sources = [
-            { id: 'VIIRS_SNPP_NRT', name: 'VIIRS SNPP' },
-            { id: 'VIIRS_NOAA20_NRT', name: 'VIIRS NOAA-20' }
-        ];
-        
-        let allFeatures = [];
-        
-        for (const source of sources) {
-            try {
-                // Use area endpoint with bounding box
-                const url = `https://firms.modaps.eosdis.nasa.gov/api/area/csv/${apiKey}/${source.id}/${west},${south},${east},${north}/1`;
-                
-                console.log(`Fetching ${source.name}...`);
-                
-                const response = await fetch(url);
-                
-                if (!response.ok) {
-                    console.warn(`${source.name}: ${response.status}`);
-                    continue;
-                }
-                
-                const text = await response.text();
-                
-                // Check if it's valid CSV
-                if (text.includes('<!DOCTYPE') || text.includes('<html') || text.length < 50) {
-                    console.warn(`${source.name}: Invalid response`);
-                    continue;
-                }
-                
-                const features = csvToGeoJSON(text, source.name);
-                allFeatures = allFeatures.concat(features);
-                
-                console.log(`${source.name}: ${features.length} records`);
-                
-            } catch (err) {
-                console.error(`${source.name}:`, err.message);
+        // The backend fetches VIIRS SNPP + NOAA-20 concurrently and caches
+        // parsed tiles, so every viewer shares one upstream FIRMS request
+        try {
+            const response = await fetch(`/api/firms?bbox=${west},${south},${east},${north}&days=1`);
+            
+            if (!response.ok) {
+                console.warn(`FIRMS: ${response.status}`);
+                return { type: 'FeatureCollection', features: [] };
             }
-        }
-        
-        return {
-            type: 'FeatureCollection',
-            features: allFeatures
-        };
-    }
-
-    // Convert CSV to GeoJSON
-    function csvToGeoJSON(csv, source) {
-        const lines = csv.trim().split('\n');
-        if (lines.length < 2) return [];
-        
-        const headers = lines[0].toLowerCase().split(',');
-        const latIdx = headers.indexOf('latitude');
-        const lonIdx = headers.indexOf('longitude');
-        const frpIdx = headers.indexOf('frp');
-        const confIdx = headers.indexOf('confidence');
-        const dateIdx = headers.indexOf('acq_date');
-        const timeIdx = headers.indexOf('acq_time');
-        const brightIdx = headers.findIndex(h => h.includes('bright'));
-        
-        const features = [];
-        
-        for (let i = 1; i < lines.length; i++) {
-            const cols = lines[i].split(',');
-            const lat = parseFloat(cols[latIdx]);
-            const lon = parseFloat(cols[lonIdx]);
             
-            if (isNaN(lat) || isNaN(lon)) continue;
+            const geojson = await response.json();
+            console.log(`FIRMS: ${geojson.features.length} records`);
+            return geojson;
             
-            features.push({
-                type: 'Feature',
-                geometry: {
-                    type: 'Point',
-                    coordinates: [lon, lat]
-                },
-                properties: {
-                    frp: parseFloat(cols[frpIdx]) || 10,
-                    confidence: cols[confIdx] || 'nominal',
-                    date: cols[dateIdx] || '',
-                    time: cols[timeIdx] || '',
-                    brightness: parseFloat(cols[brightIdx]) || 300,
-                    source: source
-                }
-            });
+        } catch (err) {
+            console.error('FIRMS:', err.message);
+            return { type: 'FeatureCollection', features: [] };
         }
-        
-        return features;
     }
 
     // Add fire layer to map
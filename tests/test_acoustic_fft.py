@@ -0,0 +1,98 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from acoustic_fft import AcousticFFT
+
+RATE = 16000
+
+
+def tone(freq, seconds=1.0, amplitude=0.5):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+class TestAcousticFFT(unittest.TestCase):
+
+    def test_fire_band_tone_beats_wind_rumble(self):
+        fire = AcousticFFT().analyze_audio(tone(120))
+        wind = AcousticFFT().analyze_audio(tone(20))
+        self.assertGreater(fire["fire_band_energy"], wind["fire_band_energy"])
+        self.assertGreater(fire["confidence"], 0.5)
+        self.assertEqual(wind["confidence"], 0.0)
+
+    def test_int16_bytes_match_float_input(self):
+        samples = tone(120)
+        pcm = (samples * 32767).astype("<i2").tobytes()
+        a = AcousticFFT().analyze_audio(samples)
+        b = AcousticFFT().analyze_audio(pcm)
+        self.assertAlmostEqual(a["fire_band_energy"], b["fire_band_energy"], delta=0.05)
+
+    def test_multichannel_batch(self):
+        channels = np.stack([tone(120), tone(20), np.zeros(RATE, dtype=np.float32)])
+        result = AcousticFFT().analyze_channels(channels)
+        self.assertEqual(result["confidence"].shape, (3,))
+        self.assertEqual(int(np.argmax(result["fire_band_energy"])), 0)
+        self.assertEqual(result["fire_band_energy"][2], 0.0)
+
+    def test_stream_carries_overlap_between_chunks(self):
+        signal = tone(150, seconds=2.0)
+        module = AcousticFFT()
+        chunks = (signal[i:i + 1600] for i in range(0, len(signal), 1600))
+        results = list(module.stream(chunks))
+        self.assertEqual(len(results), 20)
+        one_shot = AcousticFFT().analyze_channels(signal)
+        # Steady tone: every streamed chunk after warm-up sees the same band energy
+        for r in results[2:]:
+            self.assertAlmostEqual(float(r["fire_band_energy"][0]), float(one_shot["fire_band_energy"][0]), delta=0.5)
+
+    def test_sub_hop_chunks_add_up_to_frames(self):
+        signal = tone(150, seconds=2.0)
+        one_shot = AcousticFFT().analyze_channels(signal)
+        module = AcousticFFT()
+        results = list(module.stream(signal[i:i + 256] for i in range(0, len(signal), 256)))
+        energies = [float(r["fire_band_energy"][0]) for r in results if r["fire_band_energy"][0] > 0]
+        # Every second 256-sample chunk completes a 512-sample hop
+        self.assertEqual(len(energies), len(results) // 2)
+        for energy in energies[2:]:
+            self.assertAlmostEqual(energy, float(one_shot["fire_band_energy"][0]), delta=0.5)
+
+        # Same frames as hop-sized chunks
+        hops = list(AcousticFFT().stream(signal[i:i + 512] for i in range(0, len(signal), 512)))
+        np.testing.assert_allclose(energies, [float(r["fire_band_energy"][0]) for r in hops if r["fire_band_energy"][0] > 0], atol=1e-6)
+
+    def test_stream_buffer_allocated_once(self):
+        signal = tone(150, seconds=2.0)
+        module = AcousticFFT(max_chunk=2000)
+        sizes = [700, 256, 1999, 13, 1500, 900]
+        chunks, start = [], 0
+        for size in sizes * 3:
+            chunks.append(signal[start:start + size])
+            start += size
+        buffers = set()
+        for chunk in chunks:
+            module.band_energies(chunk)
+            buffers.add(id(module._buffer))
+        self.assertEqual(len(buffers), 1)
+        # A chunk above max_chunk grows the buffer and keeps the carried samples
+        grown = module.band_energies(signal[:5000])
+        self.assertGreaterEqual(module._buffer.shape[1], 1024 + 5000)
+        roomy = AcousticFFT()  # 1 s buffer: never grows here
+        for chunk in chunks:
+            roomy.band_energies(chunk)
+        np.testing.assert_allclose(grown, roomy.band_energies(signal[:5000]))
+
+    def test_simulation_without_chunk(self):
+        module = AcousticFFT()
+        result = module.analyze_audio(simulate_fire_intensity=0.9)
+        self.assertEqual(set(result), {"fire_band_energy", "wind_energy", "ratio", "confidence"})
+        self.assertEqual(module.last_energy, 55.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from alert_uploader import AlertUploader
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ""
+
+    def json(self):
+        return {"status": "accepted"}
+
+
+class FlakySession:
+    """Fails the first `failures` posts with a connection error, then accepts."""
+
+    def __init__(self, failures=0, status_code=200):
+        self.failures = failures
+        self.status_code = status_code
+        self.posts = []
+        self.lock = threading.Lock()
+
+    def post(self, url, data=None, files=None, timeout=None):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise requests.ConnectionError("backend down")
+            self.posts.append((data, files["image"][1]))
+        return FakeResponse(self.status_code)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestAlertUploader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_retries_with_backoff_then_delivers_multipart(self):
+        session = FlakySession(failures=2)
+        uploader = AlertUploader("http://backend/api/vision-trigger", self.spool, session=session,
+                                 backoff_base=0.01).start()
+        uploader.submit({"confidence": 0.9, "lat": 10.0}, b"\xff\xd8jpeg")
+
+        self.assertTrue(wait_for(lambda: uploader.sent == 1))
+        uploader.stop()
+        self.assertEqual(uploader.failed_attempts, 2)
+        data, jpeg = session.posts[0]
+        self.assertEqual(data, {"confidence": "0.9", "lat": "10.0"})
+        self.assertEqual(jpeg, b"\xff\xd8jpeg")
+        self.assertEqual(uploader.pending_count(), 0)
+
+    def test_spool_survives_restart_and_is_capped(self):
+        offline = AlertUploader("http://backend", self.spool, max_queue=3, session=FlakySession(failures=10**6))
+        for i in range(5):
+            offline.submit({"n": i}, b"jpeg")
+        self.assertEqual(offline.pending_count(), 3)
+        self.assertEqual(offline.dropped, 2)
+
+        # A fresh process picks up what the previous one could not deliver
+        session = FlakySession()
+        restarted = AlertUploader("http://backend", self.spool, session=session).start()
+        self.assertTrue(wait_for(lambda: restarted.sent == 3))
+        restarted.stop()
+        self.assertEqual([d["n"] for d, _ in session.posts], ["2", "3", "4"])
+
+    def test_client_errors_are_not_retried(self):
+        session = FlakySession(status_code=400)
+        uploader = AlertUploader("http://backend", self.spool, session=session).start()
+        uploader.submit({"confidence": "bad"}, b"jpeg")
+        self.assertTrue(wait_for(lambda: uploader.rejected == 1))
+        uploader.stop()
+        self.assertEqual(len(session.posts), 1)
+
+    def test_unreadable_entries_quarantined_and_orphans_swept(self):
+        offline = AlertUploader("http://backend", self.spool)
+        first = offline.submit({"n": 0}, b"jpeg")
+        corrupt = offline.submit({"n": 1}, b"jpeg")
+        headless = offline.submit({"n": 2}, b"jpeg")
+        last = offline.submit({"n": 3}, b"jpeg")
+        with open(os.path.join(self.spool, corrupt + ".json"), "w") as f:
+            f.write("{not json")
+        os.remove(os.path.join(self.spool, headless + ".jpg"))
+        # Crash leftovers: a JPEG whose metadata was never written, a half-written .json
+        for name in ("00000000000000000000_000001.jpg", "00000000000000000000_000002.json.tmp"):
+            with open(os.path.join(self.spool, name), "wb") as f:
+                f.write(b"x")
+
+        session = FlakySession()
+        uploader = AlertUploader("http://backend", self.spool, session=session).start()
+        self.assertTrue(wait_for(lambda: uploader.sent == 2))
+        uploader.stop()
+        self.assertEqual([d["n"] for d, _ in session.posts], ["0", "3"])
+        self.assertEqual(uploader.quarantined, 2)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.spool, "quarantine"))),
+                         sorted([corrupt + ".json", corrupt + ".jpg", headless + ".json"]))
+        self.assertEqual(os.listdir(self.spool), ["quarantine"])
+        self.assertNotIn(first, os.listdir(self.spool))
+        self.assertNotIn(last, os.listdir(self.spool))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from chemical_ratio import ChemicalRatio, GasBaseline
+
+
+class TestChemicalRatio(unittest.TestCase):
+
+    def test_real_readings_match_batch_rules(self):
+        module = ChemicalRatio()
+        readings = [(100.0, 700.0, 10.0), (30.0, 420.0, 80.0), (60.0, 500.0, 40.0), (2.0, 410.0, 5.0)]
+        co, co2, nox = (np.array(col) for col in zip(*readings))
+        batch = module.analyze_batch(co, co2, nox)
+        for i, (c, c2, n) in enumerate(readings):
+            scalar = module.analyze_gas({"co": c, "co2": c2, "nox": n})
+            self.assertEqual(scalar["co_ppm"], c)
+            self.assertEqual(scalar["confidence"], float(batch["confidence"][i]))
+        np.testing.assert_allclose(batch["confidence"], [0.9, 0.0, 0.18, 0.0])
+
+    def test_baseline_flags_rise_above_sensor_history(self):
+        rng = np.random.default_rng(1)
+        module = ChemicalRatio(baseline_warmup=10)
+        sensors = np.repeat([0, 1], 50)
+        co = rng.normal(3.0, 0.5, 100)
+        # Sensor 1's last reading jumps to 40 ppm: below the absolute 50 ppm rule
+        co[-1] = 40.0
+        co2 = np.full(100, 420.0)
+        nox = np.full(100, 1.0)
+        result = module.analyze_batch(co, co2, nox, sensors=sensors)
+        self.assertTrue(result["co_rise"][-1])
+        self.assertEqual(int(result["co_rise"].sum()), 1)
+        self.assertTrue(np.isnan(result["co_zscore"][0]))
+        self.assertGreater(result["confidence"][-1], result["confidence"][-2])
+
+    def test_repeated_sensors_update_in_order(self):
+        values = np.array([1.0, 2.0, 10.0, 3.0, 4.0])
+        sensors = np.array([0, 0, 1, 0, 0])
+        batched = GasBaseline(alpha=0.5, warmup=1)
+        batched.update(sensors, values)
+        sequential = GasBaseline(alpha=0.5, warmup=1)
+        for s, v in zip(sensors, values):
+            sequential.update([s], [v])
+        np.testing.assert_allclose(batched.mean[:2], sequential.mean[:2])
+        np.testing.assert_allclose(batched.var[:2], sequential.var[:2])
+        self.assertEqual(list(batched.count[:2]), [4, 1])
+
+    def test_stream_of_records_uses_timestamps(self):
+        module = ChemicalRatio()
+        records = [(i % 3, 1000.0 + i, 2.0, 420.0, 1.0) for i in range(10)]
+        chunks = list(module.stream(iter(records), chunk_size=4))
+        self.assertEqual([len(chunk) for chunk, _ in chunks], [4, 4, 2])
+        self.assertEqual(list(module.baseline.count[:3]), [4, 3, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
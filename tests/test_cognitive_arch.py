@@ -4,6 +4,8 @@ import os
 import unittest
 import json
 
+import numpy as np
+
 # Add backend to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
 
@@ -11,6 +13,8 @@ from sat_filter import sat_filter
 from handshake import handshake
 from fusion_voting import fusion_engine
 from fire_spread import fire_spread
+from spatial_index import haversine_km
+from sat_filter import SatelliteFilter
 
 class TestCognitiveArchitecture(unittest.TestCase):
     
@@ -30,6 +34,25 @@ class TestCognitiveArchitecture(unittest.TestCase):
         result_cold = sat_filter.analyze_temporal_persistence(hotspot_cold)
         self.assertFalse(result_cold['verified'])
 
+    def test_level1_batch_matches_scalar(self):
+        """Level 1: Batch API applies the same thresholds as the scalar path"""
+        sf = SatelliteFilter()
+        sf.get_historic_baseline = lambda lat, lon: 300.0
+        lats = [10.0, 10.0, 10.0, 0.0, 12.5]
+        lons = [20.0, 20.0, 20.0, 20.0, 21.0]
+        temps = [350.0, 310.0, 400.0, 350.0, 320.5]
+
+        batch = sf.analyze_batch(lats, lons, temps, baseline=300.0)
+        for i, (lat, lon, temp) in enumerate(zip(lats, lons, temps)):
+            scalar = sf.analyze_temporal_persistence({"latitude": lat, "longitude": lon, "brightness": temp})
+            self.assertEqual(bool(batch['verified'][i]), scalar['verified'])
+            self.assertAlmostEqual(float(batch['confidence'][i]), scalar['confidence'])
+
+        csv_text = "latitude,longitude,bright_ti4,acq_date,confidence\n10.0,20.0,350.0,2026-01-01,n\n10.0,20.0,310.0,2026-01-01,l\n"
+        from_csv = sf.analyze_firms_csv(csv_text.encode(), baseline=300.0)
+        self.assertEqual(from_csv['verified'].tolist(), [True, False])
+        self.assertAlmostEqual(float(from_csv['delta'][0]), 50.0)
+
     def test_level2_adaptive_handshake(self):
         """Level 2: Verify threshold adaptation"""
         # High confidence -> Low thresholds
@@ -60,6 +83,29 @@ class TestCognitiveArchitecture(unittest.TestCase):
         self.assertIn("SMOKE", trace['decision'])
         self.assertTrue(trace['triggered_sniffer'])
 
+    def test_level3_fuse_batch_matches_scalar(self):
+        """Level 3: Batch fusion rows equal fuse_data traces, reasoning built lazily"""
+        rows = [(0.0, 0.95, 0.95), (0.9, 0.1, 0.0), (0.95, 0.9, 0.9), (0.3, 0.2, 0.1), (0.55, 0.75, 0.65)]
+        v, a, c = (list(col) for col in zip(*rows))
+        batch = fusion_engine.fuse_batch(v, a, c)
+        self.assertEqual(len(batch._reasoning), 0)
+        self.assertEqual(list(batch.triggered_sniffer), [True, True, True, False, True])
+        self.assertEqual(batch.effective_score[1], 0.65)  # vision override
+        for i, (vc, ac, cc) in enumerate(rows):
+            trace = fusion_engine.fuse_data({"normalized_conf": vc}, {"confidence": ac}, {"confidence": cc})
+            self.assertEqual(batch[i], trace)
+        self.assertEqual(len(batch._reasoning), len(rows))
+
+    def test_level3_batch_decisions_follow_score(self):
+        """Level 3: fuse_batch and score() agree on a grid that hits every threshold"""
+        grid = np.round(np.arange(0.0, 1.0001, 0.05), 2)
+        v, a, c = (x.ravel() for x in np.meshgrid(grid, grid, grid, indexing="ij"))
+        batch = fusion_engine.fuse_batch(v, a, c)
+        for i in range(len(v)):
+            final_score, effective_score, code = fusion_engine.score(float(v[i]), float(a[i]), float(c[i]))
+            self.assertEqual((batch.final_score[i], batch.effective_score[i], batch.decision[i]),
+                             (final_score, effective_score, code))
+
     def test_level4_fire_spread(self):
         """Level 4: Verify spread cone calculation"""
         cone = fire_spread.calculate_spread_cone(10.0, 10.0, wind_speed_kmh=20.0, wind_bearing=0)
@@ -68,5 +114,38 @@ class TestCognitiveArchitecture(unittest.TestCase):
         self.assertGreater(cone['head']['lat'], cone['origin']['lat'])
         self.assertAlmostEqual(cone['head']['lon'], cone['origin']['lon'], delta=0.01)
 
+    def test_level4_fire_spread_batch_matches_scalar(self):
+        """Level 4: Vectorized cones equal the scalar call, polygons are geodesic"""
+        rng = np.random.default_rng(5)
+        lats, lons = rng.uniform(-60, 70, 50), rng.uniform(-180, 180, 50)
+        speeds, bearings = rng.uniform(0, 60, 50), rng.uniform(0, 360, 50)
+        cones = fire_spread.calculate_spread_cones(lats, lons, speeds, bearings, geojson=True)
+        for i in range(50):
+            cone = fire_spread.calculate_spread_cone(lats[i], lons[i], speeds[i], bearings[i])
+            self.assertAlmostEqual(cones["head_lat"][i], cone["head"]["lat"], places=12)
+            self.assertAlmostEqual(cones["head_lon"][i], cone["head"]["lon"], places=12)
+            self.assertAlmostEqual(cones["ros_kmh"][i], cone["ros_kmh"], places=12)
+            self.assertAlmostEqual(cones["area_risk_km2"][i], cone["area_risk_km2"], places=12)
+
+        features = cones["geojson"]["features"]
+        self.assertEqual(len(features), 50)
+        for i, feature in enumerate(features):
+            ring = feature["geometry"]["coordinates"][0]
+            self.assertEqual(ring[0], ring[-1])
+            head_lon, head_lat = ring[2]
+            distance = haversine_km(lats[i], lons[i], np.array([head_lat]), np.array([head_lon]))[0]
+            self.assertAlmostEqual(distance, cones["ros_kmh"][i], delta=1e-3)
+            # The head arrays and the polygon's head vertex are the same point
+            self.assertAlmostEqual(head_lat, cones["head_lat"][i], places=6)
+            self.assertAlmostEqual(head_lon, cones["head_lon"][i], places=6)
+
+        # East at 60N: a flat 111 km/deg offset undershoots longitude by half
+        east = fire_spread.calculate_spread_cones([60.0], [0.0], [50.0], [90.0], geojson=True)
+        head_lon = east["geojson"]["features"][0]["geometry"]["coordinates"][0][2][0]
+        self.assertAlmostEqual(head_lon, 5.0 / (111.195 * 0.5), delta=1e-3)
+        self.assertAlmostEqual(east["head_lon"][0], head_lon, places=6)
+        scalar = fire_spread.calculate_spread_cone(60.0, 0.0, 50.0, 90.0)
+        self.assertAlmostEqual(scalar["head"]["lon"], 5.0 / (111.195 * 0.5), delta=1e-3)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+import sys
+import os
+import contextlib
+import io
+import itertools
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from dispatch_scheduler import ASSIGNED, IDLE, DispatchScheduler, auction_assign
+from handshake import handshake
+
+
+class TestDispatchScheduler(unittest.TestCase):
+
+    def scheduler(self, drones):
+        s = DispatchScheduler(cruise_kmh=60.0, range_km=30.0, reserve=0.2, clock=lambda: 0.0)
+        s.add_drones([f"d{i}" for i in range(len(drones))], [d[0] for d in drones], [d[1] for d in drones])
+        return s
+
+    def test_auction_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for cols in [7] * 10 + [5] * 10:  # rectangular (single phase) and square (epsilon scaling)
+            cost = rng.uniform(0, 100, (5, cols))
+            columns = auction_assign(cost, eps=1e-4)
+            self.assertEqual(len(set(columns.tolist())), 5)
+            best = min(sum(cost[r, c] for r, c in enumerate(p)) for p in itertools.permutations(range(cols), 5))
+            self.assertLess(cost[np.arange(5), columns].sum() - best, 5 * 1e-4 + 1e-9)
+
+    def test_highest_priority_served_first(self):
+        s = self.scheduler([(10.0, 20.0)])
+        s.submit_incident(10.01, 20.0, score=0.6, ros_kmh=1.0, incident_id="low")
+        s.submit_incident(10.05, 20.0, score=0.9, ros_kmh=1.0, incident_id="high")
+        s.submit_incident(10.02, 20.0, score=0.6, ros_kmh=3.0, incident_id="fast")
+        self.assertEqual([m["incident_id"] for m in s.dispatch()], ["high"])
+        s.complete_mission(s.mission_for("high")["mission_id"])
+        self.assertEqual([m["incident_id"] for m in s.dispatch()], ["fast"])  # ROS breaks the score tie
+
+    def test_assignment_minimises_total_eta(self):
+        s = self.scheduler([(10.0, 20.0), (10.0, 20.1)])
+        s.submit_incident(10.0, 20.11, score=0.9, incident_id="east")
+        s.submit_incident(10.0, 19.99, score=0.8, incident_id="west")
+        drones = {m["incident_id"]: m["drone_id"] for m in s.dispatch()}
+        self.assertEqual(drones, {"east": "d1", "west": "d0"})
+
+    def test_low_battery_drone_not_sent_out_of_range(self):
+        s = self.scheduler([(10.0, 20.0)])
+        s.update_drone("d0", battery=0.5)  # (0.5 - 0.2) * 30 km = 9 km usable, 4.5 km out and back
+        s.submit_incident(10.0, 20.06, score=0.9, incident_id="far")  # ~6.6 km away
+        self.assertEqual(s.dispatch(), [])
+        self.assertEqual(s.stats()["waiting_incidents"], 1)
+
+        s.update_drone("d0", battery=1.0)
+        self.assertEqual([m["incident_id"] for m in s.dispatch()], ["far"])
+
+    def test_incremental_dispatch_leaves_missions_in_flight(self):
+        s = self.scheduler([(10.0, 20.0), (10.05, 20.05)])
+        s.submit_incident(10.0, 20.01, score=0.7, incident_id="a")
+        first = s.dispatch()
+        self.assertEqual(len(first), 1)
+        s.submit_incident(10.0, 20.0, score=0.99, incident_id="b")  # closer to the busy drone
+        second = s.dispatch()
+        self.assertEqual([(m["incident_id"], m["drone_id"]) for m in second], [("b", "d1")])
+        self.assertEqual(s.mission_for("a"), first[0])
+        self.assertTrue((s.state == ASSIGNED).all())
+
+        done = s.complete_mission(first[0]["mission_id"])
+        self.assertEqual(done["incident_id"], "a")
+        self.assertEqual(s.state[0], IDLE)
+        self.assertAlmostEqual(s.lat[0], 10.0)
+        self.assertLess(s.battery[0], 1.0)
+
+    def test_resubmitted_incident_queued_once(self):
+        s = self.scheduler([(10.0, 20.0), (10.0, 20.01)])
+        for score in (0.7, 0.8, 0.8):
+            s.submit_incident(10.0, 20.005, score=score, incident_id="same")
+        missions = s.dispatch()
+        self.assertEqual(len(missions), 1)
+        self.assertEqual(missions[0]["priority"], 0.8)
+        self.assertEqual(s.stats()["drones"]["idle"], 1)
+
+    def test_mission_ids_unique(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            configs = [handshake.calculate_drone_config(0.9) for _ in range(50)]
+        self.assertEqual(len({c["mission_id"] for c in configs}), 50)
+
+        s = self.scheduler([(10.0, 20.0 + i * 0.01) for i in range(50)])
+        for i in range(50):
+            s.submit_incident(10.0, 20.0 + i * 0.01, score=0.9, config=configs[0])  # same config every time
+        missions = s.dispatch()
+        self.assertEqual(len(missions), 50)
+        self.assertEqual(len({m["mission_id"] for m in missions}), 50)
+        self.assertIn(configs[0]["mission_id"], {m["mission_id"] for m in missions})
+
+    def test_close_incident_releases_drone(self):
+        s = self.scheduler([(10.0, 20.0)])
+        s.submit_incident(10.0, 20.01, score=0.9, incident_id="a")
+        s.dispatch()
+        self.assertTrue(s.close_incident("a"))
+        self.assertEqual(s.state[0], IDLE)
+        self.assertEqual(s.stats()["open_missions"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+import base64
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import app as backend_app
+from event_stream import EventBroadcaster
+from pipeline import CognitivePipeline
+
+
+def parse_frames(text):
+    """SSE text -> list of (event, data) tuples."""
+    frames = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            frames.append((fields["event"], json.loads(fields["data"])))
+    return frames
+
+
+class TestEventBroadcaster(unittest.TestCase):
+
+    def test_slow_client_gets_latest_status_and_bounded_alerts(self):
+        events = EventBroadcaster(max_backlog=3, coalesce_window=0)
+        sub = events.subscribe()
+        for i in range(10):
+            events.publish("status", {"version": i}, key=i)
+            events.publish("alert", {"n": i}, coalesce=False)
+
+        frames = parse_frames("".join(sub.drain()))
+        self.assertEqual([d["n"] for e, d in frames if e == "alert"], [7, 8, 9])
+        self.assertEqual([d["version"] for e, d in frames if e == "status"], [9])
+        self.assertEqual(sub.dropped, 7)
+
+    def test_unchanged_state_is_not_rebroadcast(self):
+        events = EventBroadcaster(coalesce_window=0)
+        self.assertTrue(events.publish("status", {"score": 0.5}, key=("SAFE", 0.5)))
+        self.assertFalse(events.publish("status", {"score": 0.5}, key=("SAFE", 0.5)))
+        self.assertEqual(events.stats()["suppressed"], 1)
+
+        # Late joiners are primed with the current state
+        late = events.subscribe()
+        self.assertEqual(parse_frames("".join(late.drain())), [("status", {"score": 0.5})])
+
+    def patch_app(self, **attrs):
+        for name, value in attrs.items():
+            patcher = mock.patch.object(backend_app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_alerts_only_for_triggers_and_decision_changes(self):
+        events = EventBroadcaster(coalesce_window=0)
+        self.patch_app(events=events)
+        sub = events.subscribe()
+
+        def snapshot(decision, previous, triggered, image=None):
+            return {"decision": decision, "previous_decision": previous, "triggered_sniffer": triggered,
+                    "final_score": 0.5, "lat": 1.0, "lon": 2.0, "evidence_image": image, "updated_at": "t"}
+
+        for s in (snapshot("SAFE", "SAFE", False),
+                  snapshot("SAFE", "SAFE", False, "/a.jpg"),                  # new frame, still SAFE
+                  snapshot("CRITICAL FIRE", "SAFE", True, "/b.jpg"),
+                  snapshot("CRITICAL FIRE", "CRITICAL FIRE", True, "/b.jpg"),  # same alert again
+                  snapshot("CRITICAL FIRE", "CRITICAL FIRE", True, "/c.jpg"),
+                  snapshot("SAFE", "CRITICAL FIRE", False, "/c.jpg")):
+            backend_app.publish_snapshot(s)
+
+        alerts = [(d["decision"], d["evidence_image"]) for e, d in parse_frames("".join(sub.drain())) if e == "alert"]
+        self.assertEqual(alerts, [("CRITICAL FIRE", "/b.jpg"), ("CRITICAL FIRE", "/c.jpg"), ("SAFE", "/c.jpg")])
+
+    def test_endpoint_pushes_snapshot_after_ingest(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.patch_app(pipeline=CognitivePipeline(tmp.name),
+                       events=EventBroadcaster(coalesce_window=0, heartbeat_seconds=0.05))
+        backend_app.pipeline.listeners.append(backend_app.publish_snapshot)
+
+        resp = backend_app.app.test_client().get("/api/events")
+        self.assertEqual(resp.mimetype, "text/event-stream")
+        chunks = iter(resp.response)
+        next(chunks)  # retry hint
+        self.assertEqual(parse_frames(next(chunks).decode())[0][1]["version"], 0)
+
+        backend_app.pipeline.ingest({
+            "image": base64.b64encode(b"jpeg").decode(), "confidence": 0.9, "lat": 10.0, "lon": 20.0,
+        })
+        pushed = parse_frames(next(chunks).decode())
+        self.assertEqual({e for e, _ in pushed}, {"status", "alert"})
+        resp.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import sys
+import os
+import hashlib
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from evidence_store import EvidenceStore
+
+
+def frame(i, size=1000):
+    return bytes([i % 256]) * size
+
+
+def fake_resizer(data, max_side):
+    """Stands in for opencv: a variant is the first max_side bytes."""
+    return data[:max_side]
+
+
+class TestEvidenceStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.now = [1000.0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def store(self, **kwargs):
+        kwargs.setdefault("resizer", fake_resizer)
+        kwargs.setdefault("variants", {"thumb": 10, "preview": 100})
+        return EvidenceStore(self.tmp, clock=lambda: self.now[0], **kwargs)
+
+    def test_duplicates_stored_once_with_variants(self):
+        store = self.store()
+        digests = [store.put(frame(1)) for _ in range(5)]
+        store.join()
+        digest = hashlib.sha256(frame(1)).hexdigest()
+        self.assertEqual(set(digests), {digest})
+        stats = store.stats()
+        self.assertEqual((stats["stored"], stats["duplicates"], stats["bytes_deduplicated"]), (1, 4, 4000))
+        self.assertEqual(stats["total_bytes"], 1000 + 10 + 100)
+
+        shard = os.path.join(self.tmp, digest[:2])
+        self.assertEqual(sorted(os.listdir(shard)), [f"{digest}.jpg", f"{digest}.preview.jpg", f"{digest}.thumb.jpg"])
+        path, _ = store.open(digest, "thumb")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), frame(1)[:10])
+        self.assertEqual(store.url(digest, "thumb"), f"/api/evidence/{digest}.thumb.jpg")
+        self.assertEqual(store.open("../../etc/passwd"), (None, None))
+        self.assertEqual(store.open(digest, "huge"), (None, None))
+
+    def test_queued_frame_served_from_memory(self):
+        release = threading.Event()
+
+        def slow_resizer(data, max_side):
+            release.wait(5)
+            return data[:max_side]
+
+        store = self.store(resizer=slow_resizer, max_pending=1)
+        digest = store.put(frame(2))
+        self.assertEqual(store.open(digest), (None, frame(2)))
+        self.assertEqual(store.open(digest, "thumb"), (None, None))  # never the original as a thumbnail
+        self.assertIsNone(store.put(frame(3)))  # queue full: dropped, not blocking
+        self.assertEqual(store.put(frame(2)), digest)  # duplicate of a queued frame
+        release.set()
+        store.join()
+        path, data = store.open(digest)
+        self.assertIsNone(data)
+        self.assertTrue(path.endswith(f"{digest}.jpg"))
+        self.assertEqual(store.stats()["dropped"], 1)
+
+    def test_retention_by_size_evicts_least_recently_seen(self):
+        store = self.store(variants={}, max_bytes=3500)
+        digests = []
+        for i in range(3):
+            self.now[0] += 1
+            digests.append(store.put(frame(i)))
+            store.join()
+        self.now[0] += 1
+        store.put(frame(0))  # seen again: now the most recent
+        store.put(frame(3))
+        store.join()
+        self.assertIsNone(store.open(digests[1])[0])
+        self.assertIsNotNone(store.open(digests[0])[0])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, digests[1][:2], f"{digests[1]}.jpg")))
+        self.assertEqual(store.stats()["total_bytes"], 3000)
+
+    def test_retention_by_age_and_restart(self):
+        store = self.store(max_age_seconds=60)
+        old = store.put(frame(5))
+        store.join()
+        restarted = self.store(max_age_seconds=60)
+        self.assertEqual(restarted.stats()["entries"], 1)
+        self.assertIsNotNone(restarted.open(old)[0])
+
+        self.now[0] = os.path.getmtime(os.path.join(self.tmp, old[:2], f"{old}.jpg")) + 61
+        self.assertEqual(restarted.enforce_retention(), 1)
+        self.assertEqual(os.listdir(os.path.join(self.tmp, old[:2])), [])
+        self.assertEqual(restarted.stats()["total_bytes"], 0)
+
+    def test_delete_racing_put_keeps_files(self):
+        store = self.store(variants={})
+        digest = store.put(frame(4))
+        store.join()
+        with store._lock:
+            store.max_bytes = 0
+            self.assertEqual(store._expired(), [digest])
+            store.max_bytes = 10 ** 6
+        lock = store._digest_lock(digest)
+        lock.acquire()
+        deleter = threading.Thread(target=store._delete, args=(digest,))
+        deleter.start()
+        self.assertEqual(store.put(frame(4)), digest)  # stored again while the eviction is in flight
+        lock.release()
+        deleter.join()
+        store.join()
+        path, _ = store.open(digest)
+        self.assertTrue(os.path.exists(path))
+
+    def test_resizer_failure_keeps_original(self):
+        def broken(data, max_side):
+            raise ValueError("not a JPEG")
+
+        store = self.store(resizer=broken)
+        digest = store.put(frame(7))
+        store.join()
+        self.assertEqual(store.open(digest, "preview"), (None, None))
+        path, _ = store.open(digest)
+        self.assertTrue(path.endswith(f"{digest}.jpg"))
+        self.assertFalse([n for n in os.listdir(os.path.join(self.tmp, digest[:2])) if n.endswith(".tmp")])
+
+
+if __name__ == '__main__':
+    unittest.main()
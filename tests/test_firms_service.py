@@ -0,0 +1,187 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from firms_service import FirmsService, csv_to_features
+from tile_cache import TileCache
+
+CSV = (
+    "latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,confidence,frp\n"
+    "12.5,77.5,340.1,0.4,0.4,2026-01-01,0412,N,n,5.5\n"
+    "15.5,79.5,330.0,0.4,0.4,2026-01-01,0412,N,h,\n"
+)
+
+
+class FakeResponse:
+    status_code = 200
+    text = CSV
+
+
+class FakeSession:
+    """Counts upstream calls; sleeps so concurrent callers overlap."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return FakeResponse()
+
+
+class TestFirmsService(unittest.TestCase):
+
+    def test_csv_to_features_matches_browser_defaults(self):
+        features = csv_to_features(CSV, "VIIRS SNPP")
+        self.assertEqual(len(features), 2)
+        self.assertEqual(features[0]["geometry"]["coordinates"], [77.5, 12.5])
+        self.assertEqual(features[0]["properties"]["brightness"], 340.1)
+        self.assertEqual(features[1]["properties"]["frp"], 10)
+
+    def test_concurrent_viewers_share_one_fetch_per_tile(self):
+        session = FakeSession()
+        service = FirmsService("KEY", session=session)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get_features(76, 11, 79, 14)))
+                   for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # One 10-degree tile x two satellite sources
+        self.assertEqual(session.calls, 2)
+        # Only the hotspot inside the bbox, once per source
+        self.assertTrue(all(len(r["features"]) == 2 for r in results))
+
+    def test_world_view_is_one_cached_area_per_source(self):
+        session = FakeSession()
+        service = FirmsService("KEY", session=session)
+        for _ in range(3):
+            world = service.get_features(-180, -90, 180, 90)
+        self.assertEqual(session.calls, 2)
+        self.assertEqual(len(world["features"]), 4)
+        self.assertEqual(service.areas_for_bbox(-180, -90, 180, 90), [(0, 0, 36, 18)])
+        # Small views still share per-tile entries, and the world view did not evict them
+        service.get_features(76, 11, 79, 14)
+        service.get_features(76, 11, 79, 14)
+        self.assertEqual(session.calls, 4)
+        self.assertEqual(service.stats()["evictions"], 0)
+
+    def test_failed_area_is_reported_not_cached(self):
+        class DownResponse:
+            status_code = 503
+            text = ""
+
+        class HalfDownSession(FakeSession):
+            def get(self, url, timeout=None):
+                super().get(url, timeout)
+                return DownResponse() if "NOAA20" in url else FakeResponse()
+
+        import app as backend_app
+        client = backend_app.app.test_client()
+        with mock.patch.object(backend_app, "firms_service", FirmsService("KEY", session=HalfDownSession())):
+            resp = client.get("/api/firms?bbox=76,11,79,14")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.headers["Cache-Control"], "no-store")
+            self.assertEqual(len(resp.get_json()["features"]), 1)
+            self.assertEqual(len(resp.get_json()["errors"]), 1)
+            self.assertEqual(backend_app.firms_service.stats()["entries"], 1)
+
+        class DownSession(FakeSession):
+            def get(self, url, timeout=None):
+                super().get(url, timeout)
+                return DownResponse()
+
+        with mock.patch.object(backend_app, "firms_service", FirmsService("KEY", session=DownSession())):
+            self.assertEqual(client.get("/api/firms?bbox=76,11,79,14").status_code, 502)
+
+    def test_listeners_see_each_fetched_area_once(self):
+        service = FirmsService("KEY", session=FakeSession())
+        loaded = []
+        service.listeners.append(loaded.append)
+        for _ in range(3):
+            service.get_features(76, 11, 79, 14)
+        self.assertEqual(len(loaded), 2)  # one area x two sources, cache hits not re-announced
+
+    def test_failing_listener_does_not_fail_fetch(self):
+        service = FirmsService("KEY", session=FakeSession())
+        service.listeners.append(lambda features: 1 / 0)
+        with mock.patch("sys.stdout"):
+            collection = service.get_features(76, 11, 79, 14)
+        self.assertEqual(len(collection["features"]), 2)
+        self.assertNotIn("errors", collection)
+
+    def test_fetched_hotspots_feed_thermal_baseline_once(self):
+        import tempfile
+        from thermal_baseline import ThermalBaselineStore
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = ThermalBaselineStore(tmp.name, (70.0, 10.0, 80.0, 20.0), cell_deg=0.5)
+        now = [0.0]
+        service = FirmsService("KEY", session=FakeSession(), ttl_seconds=60)
+        service.cache.clock = lambda: now[0]
+        service.listeners.append(store.ingest_features)
+        service.get_features(76, 11, 79, 14)
+        now[0] = 120.0  # expired: the same rows are fetched again
+        service.get_features(76, 11, 79, 14)
+        self.assertEqual(service.session.calls, 4)
+        # VIIRS and MODIS rows count once each, not once per fetch
+        self.assertEqual(int(store.total_count.sum()), 4)
+        self.assertAlmostEqual(ThermalBaselineStore.open(tmp.name).lookup([12.5], [77.5])[0], 340.1, places=3)
+
+    def test_endpoint_indexes_hotspots_once_per_fetch(self):
+        import app as backend_app
+        from spatial_index import SpatialIndex
+        service = FirmsService("KEY", session=FakeSession())
+        service.listeners.append(backend_app.index_hotspots)
+        index = SpatialIndex()
+        client = backend_app.app.test_client()
+        with mock.patch.object(backend_app, "firms_service", service), \
+                mock.patch.object(backend_app, "spatial_index", index):
+            for _ in range(5):
+                client.get("/api/firms?bbox=76,11,79,14")
+        self.assertEqual(index.stats()["keys"], 4)  # 2 hotspots x 2 sources, loaded once
+        self.assertEqual(len(index), 4)
+        self.assertEqual(len(index.bbox(76, 11, 80, 16, layers=["hotspot"])), 4)
+
+    def test_tile_cache_ttl_and_lru(self):
+        now = [0.0]
+        cache = TileCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        loads = []
+        load = lambda key: cache.get_or_load(key, lambda: loads.append(key) or key)
+
+        load("a"); load("b"); load("a")
+        self.assertEqual(loads, ["a", "b"])
+        load("c")  # evicts "b" (least recently used)
+        load("b")
+        self.assertEqual(loads, ["a", "b", "c", "b"])
+
+        now[0] = 11.0
+        load("b")
+        self.assertEqual(loads[-1], "b")
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_endpoint_serves_geojson_without_leaking_key(self):
+        import app as backend_app
+        client = backend_app.app.test_client()
+        self.addCleanup(setattr, backend_app, "firms_service", backend_app.firms_service)
+        backend_app.firms_service = FirmsService("KEY", session=FakeSession())
+
+        resp = client.get("/api/firms?bbox=76,11,79,14")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()["type"], "FeatureCollection")
+        self.assertEqual(client.get("/api/firms?bbox=oops").status_code, 400)
+        self.assertNotIn("FIRMS_MAP_KEY", client.get("/config").get_json())
+
+
+if __name__ == '__main__':
+    unittest.main()
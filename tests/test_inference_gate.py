@@ -0,0 +1,79 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from inference_gate import InferenceScheduler
+
+
+def forest(seed=0):
+    rng = np.random.default_rng(seed)
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[..., 1] = 90 + rng.integers(0, 10, (240, 320))  # green canopy
+    frame[..., 0] = 40
+    frame[..., 2] = 50
+    return frame
+
+
+def with_flame(frame):
+    frame = frame.copy()
+    frame[100:140, 150:190] = (30, 140, 250)  # BGR orange
+    return frame
+
+
+class TestInferenceScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [0.0]
+        self.gate = InferenceScheduler(idle_interval=2.0, hot_hold=5.0, cpu_budget=0, clock=lambda: self.now[0])
+
+    def tick(self, frame, dt=0.1):
+        self.now[0] += dt
+        return self.gate.should_infer(frame)
+
+    def test_static_scene_drops_to_idle_rate(self):
+        scene = forest()
+        decisions = [self.tick(scene) for _ in range(50)]  # 5 s of video at 10 FPS
+        # First frame plus one idle check every 2 s
+        self.assertEqual(sum(decisions), 3)
+        self.assertEqual(self.gate.stats()["gated"], 47)
+
+    def test_motion_and_flame_colour_trigger_inference(self):
+        scene = forest()
+        self.tick(scene)
+        self.assertFalse(self.tick(scene))
+        self.assertTrue(self.tick(np.clip(scene.astype(int) + 40, 0, 255).astype(np.uint8)))
+        self.assertEqual(self.gate.reasons["motion"], 1)
+
+        flame_gate = InferenceScheduler(idle_interval=100, cpu_budget=0, clock=lambda: self.now[0])
+        flame_gate.should_infer(scene)
+        self.assertTrue(flame_gate.should_infer(with_flame(scene)))
+        self.assertEqual(flame_gate.reasons["flame"] + flame_gate.reasons["motion"], 1)
+
+    def test_recent_fire_switches_to_full_rate(self):
+        scene = forest()
+        self.tick(scene)
+        self.gate.report(fire_detected=True, infer_seconds=0.01)
+        self.assertTrue(all(self.tick(scene) for _ in range(40)))  # 4 s < hot_hold
+        self.now[0] += 5.0
+        self.assertEqual(self.gate.stats()["mode"], "IDLE")
+
+    def test_cpu_budget_limits_inference_rate(self):
+        gate = InferenceScheduler(cpu_budget=0.25, clock=lambda: self.now[0])
+        gate.should_infer(forest())
+        gate.report(fire_detected=True, infer_seconds=0.1)  # hot: wants every frame
+        decisions = []
+        for _ in range(40):
+            self.now[0] += 0.05
+            decisions.append(gate.should_infer(forest()))
+        # 0.1 s per inference at a 25% budget -> at most one every 0.4 s
+        self.assertLessEqual(sum(decisions), 5)
+        self.assertGreater(gate.budget_skips, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import geolocation
+from geolocation import resolve_location
+from model_loader import LazyModel, ModelLoadError
+
+
+class TestGeolocation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.tmp.name, "location.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_override_skips_network(self):
+        lookup = mock.Mock()
+        loc = resolve_location(12.0, 77.0, cache_path=self.cache, lookup=lookup)
+        self.assertEqual(loc.coords, (12.0, 77.0))
+        with mock.patch.dict(os.environ, {"FIRE_DRONE_LAT": "1.5", "FIRE_DRONE_LON": "2.5"}):
+            self.assertEqual(resolve_location(cache_path=self.cache, lookup=lookup).coords, (1.5, 2.5))
+        lookup.assert_not_called()
+
+    def test_background_lookup_refreshes_cache(self):
+        loc = resolve_location(cache_path=self.cache, lookup=lambda: (30.0, 70.0))
+        loc.refresh_thread.join()
+        self.assertEqual(loc.coords, (30.0, 70.0))
+
+        # Next start uses the last-known value immediately, even if the lookup fails
+        loc = resolve_location(cache_path=self.cache, lookup=lambda: None)
+        self.assertEqual((loc.coords, loc.source), ((30.0, 70.0), "cached"))
+        loc.refresh_thread.join()
+        self.assertEqual(loc.coords, (30.0, 70.0))
+
+    def test_no_cache_starts_with_default(self):
+        loc = resolve_location(cache_path=self.cache, lookup=lambda: None)
+        loc.refresh_thread.join()
+        self.assertEqual(loc.coords, geolocation.DEFAULT_COORDS)
+
+
+class TestLazyModel(unittest.TestCase):
+
+    def test_load_failure_raises_instead_of_exiting(self):
+        model = LazyModel("/nonexistent/model.pt", "Test Model")
+        self.assertFalse(model.loaded)
+        with self.assertRaises(ModelLoadError):
+            model.load()
+        # The failure is remembered, not retried on every frame
+        with self.assertRaises(ModelLoadError):
+            model(None)
+
+    def test_rejects_unknown_export_format(self):
+        with self.assertRaises(ValueError):
+            LazyModel("model.pt", "Test Model", export_format="tflite")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,325 @@
+import sys
+import os
+import base64
+import hashlib
+import io
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import app as backend_app
+from dispatch_scheduler import DispatchScheduler
+from evidence_store import EvidenceStore
+from pipeline import CognitivePipeline
+from sensor_fleet import SensorFleet
+from fusion_voting import fusion_engine
+from spatial_index import SpatialIndex
+from vision_detector import vision_model
+from wind_field import StubWindProvider, WindFieldService
+
+JPEG = b"\xff\xd8\xff\xe0fake-jpeg\xff\xd9"
+DIGEST = hashlib.sha256(JPEG).hexdigest()
+
+
+def alert(confidence=0.9):
+    return {
+        "image": base64.b64encode(JPEG).decode(),
+        "confidence": confidence,
+        "lat": 12.97,
+        "lon": 77.59,
+        "timestamp": "2026-01-01T00:00:00",
+        "person_count": 2,
+        "animal_count": 1,
+    }
+
+
+class TestCognitivePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = SpatialIndex()
+        self.dispatcher = DispatchScheduler()
+        self.pipeline = CognitivePipeline(self.tmp.name, index=self.index, dispatch=self.dispatcher)
+        for name, value in (("pipeline", self.pipeline), ("spatial_index", self.index), ("dispatcher", self.dispatcher)):
+            patcher = mock.patch.object(backend_app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = backend_app.app.test_client()
+
+    def tearDown(self):
+        self.pipeline.join()
+        self.tmp.cleanup()
+
+    def planned(self, payload):
+        """Ingest and wait for the Level 4 plan."""
+        self.pipeline.ingest(payload)
+        self.pipeline.join()
+        return self.pipeline.snapshot()
+
+    def test_vision_trigger_runs_chain_and_persists_evidence(self):
+        resp = self.client.post("/api/vision-trigger", json=alert())
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()
+        self.assertIn("Level 1 (Satellite)", data["levels_passed"])
+        self.assertEqual(data["saved_image"], f"/api/evidence/{DIGEST}.jpg")
+
+        self.pipeline.store.join()
+        with open(os.path.join(self.tmp.name, DIGEST[:2], f"{DIGEST}.jpg"), "rb") as f:
+            self.assertEqual(f.read(), JPEG)
+
+        self.pipeline.join()
+        status = self.client.get("/api/fusion-status").get_json()
+        self.assertEqual(status["version"], 2 if status["triggered_sniffer"] else 1)  # + the plan
+        self.assertFalse(status["planning"])
+        self.assertEqual(status["persons"], 2)
+        self.assertEqual(status["evidence_image"], data["saved_image"])
+
+    def test_vision_trigger_accepts_multipart_raw_jpeg(self):
+        form = {k: str(v) for k, v in alert().items() if k != "image"}
+        form["image"] = (io.BytesIO(JPEG), "alert.jpg", "image/jpeg")
+        resp = self.client.post("/api/vision-trigger", data=form, content_type="multipart/form-data")
+        self.assertEqual(resp.status_code, 200)
+
+        self.pipeline.store.join()
+        with open(os.path.join(self.tmp.name, DIGEST[:2], f"{DIGEST}.jpg"), "rb") as f:
+            self.assertEqual(f.read(), JPEG)
+
+    def test_status_poll_does_not_recompute_fusion(self):
+        self.client.post("/api/vision-trigger", json=alert())
+        with mock.patch.object(fusion_engine, "fuse_data") as fuse:
+            for _ in range(5):
+                self.client.get("/api/fusion-status")
+            fuse.assert_not_called()
+
+    def test_full_queue_drops_frame_without_blocking(self):
+        release = threading.Event()
+        store = EvidenceStore(os.path.join(self.tmp.name, "full"), max_pending=1,
+                              resizer=lambda data, max_side: release.wait(5) and None)
+        pipeline = CognitivePipeline(self.tmp.name, store=store, index=self.index, dispatch=self.dispatcher)
+        first = pipeline.ingest(alert())
+        self.assertEqual(first["evidence_image"], f"/api/evidence/{DIGEST}.jpg")
+
+        other = dict(alert(), image=base64.b64encode(b"\xff\xd8other\xff\xd9").decode())
+        snapshot = pipeline.ingest(other)
+        self.assertEqual(store.stats()["dropped"], 1)
+        # The dropped frame is not replaced by the previous alert's evidence
+        for field in ("evidence_image", "evidence_thumb", "evidence_preview"):
+            self.assertIsNone(snapshot[field], field)
+        # Alerts without a frame keep the last evidence shown (here: none)
+        no_frame = pipeline.ingest({k: v for k, v in alert().items() if k != "image"})
+        self.assertIsNone(no_frame["evidence_image"])
+        release.set()
+        store.join()
+        pipeline.join()
+
+    def test_burst_duplicates_stored_once_and_served_with_etag(self):
+        for _ in range(3):
+            snapshot = self.pipeline.ingest(alert())
+        self.pipeline.store.join()
+        stats = self.client.get("/api/evidence/stats").get_json()
+        self.assertEqual((stats["stored"], stats["duplicates"], stats["bytes_deduplicated"]), (1, 2, 2 * len(JPEG)))
+
+        resp = self.client.get(snapshot["evidence_image"])
+        self.assertEqual(resp.data, JPEG)
+        self.assertEqual(resp.headers["ETag"], f'"{DIGEST}"')
+        self.assertIn("immutable", resp.headers["Cache-Control"])
+        self.assertEqual(self.client.get(snapshot["evidence_image"], headers={"If-None-Match": f'"{DIGEST}"'}).status_code, 304)
+        partial = self.client.get(snapshot["evidence_image"], headers={"Range": "bytes=0-3"})
+        self.assertEqual((partial.status_code, partial.data), (206, JPEG[:4]))
+        # No opencv here (or an undecodable frame): the variant URL redirects, uncached, to the original
+        thumb = self.client.get(snapshot["evidence_thumb"])
+        self.assertEqual(thumb.status_code, 302)
+        self.assertTrue(thumb.headers["Location"].endswith(snapshot["evidence_image"]))
+        self.assertEqual(thumb.headers["Cache-Control"], "no-cache")
+        self.assertNotIn("ETag", thumb.headers)
+        self.assertEqual(self.client.get(snapshot["evidence_thumb"], follow_redirects=True).data, JPEG)
+        self.assertEqual(self.client.get(f"/api/evidence/{'0' * 64}.jpg").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/evidence/{DIGEST}.huge.jpg").status_code, 404)
+        for name in (f"{DIGEST}.thumbjpg", f"{DIGEST}jpg", f"{DIGEST}..jpg", f"{DIGEST.upper()}.jpg", f"{DIGEST}.thumb.jpg.jpg"):
+            self.assertEqual(self.client.get(f"/api/evidence/{name}").status_code, 404, name)
+
+    def test_thumbnail_immutable_only_once_written(self):
+        release = threading.Event()
+
+        def slow_resizer(data, max_side):
+            release.wait(5)
+            return data[:8]
+
+        self.pipeline.store = EvidenceStore(os.path.join(self.tmp.name, "slow"), resizer=slow_resizer)
+        snapshot = self.pipeline.ingest(alert())
+        queued = self.client.get(snapshot["evidence_thumb"])
+        self.assertEqual(queued.status_code, 302)
+        self.assertNotIn("immutable", queued.headers.get("Cache-Control", ""))
+
+        release.set()
+        self.pipeline.store.join()
+        written = self.client.get(snapshot["evidence_thumb"])
+        self.assertEqual((written.status_code, written.data), (200, JPEG[:8]))
+        self.assertEqual(written.headers["ETag"], f'"{DIGEST}.thumb"')
+        self.assertIn("immutable", written.headers["Cache-Control"])
+
+    def test_detections_and_alerts_queryable_by_location(self):
+        self.client.post("/api/vision-trigger", json=alert(confidence=0.95))
+        near = self.client.get("/api/spatial/radius?lat=12.97&lon=77.6&km=5").get_json()["results"]
+        layers = sorted(r["layer"] for r in near)
+        self.assertIn("detection", layers)
+        detection = next(r for r in near if r["layer"] == "detection")
+        self.assertEqual(detection["data"]["confidence"], 0.95)
+        self.assertIn("verified", detection["data"]["satellite"])
+
+        far = self.client.get("/api/spatial/radius?lat=40.0&lon=-3.7&km=5").get_json()["results"]
+        self.assertEqual(far, [])
+        nearest = self.client.get("/api/spatial/nearest?lat=40.0&lon=-3.7&k=1&layers=detection").get_json()
+        self.assertEqual(nearest["results"][0]["layer"], "detection")
+        box = self.client.get("/api/spatial/bbox?bbox=77,12,78,13&layers=detection").get_json()
+        self.assertEqual(len(box["results"]), 1)
+        self.assertEqual(self.client.get("/api/spatial/bbox?bbox=oops").status_code, 400)
+        for query in ("bbox?bbox=77,12,78,13&limit=-1", "bbox?bbox=77,12,78,13&limit=0",
+                      "radius?lat=12.97&lon=77.6&limit=-1", "nearest?lat=12.97&lon=77.6&k=-1"):
+            self.assertEqual(self.client.get(f"/api/spatial/{query}").status_code, 400, query)
+
+    def test_spread_and_sniffer_use_wind_field(self):
+        self.pipeline.wind = WindFieldService(StubWindProvider(30.0, 90.0))
+        snapshot = self.planned(alert(confidence=0.99))
+        cone = snapshot["spread_cone"]
+        self.assertAlmostEqual(cone["ros_kmh"], 3.0, places=3)
+        self.assertGreater(cone["head"]["lon"], cone["origin"]["lon"])
+        self.assertLess(snapshot["sniffer_path"][-1]["lon"], 77.59)  # source searched upwind (west)
+
+        explicit = self.planned(dict(alert(confidence=0.99), wind_speed_kmh=10, wind_bearing=0))
+        self.assertGreater(explicit["spread_cone"]["head"]["lat"], 12.97)
+
+    def test_wind_outage_falls_back_to_default(self):
+        class DownProvider:
+            calls = 0
+
+            def fetch(self, *args):
+                DownProvider.calls += 1
+                raise RuntimeError("Open-Meteo: HTTP 503")
+
+        self.pipeline.wind = WindFieldService(DownProvider())
+        with mock.patch("sys.stdout", io.StringIO()):
+            fuse = fusion_engine.fuse_data
+            # Audio/chemical levels are simulated with noise, so pin this alert to SAFE
+            with mock.patch.object(fusion_engine, "fuse_data",
+                                   lambda *a: dict(fuse(*a), decision="SAFE", triggered_sniffer=False)):
+                safe = self.pipeline.ingest(dict(alert(confidence=0.05), source_id="cam-calm"))
+            self.assertFalse(safe["triggered_sniffer"])
+            self.assertEqual(DownProvider.calls, 0)  # wind is only sampled for triggered alerts
+
+            snapshot = self.planned(alert(confidence=0.99))
+            self.assertTrue(snapshot["triggered_sniffer"])
+            self.assertAlmostEqual(snapshot["spread_cone"]["ros_kmh"], 1.0, places=3)  # 10 km/h default
+            self.assertGreater(snapshot["spread_cone"]["head"]["lat"], 12.97)
+
+            backend_app.index_hotspots([{"geometry": {"coordinates": [77.6, 12.97]},
+                                         "properties": {"source": "VIIRS", "date": "d"}}])
+            with mock.patch.object(backend_app, "wind_field", WindFieldService(DownProvider())):
+                resp = self.client.get("/api/spread/cones?bbox=77,12,78,13")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.get_json()["features"]), 1)
+
+    def test_slow_wind_lookup_does_not_block_ingest(self):
+        release = threading.Event()
+
+        class SlowWind:
+            def sample_point(self, lat, lon):
+                release.wait(5)
+                return 30.0, 90.0
+
+        self.pipeline.wind = SlowWind()
+        versions = []
+        self.pipeline.listeners.append(lambda s: versions.append(s["version"]))
+        first = self.pipeline.ingest(alert(confidence=0.99))
+        self.assertTrue(first["planning"])
+        self.assertIsNone(first["spread_cone"])
+        # The first plan is still waiting on the wind lookup
+        second = self.pipeline.ingest(dict(alert(confidence=0.99), lat=40.0, lon=-3.7, wind_speed_kmh=10))
+        self.assertEqual(second["version"], 2)
+        self.assertFalse(release.is_set())
+
+        release.set()
+        self.pipeline.join()
+        latest = self.pipeline.snapshot()
+        # The first plan was superseded; both incidents still reached the dispatcher
+        self.assertEqual((latest["version"], latest["lat"], latest["planning"]), (3, 40.0, False))
+        self.assertAlmostEqual(latest["spread_cone"]["origin"]["lat"], 40.0)
+        self.assertEqual(versions, [1, 2, 3])
+        self.assertEqual(len(self.dispatcher.incidents), 2)
+
+    def test_sensor_state_kept_per_source(self):
+        self.pipeline.sensors = SensorFleet(seed=0)
+        smoke = dict(alert(confidence=0.2), source_id="cam-smoke", co=120, co2=700, nox=5,
+                     fire_band_energy=95, wind_energy=10)
+        snapshot = self.pipeline.ingest(smoke)
+        self.assertGreater(snapshot["chem_conf"], 0.8)
+        self.assertGreater(snapshot["audio_conf"], 0.5)
+        self.pipeline.ingest(dict(alert(confidence=0.2), source_id="cam-calm"))
+
+        smoky, calm = self.pipeline.sensors.node_state("cam-smoke"), self.pipeline.sensors.node_state("cam-calm")
+        self.assertEqual((smoky["co_ppm"], smoky["audio_energy"]), (120.0, 95.0))
+        self.assertNotEqual(calm["co_ppm"], 120.0)  # simulated, not cam-smoke's reading
+        with self.assertRaises(ValueError):
+            self.pipeline.ingest(dict(alert(), co=10))  # co2/nox missing
+
+    def test_triggered_alert_dispatches_registered_drone(self):
+        resp = self.client.post("/api/drones", json={"drones": [
+            {"drone_id": "far", "lat": 12.90, "lon": 77.59}, {"drone_id": "near", "lat": 12.96, "lon": 77.59}]})
+        self.assertEqual(resp.get_json()["stats"]["drones"]["idle"], 2)
+
+        first = self.planned(alert(confidence=0.99))
+        mission = first["mission"]
+        self.assertEqual(mission["drone_id"], "near")
+        self.assertEqual(mission["mission_id"], first["drone_config"]["mission_id"])
+        # A repeated alert for the same fire keeps its mission instead of taking the other drone
+        self.assertEqual(self.planned(alert(confidence=0.99))["mission"], mission)
+
+        status = self.client.get("/api/dispatch").get_json()
+        self.assertEqual(status["stats"]["open_missions"], 1)
+        done = self.client.post(f"/api/missions/{mission['mission_id']}/complete", json={"battery": 0.6})
+        self.assertEqual(done.status_code, 200)
+        self.assertEqual(self.dispatcher.stats()["completed_missions"], 1)
+        self.assertEqual(self.client.post("/api/missions/nope/complete").status_code, 404)
+        self.assertEqual(self.client.post("/api/drones", json={"drone_id": "x"}).status_code, 400)
+
+    def test_vision_state_is_per_source(self):
+        self.pipeline.ingest(dict(alert(confidence=0.95), source_id="cam-a"))
+        other = self.pipeline.ingest(dict(alert(confidence=0.3), source_id="cam-b", bbox="1,2,30,40"))
+        self.assertAlmostEqual(other["vision_conf"], 0.3, places=2)  # cam-a's 0.95 does not leak in
+        self.assertEqual(vision_model.get_last_detection("cam-b")["bbox"], [1.0, 2.0, 30.0, 40.0])
+        self.assertAlmostEqual(vision_model.get_last_detection("cam-a")["confidence"], 0.95)
+        with self.assertRaises(ValueError):
+            self.pipeline.ingest(dict(alert(), bbox="1,2"))
+
+    def test_spread_cones_for_indexed_hotspots(self):
+        backend_app.index_hotspots([
+            {"geometry": {"coordinates": [77.6 + i * 0.01, 12.97]}, "properties": {"source": "VIIRS", "date": "d"}}
+            for i in range(3)
+        ])
+        cones = self.client.get("/api/spread/cones?bbox=77,12,78,13&wind_speed_kmh=20&wind_bearing=90").get_json()
+        self.assertEqual(len(cones["features"]), 3)
+        head_lon, head_lat = cones["features"][0]["geometry"]["coordinates"][0][2]
+        self.assertGreater(head_lon, 77.6)
+        self.assertAlmostEqual(head_lat, 12.97, places=3)
+        self.assertEqual(self.client.get("/api/spread/cones?bbox=1,2").status_code, 400)
+
+    def test_wind_endpoint_samples_point_batches(self):
+        with mock.patch.object(backend_app, "wind_field", WindFieldService(StubWindProvider(20.0, 45.0))):
+            data = self.client.get("/api/wind?lat=12.9,40.1&lon=77.5,-3.7").get_json()
+            self.assertEqual(data["speed_kmh"], [20.0, 20.0])
+            self.assertEqual(data["bearing"], [45.0, 45.0])
+            self.assertEqual(data["cache"]["upstream_fetches"], 2)
+            self.assertEqual(self.client.get("/api/wind?lat=1,2&lon=3").status_code, 400)
+
+    def test_rejects_malformed_payload(self):
+        resp = self.client.post("/api/vision-trigger", json={"image": "not base64!", "confidence": 0.9})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(self.client.post("/api/vision-trigger", json={}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from chemical_ratio import ChemicalRatio
+from sensor_fleet import SensorFleet
+
+
+class TestSensorFleet(unittest.TestCase):
+
+    def test_nodes_keep_separate_smoothing_state(self):
+        fleet = SensorFleet(capacity=2, seed=0)
+        fleet.analyze_audio(["ridge", "valley"], simulate_fire_intensity=[0.9, 0.0])
+        for _ in range(20):
+            fleet.analyze_audio(["ridge"], simulate_fire_intensity=0.9)
+        # Only the ridge node climbed towards its fire target
+        self.assertGreaterEqual(fleet.node_state("ridge")["audio_energy"], 85.0)
+        self.assertLess(fleet.node_state("valley")["audio_energy"], 60.0)
+
+    def test_batch_rules_match_scalar_modules(self):
+        fleet = SensorFleet()
+        fire = np.array([95.0, 60.0, 85.0, 10.0])
+        wind = np.array([20.0, 50.0, 45.0, 0.0])
+        result = fleet.analyze_audio(["a", "b", "c", "d"], fire, wind)
+        np.testing.assert_allclose(result["confidence"], [0.98, 0.0, 0.71, 1.0])
+
+        co = np.array([100.0, 30.0, 60.0, 0.0])
+        co2 = np.array([700.0, 420.0, 500.0, 410.0])
+        nox = np.array([10.0, 80.0, 40.0, 5.0])
+        gas = fleet.analyze_gas(["a", "b", "c", "d"], co, co2, nox)
+        for i in range(4):
+            _, _, expected = ChemicalRatio.confidence_from_readings(co[i], co2[i], nox[i])
+            self.assertEqual(gas["confidence"][i], float(expected))
+        np.testing.assert_allclose(gas["confidence"], [0.9, 0.0, 0.18, 0.0])
+
+    def test_register_grows_and_accepts_slots(self):
+        fleet = SensorFleet(capacity=4)
+        ids = [f"node-{i}" for i in range(1000)]
+        slots = fleet.register(ids)
+        self.assertEqual(len(fleet), 1000)
+        self.assertGreaterEqual(fleet.capacity, 1000)
+        fleet.analyze_audio(slots, np.full(1000, 90.0), np.full(1000, 30.0))
+        self.assertEqual(fleet.node_state("node-999")["audio_energy"], 90.0)
+        self.assertIsNone(fleet.node_state("node-999")["co_ppm"])
+        self.assertIsNone(fleet.node_state("unknown"))
+
+
+if __name__ == '__main__':
+    unittest.main()
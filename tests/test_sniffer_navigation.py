@@ -0,0 +1,98 @@
+import sys
+import os
+import contextlib
+import io
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from sniffer_navigation import (CONFIRMED, KM_PER_DEG, LOCALIZED, SEARCHING, ConcentrationField,
+                                SnifferNavigation)
+
+SOURCE = (12.97, 77.59)
+BBOX = (77.575, 12.955, 77.605, 12.985)
+
+
+def error_m(lats, lons, source=SOURCE):
+    north = (np.asarray(lats) - source[0]) * KM_PER_DEG * 1000
+    east = (np.asarray(lons) - source[1]) * KM_PER_DEG * 1000 * np.cos(np.radians(source[0]))
+    return np.hypot(north, east)
+
+
+def plume(wind_bearing=270.0):
+    return ConcentrationField.from_plume([SOURCE], 10.0, wind_bearing, BBOX, 0.0001)
+
+
+class TestSnifferNavigation(unittest.TestCase):
+
+    def setUp(self):
+        self.nav = SnifferNavigation()
+
+    def test_plume_source_localized_within_metres(self):
+        field = plume()
+        # Drones spread across the plume 300-900 m downwind (west) of the source
+        rng = np.random.default_rng(0)
+        lats = SOURCE[0] + rng.uniform(-0.0008, 0.0008, 200)
+        lons = SOURCE[1] - rng.uniform(0.003, 0.008, 200)
+        result = self.nav.plan_batch(lats, lons, field, steps=150, wind_bearing=270.0, vision=lambda la, lo: 0 * la)
+        self.assertTrue((result["status"] != SEARCHING).all())
+        self.assertLess(np.median(error_m(result["lat"][-1], result["lon"][-1])), 15.0)
+
+    def test_vision_confirmation_stops_drone(self):
+        field = plume()
+        result = self.nav.plan_batch([SOURCE[0]], [SOURCE[1] - 0.005], field, steps=150, wind_bearing=270.0)
+        self.assertEqual(result["status"][0], CONFIRMED)
+        taken = result["steps_taken"][0]
+        self.assertLess(taken, 150)
+        # Stopped drones hold position for the rest of the track
+        self.assertTrue((result["lat"][taken:, 0] == result["lat"][-1, 0]).all())
+        self.assertFalse(result["moved"][taken:, 0].any())
+
+    def test_casting_finds_plume_from_clean_air(self):
+        field = plume()
+        # 300 m crosswind of the plume axis, where the plume is still narrow
+        lats = [SOURCE[0] + 0.0027, SOURCE[0] - 0.0027]
+        lons = [SOURCE[1] - 0.003] * 2
+        self.assertTrue((field.sample(np.array(lats), np.array(lons)) < 1e-3 * field.peak).all())
+        result = self.nav.plan_batch(lats, lons, field, steps=200, wind_bearing=270.0, vision=lambda la, lo: 0 * la)
+        self.assertTrue((error_m(result["lat"][-1], result["lon"][-1]) < 30.0).all())
+
+        spiral = self.nav.plan_batch(lats, lons, field, steps=400, vision=lambda la, lo: 0 * la)
+        self.assertTrue((error_m(spiral["lat"][-1], spiral["lon"][-1]) < 30.0).all())
+
+    def test_drones_are_independent(self):
+        field = plume()
+        lats, lons = [SOURCE[0], SOURCE[0] + 0.0005], [SOURCE[1] - 0.004, SOURCE[1] - 0.006]
+        batch = self.nav.plan_batch(lats, lons, field, steps=80, wind_bearing=270.0)
+        for d in range(2):
+            single = self.nav.plan_batch(lats[d:d + 1], lons[d:d + 1], field, steps=80, wind_bearing=270.0)
+            np.testing.assert_array_equal(single["lat"][:, 0], batch["lat"][:, d])
+            self.assertEqual(single["status"][0], batch["status"][d])
+
+    def test_idw_field_reproduces_readings(self):
+        lats = np.array([12.96, 12.97, 12.98])
+        lons = np.array([77.58, 77.59, 77.60])
+        ppm = np.array([5.0, 40.0, 12.0])
+        field = ConcentrationField.from_readings(lats, lons, ppm, (77.57, 12.95, 77.61, 12.99), 0.001)
+        np.testing.assert_allclose(field.sample(lats, lons), ppm, rtol=1e-6)
+        self.assertAlmostEqual(field.peak, 40.0, places=6)
+
+        result = self.nav.plan_batch([12.975], [77.585], field, steps=100, vision=lambda la, lo: 0 * la)
+        self.assertEqual(result["status"][0], LOCALIZED)
+        self.assertLess(error_m(result["lat"][-1], result["lon"][-1])[0], 50.0)
+
+    def test_generate_sniffer_path_keeps_dict_format(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = self.nav.generate_sniffer_path(SOURCE[0], SOURCE[1], wind_bearing=90.0)
+            again = self.nav.generate_sniffer_path(SOURCE[0], SOURCE[1], wind_bearing=90.0)
+        self.assertEqual(path, again)  # no state carried over between calls
+        self.assertEqual(set(path[0]), {"lat", "lon", "step", "status"})
+        self.assertIn(path[-1]["status"], ("CONFIRMED", "LOCALIZED"))
+        self.assertLess(path[-1]["lon"], SOURCE[1])  # searched upwind (west)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from spatial_index import SpatialIndex, haversine_km
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [1000.0]
+        self.index = SpatialIndex(cell_deg=0.5, merge_at=8, clock=lambda: self.now[0])
+
+    def test_queries_match_brute_force(self):
+        rng = np.random.default_rng(3)
+        lats = rng.uniform(10, 20, 5000)
+        lons = rng.uniform(70, 80, 5000)
+        self.index.bulk_load(lats, lons, "hotspot")
+        for i in range(20):  # some points in the pending segment too
+            self.index.insert(15.0 + i * 0.01, 75.0, "detection")
+        all_lats = np.concatenate([lats, 15.0 + np.arange(20) * 0.01])
+        all_lons = np.concatenate([lons, np.full(20, 75.0)])
+
+        box = self.index.bbox(74.0, 14.0, 76.0, 16.0)
+        expected = ((all_lats >= 14) & (all_lats <= 16) & (all_lons >= 74) & (all_lons <= 76)).sum()
+        self.assertEqual(len(box), expected)
+
+        near = self.index.radius(15.0, 75.0, 50.0)
+        d = haversine_km(15.0, 75.0, all_lats, all_lons)
+        self.assertEqual(len(near), int((d <= 50.0).sum()))
+        self.assertEqual([r["distance_km"] for r in near], sorted(r["distance_km"] for r in near))
+
+        knn = self.index.nearest(12.3, 71.7, k=5)
+        np.testing.assert_allclose([r["distance_km"] for r in knn], np.sort(haversine_km(12.3, 71.7, all_lats, all_lons))[:5], atol=1e-3)
+        self.assertEqual(len(self.index.radius(15.0, 75.0, 50.0, layers=["detection"])), 20)
+
+    def test_ttl_expiry_and_keyed_replace(self):
+        self.index.insert(10.0, 10.0, "alert", data={"decision": "CRITICAL FIRE"}, key="a1", ttl=60)
+        self.index.insert(10.001, 10.0, "alert", key="a1", ttl=60)  # replaces a1
+        hits = self.index.radius(10.0, 10.0, 1.0)
+        self.assertEqual(len(hits), 1)
+        self.assertIsNone(hits[0]["data"])
+        self.now[0] += 61
+        self.assertEqual(self.index.radius(10.0, 10.0, 1.0), [])
+        self.index.expire()
+        self.assertEqual(self.index.stats()["packed"], 0)
+        self.assertEqual(self.index.stats()["keys"], 0)
+
+    def test_bulk_load_keys_replace_points(self):
+        self.index.insert(5.0, 5.0, "hotspot", key="pending", data={"v": 0})
+        self.index.bulk_load([6.0], [6.0], "hotspot", keys=["packed"], data=[{"v": 0}])
+        ids = self.index.bulk_load([5.0, 6.0, 7.0, 7.0], [5.0, 6.0, 7.0, 7.0], "hotspot",
+                                   keys=["pending", "packed", "new", "new"], data=[{"v": i} for i in range(1, 5)])
+        self.assertEqual(len(ids), 3)  # the first "new" row is superseded within the batch
+        hits = self.index.bbox(4, 4, 8, 8)
+        self.assertEqual(sorted(r["data"]["v"] for r in hits), [1, 2, 4])
+        self.assertEqual(self.index.stats()["keys"], 3)
+        self.assertTrue(self.index.remove("new"))
+        self.assertEqual(len(self.index.bbox(4, 4, 8, 8)), 2)
+
+    def test_remove_packed_point_by_key(self):
+        for i in range(10):  # exceeds merge_at -> packed
+            self.index.insert(-33.0, 151.0 + i * 0.1, "hotspot", key=f"h{i}")
+        self.assertEqual(self.index.stats()["pending"], 2)
+        self.assertTrue(self.index.remove("h0"))
+        self.assertFalse(self.index.remove("h0"))
+        self.assertEqual(len(self.index.bbox(150, -34, 153, -32)), 9)
+
+    def test_radius_wraps_across_antimeridian(self):
+        for i, lon in enumerate((179.95, -179.95, 179.0, -170.0)):  # the last two are far
+            self.index.insert(10.0, lon, "hotspot", key=i)
+        for i in range(10):  # packed and pending points on both sides
+            self.index.insert(-10.0, 179.99 if i % 2 else -179.99, "hotspot")
+        self.assertEqual(len(self.index.radius(10.0, 179.99, 20.0)), 2)
+        self.assertEqual(len(self.index.radius(10.0, -179.99, 20.0)), 2)
+        self.assertEqual(len(self.index.radius(-10.0, 180.0, 5.0)), 10)
+        nearest = self.index.nearest(10.0, -179.99, k=2)
+        self.assertEqual(sorted(r["lon"] for r in nearest), [-179.95, 179.95])
+
+
+if __name__ == '__main__':
+    unittest.main()
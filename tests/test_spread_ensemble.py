@@ -0,0 +1,73 @@
+import sys
+import os
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from spread_ensemble import ForecastCancelled, SpreadEnsemble
+from spread_grid import GridSpreadSimulator, TerrainRasters
+
+CELL = 0.001
+
+
+class TestSpreadEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        n = 121
+        fuel = np.random.default_rng(1).uniform(0.5, 1.5, (n, n)).astype(np.float32)
+        self.terrain = TerrainRasters((0.0, 0.0, n * CELL, n * CELL), CELL, fuel)
+        self.ignition = [(60.5 * CELL, 60.5 * CELL)]
+        self.ensemble = SpreadEnsemble(self.terrain, max_workers=2, cycles=2, seed=7)
+
+    def tearDown(self):
+        self.ensemble.shutdown()
+
+    def test_probability_matches_serial_members(self):
+        run = self.ensemble.forecast(self.ignition, 10.0, 90.0, members=6, horizon_hours=6, hours=(1, 3, 6))
+        result = run.result(timeout=60)
+
+        serial = GridSpreadSimulator(self.terrain, cycles=2).simulate(self.ignition, run.scenarios, horizon_hours=6)
+        self.assertEqual((result.row0, result.col0), (serial.row0, serial.col0))
+        for i, h in enumerate((1, 3, 6)):
+            np.testing.assert_allclose(result.probability[i], (serial.arrival <= h).mean(axis=0), atol=1e-6)
+        np.testing.assert_array_equal(result.probability_at(*self.ignition[0]), [1.0, 1.0, 1.0])
+
+    def test_fronts_are_nested(self):
+        result = self.ensemble.forecast(self.ignition, 15.0, 0.0, members=8, horizon_hours=3,
+                                        hours=(1, 3)).result(timeout=60)
+        collection = result.fronts((0.1, 0.5, 0.9))
+        self.assertEqual(len(collection["features"]), 6)
+        for hours in (1, 3):
+            areas = [f["properties"]["area_km2"] for f in collection["features"] if f["properties"]["hours"] == hours]
+            self.assertEqual(areas, sorted(areas, reverse=True))
+            self.assertGreater(areas[-1], 0)
+
+    def test_sampling_keeps_base_member_and_spreads_bearing(self):
+        scenarios = self.ensemble.sample(20.0, 350.0, 200)
+        self.assertEqual(scenarios[0], {"wind_speed_kmh": 20.0, "wind_bearing": 350.0})
+        bearings = np.array([s["wind_bearing"] for s in scenarios])
+        self.assertTrue(((bearings >= 0) & (bearings < 360)).all())
+        offsets = (bearings - 350.0 + 180.0) % 360.0 - 180.0
+        self.assertAlmostEqual(float(np.std(offsets)), 20.0, delta=4.0)
+
+    def test_superseded_run_is_cancelled_and_released(self):
+        first = self.ensemble.forecast(self.ignition, 10.0, 90.0, members=4, horizon_hours=3, key="fire-1")
+        names = [block.name for block in first.blocks.values()]
+        second = self.ensemble.forecast(self.ignition, 12.0, 80.0, members=4, horizon_hours=3, key="fire-1")
+
+        self.assertTrue(first.cancelled)
+        with self.assertRaises(ForecastCancelled):
+            first.result(timeout=60)
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(name=name)
+        self.assertGreater(second.result(timeout=60).probability.max(), 0)
+        self.assertEqual(self.ensemble._runs, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
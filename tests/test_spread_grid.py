@@ -0,0 +1,179 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from spread_grid import (GridSpreadSimulator, TerrainRasters, R0_KMH, WIND_COEF,
+                         mask_to_polygons, _contains)
+
+
+CELL = 0.001  # ~111 m
+
+
+def terrain(n=101, fuel=None, **layers):
+    fuel = np.ones((n, n), dtype=np.float32) if fuel is None else fuel
+    return TerrainRasters((0.0, 0.0, n * CELL, n * CELL), CELL, fuel, **layers)
+
+
+def center(n=101):
+    return ((n // 2 + 0.5) * CELL, (n // 2 + 0.5) * CELL)
+
+
+class TestGridSpread(unittest.TestCase):
+
+    def test_no_wind_arrival_matches_distance_over_rate(self):
+        t = terrain()
+        result = GridSpreadSimulator(t).simulate([center()], [{"wind_speed_kmh": 0.0}], horizon_hours=100)
+        lat, lon = center()
+        arrival = result.arrival_at(lat, lon + 30 * CELL)[0]
+        self.assertAlmostEqual(arrival, 30 * result.dx_km / R0_KMH, places=3)
+        north = result.arrival_at(lat + 30 * CELL, lon)[0]
+        self.assertAlmostEqual(north, 30 * result.dy_km / R0_KMH, places=3)
+
+    def test_downwind_faster_than_upwind(self):
+        t = terrain()
+        lat, lon = center()
+        result = GridSpreadSimulator(t).simulate([(lat, lon)], [{"wind_speed_kmh": 20, "wind_bearing": 90}],
+                                                 horizon_hours=100)
+        east = result.arrival_at(lat, lon + 30 * CELL)[0]
+        west = result.arrival_at(lat, lon - 30 * CELL)[0]
+        self.assertAlmostEqual(east, 30 * result.dx_km / (R0_KMH + WIND_COEF * 20), places=3)
+        self.assertLess(east * 2, west)
+
+    def test_scenarios_are_batched_and_independent(self):
+        t = terrain()
+        lat, lon = center()
+        scenarios = [{"wind_speed_kmh": 20, "wind_bearing": b} for b in (0, 90, 180, 270)]
+        result = GridSpreadSimulator(t).simulate([(lat, lon)], scenarios, horizon_hours=100)
+        north = result.arrival_at(lat + 30 * CELL, lon)
+        self.assertEqual(int(np.argmin(north)), 0)
+        self.assertEqual(int(np.argmax(north)), 2)
+        single = GridSpreadSimulator(t).simulate([(lat, lon)], scenarios[1:2], horizon_hours=100)
+        np.testing.assert_allclose(result.arrival[1], single.arrival[0], rtol=1e-6)
+
+    def test_firebreak_forces_detour_through_gap(self):
+        n = 101
+        fuel = np.ones((n, n), dtype=np.float32)
+        fuel[:, 60] = 0.0          # non-burnable wall east of the ignition...
+        fuel[90:95, 60] = 1.0      # ...with a gap far to the north
+        t = terrain(n, fuel)
+        lat, lon = center(n)
+        result = GridSpreadSimulator(t, cycles=4).simulate([(lat, lon)], [{"wind_speed_kmh": 0.0}],
+                                                           horizon_hours=1000)
+        behind = result.arrival_at(lat, lon + 20 * CELL)[0]
+        straight = 20 * result.dx_km / R0_KMH
+        self.assertTrue(np.isfinite(behind))
+        self.assertGreater(behind, straight * 2)
+        self.assertTrue(np.isinf(result.arrival[0][:, 60][fuel[:, 60] == 0]).all())
+
+        sealed = fuel.copy()
+        sealed[90:95, 60] = 0.0
+        result = GridSpreadSimulator(terrain(n, sealed)).simulate([(lat, lon)], [{"wind_speed_kmh": 0.0}],
+                                                                  horizon_hours=1000)
+        self.assertTrue(np.isinf(result.arrival_at(lat, lon + 20 * CELL)[0]))
+
+    def test_upslope_faster_than_downslope(self):
+        n = 101
+        slope = np.full((n, n), 10.0, dtype=np.float32)
+        aspect = np.zeros((n, n), dtype=np.float32)  # downslope faces north -> uphill is south
+        lat, lon = center(n)
+        result = GridSpreadSimulator(terrain(n, slope=slope, aspect=aspect)).simulate(
+            [(lat, lon)], [{"wind_speed_kmh": 0.0}], horizon_hours=1000)
+        uphill = result.arrival_at(lat - 20 * CELL, lon)[0]
+        downhill = result.arrival_at(lat + 20 * CELL, lon)[0]
+        self.assertLess(uphill * 1.5, downhill)
+
+    def test_isochrones_grow_and_contain_ignition(self):
+        t = terrain()
+        lat, lon = center()
+        result = GridSpreadSimulator(t).simulate([(lat, lon)], [{"wind_speed_kmh": 10, "wind_bearing": 45}],
+                                                 horizon_hours=12)
+        collection = result.isochrones((1, 3, 6))
+        self.assertEqual(collection["type"], "FeatureCollection")
+        areas = [f["properties"]["area_km2"] for f in collection["features"]]
+        self.assertEqual(areas, sorted(areas))
+        self.assertGreater(areas[0], 0)
+        for feature in collection["features"]:
+            polygons = feature["geometry"]["coordinates"]
+            self.assertEqual(len(polygons), 1)
+            outer = [(y, x) for x, y in polygons[0][0]]
+            self.assertEqual(outer[0], outer[-1])
+            self.assertTrue(_contains(outer, (lat, lon)))
+
+    def test_horizon_crops_window(self):
+        t = terrain(1001)
+        result = GridSpreadSimulator(t).simulate([center(1001)], [{"wind_speed_kmh": 0.0}], horizon_hours=1)
+        self.assertLess(result.arrival.shape[1], 100)
+        self.assertTrue(np.isinf(result.arrival[0][0]).all())
+
+    def test_ignition_outside_rasters_rejected(self):
+        with self.assertRaises(ValueError):
+            GridSpreadSimulator(terrain()).simulate([(5.0, 5.0)])
+
+
+class TestTerrainRasters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_create_and_open_roundtrip(self):
+        fuel = np.random.default_rng(0).uniform(0, 2, (40, 50)).astype(np.float32)
+        wind = np.full((40, 50), 15.0, dtype=np.float32)
+        path = os.path.join(self.tmp, "terrain")
+        TerrainRasters.create(path, (10.0, 20.0, 10.5, 20.4), 0.01, fuel=fuel,
+                              wind_speed=wind, wind_dir=np.full((40, 50), 90.0, dtype=np.float32))
+
+        t = TerrainRasters.open(path)
+        self.assertIsInstance(t.fuel, np.memmap)
+        np.testing.assert_array_equal(np.asarray(t.fuel), fuel)
+        self.assertIsNone(t.slope)
+        self.assertEqual(t.shape, (40, 50))
+        self.assertEqual(t.cell_index(20.015, 10.025), (1, 2))
+        # Layer maxima come from meta.json: simulations never scan the rasters for them
+        self.assertEqual(t.maxima, {"fuel": float(fuel.max()), "wind_speed": 15.0, "wind_dir": 90.0})
+        self.assertIsNone(t.layer_max("slope"))
+
+        # Raster wind is used when the scenario does not override it
+        with mock.patch("numpy.max", side_effect=AssertionError("raster scanned")):
+            GridSpreadSimulator(t)._window([[(20.2, 10.25)]], [{}], 200)
+        result = GridSpreadSimulator(t).simulate([(20.2, 10.25)], horizon_hours=200)
+        east = result.arrival_at(20.205, 10.305)[0]
+        west = result.arrival_at(20.205, 10.195)[0]
+        self.assertTrue(np.isfinite(east))
+        self.assertLess(east, west)
+
+
+class TestMaskToPolygons(unittest.TestCase):
+
+    def test_square_with_hole(self):
+        mask = np.zeros((7, 7), dtype=bool)
+        mask[1:6, 1:6] = True
+        mask[3, 3] = False
+        polygons = mask_to_polygons(mask)
+        self.assertEqual(len(polygons), 1)
+        outer, hole = polygons[0]
+        self.assertEqual(sorted(set(outer)), [(1, 1), (1, 6), (6, 1), (6, 6)])
+        self.assertEqual(sorted(set(hole)), [(3, 3), (3, 4), (4, 3), (4, 4)])
+
+    def test_separate_blobs(self):
+        mask = np.zeros((5, 9), dtype=bool)
+        mask[1:3, 1:3] = True
+        mask[2:4, 5:8] = True
+        polygons = mask_to_polygons(mask)
+        self.assertEqual(len(polygons), 2)
+        self.assertTrue(all(len(p) == 1 for p in polygons))
+        self.assertEqual(mask_to_polygons(np.zeros((3, 3), dtype=bool)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
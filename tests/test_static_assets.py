@@ -0,0 +1,122 @@
+import sys
+import os
+import gzip
+import re
+import shutil
+import tempfile
+import unittest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from flask import Flask, request
+
+import app as backend_app
+from static_assets import StaticAssets
+
+
+def write(root, path, text):
+    full = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, "wb") as f:
+        f.write(text if isinstance(text, bytes) else text.encode())
+
+
+class TestStaticAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        write(self.root, "index.html", '<link href="./style.css"><script src="./scripts/boot.js"></script>' + " " * 300)
+        write(self.root, "style.css", "body { color: red; }\n" * 40)
+        write(self.root, "scripts/boot.js", 'const s = ["./scripts/map.js"];\n' + "// pad\n" * 50)
+        write(self.root, "scripts/map.js", 'icon.src = "map icon.png";\n' + "// pad\n" * 50)
+        write(self.root, "map icon.png", b"\x89PNG" + bytes(range(256)) * 4)
+        write(self.root, ".env", "SECRET=1")
+        write(self.root, "backend/app.py", "print('source')")
+        self.assets = StaticAssets(self.root)
+        self.app = Flask(__name__, static_folder=None)
+        self.app.add_url_rule("/<path:filename>", "static_files",
+                              lambda filename: self.assets.response(filename, request) or ("", 404))
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_references_rewritten_to_fingerprints(self):
+        index = self.assets.assets["index.html"].data.decode()
+        self.assertIn(f'href="{self.assets.url("style.css")}"', index)
+        self.assertIn(f'src="{self.assets.url("scripts/boot.js")}"', index)
+        self.assertRegex(self.assets.url("style.css"), r"^/style\.[0-9a-f]{10}\.css$")
+        self.assertEqual(self.assets.url("index.html"), "/index.html")
+        # Nested: changing the icon changes map.js, boot.js and so index.html
+        self.assertIn(self.assets.url("map icon.png"), self.assets.assets["scripts/map.js"].data.decode())
+        self.assertTrue(self.assets.url("map icon.png").startswith("/map%20icon."))
+        before = self.assets.url("scripts/boot.js")
+        write(self.root, "map icon.png", b"\x89PNG other")
+        os.utime(os.path.join(self.root, "map icon.png"), (1, 1))
+        self.assets.refresh()
+        self.assertNotEqual(self.assets.url("scripts/boot.js"), before)
+
+    def test_only_allowlisted_paths_served(self):
+        for path in ("/.env", "/backend/app.py", "/scripts/../.env", "/missing.js"):
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+        self.assertEqual(self.client.get("/style.css").status_code, 200)
+
+    def test_compression_and_cache_headers(self):
+        url = self.assets.url("style.css")
+        resp = self.client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(resp.data), self.assets.assets["style.css"].data)
+        self.assertIn("Accept-Encoding", resp.headers["Vary"])
+        self.assertIn("immutable", resp.headers["Cache-Control"])
+        self.assertIn("max-age=31536000", resp.headers["Cache-Control"])
+
+        plain = self.client.get(url, headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(plain.data, self.assets.assets["style.css"].data)
+        self.assertNotEqual(plain.headers["ETag"], resp.headers["ETag"])
+
+        # Unfingerprinted URLs and pages must revalidate
+        self.assertEqual(self.client.get("/style.css").headers["Cache-Control"], "no-cache")
+        self.assertEqual(self.client.get("/index.html").headers["Cache-Control"], "no-cache")
+        # Small or binary files are not compressed
+        png = self.client.get(self.assets.url("map icon.png").replace("%20", " "), headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(png.status_code, 200)
+        self.assertNotIn("Content-Encoding", png.headers)
+
+    def test_if_none_match_returns_304(self):
+        first = self.client.get("/index.html", headers={"Accept-Encoding": "gzip"})
+        again = self.client.get("/index.html", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b"")
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+        stale = self.client.get("/index.html", headers={"If-None-Match": '"other"'})
+        self.assertEqual(stale.status_code, 200)
+
+
+class TestDashboardRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.client = backend_app.app.test_client()
+
+    def test_repo_files_not_exposed(self):
+        for path in ("/.env", "/.cache.sqlite", "/backend/app.py", "/requests.jsonl", "/.git/config",
+                     "/frontend/assets/detected_fires/missing.jpg"):
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+
+    def test_dashboard_loads_fingerprinted_assets(self):
+        resp = self.client.get("/")
+        self.assertEqual(resp.status_code, 200)
+        html = resp.get_data(as_text=True)
+        for url in re.findall(r'(?:href|src)="(/[^"]+\.[0-9a-f]{10}\.(?:css|js))"', html):
+            asset = self.client.get(url)
+            self.assertEqual(asset.status_code, 200, url)
+            self.assertIn("immutable", asset.headers["Cache-Control"])
+        self.assertIn(backend_app.assets.url("style.css"), html)
+        self.assertIn(backend_app.assets.url("scripts/globe.js"),
+                      backend_app.assets.assets["scripts/bootstrap.js"].data.decode())
+        self.assertEqual(self.client.get("/frontend/alert_system.html").status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
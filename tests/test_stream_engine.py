@@ -0,0 +1,99 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from stream_engine import MultiStreamEngine, StreamReader
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture: yields `frames` labelled frames at `fps`."""
+
+    def __init__(self, source, frames=20, fps=200):
+        self.source = source
+        self.remaining = frames
+        self.interval = 1.0 / fps
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.remaining == 0:
+            return False, None
+        self.remaining -= 1
+        time.sleep(self.interval)
+        return True, (self.source, self.remaining)
+
+    def release(self):
+        pass
+
+
+class FakeModel:
+    def __init__(self, delay=0.0):
+        self.batch_sizes = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, frames, **kwargs):
+        with self.lock:
+            self.batch_sizes.append(len(frames))
+        time.sleep(self.delay)
+        return [("result", f) for f in frames]
+
+
+class TestMultiStreamEngine(unittest.TestCase):
+
+    def test_frames_from_all_streams_share_batched_calls(self):
+        model1, model2 = FakeModel(), FakeModel()
+        seen = []
+        engine = MultiStreamEngine(
+            [model1, model2], ["cam0", "cam1", "cam2"],
+            lambda sid, frame, results: seen.append((sid, frame, results)),
+            max_wait_ms=20, capture_factory=FakeCapture,
+        )
+        engine.run(report_every=0)
+
+        self.assertEqual({sid for sid, _, _ in seen}, {0, 1, 2})
+        # Each model sees every batch, and at least one batch mixed streams
+        self.assertEqual(model1.batch_sizes, model2.batch_sizes)
+        self.assertGreater(max(model1.batch_sizes), 1)
+        # Results are routed back to the frame they came from
+        for _, frame, results in seen:
+            self.assertEqual(results, [("result", frame), ("result", frame)])
+
+    def test_slow_inference_drops_oldest_frames(self):
+        model = FakeModel(delay=0.05)
+        seen = []
+        engine = MultiStreamEngine([model], ["cam0"], lambda sid, frame, results: seen.append(frame),
+                                   capture_factory=lambda src: FakeCapture(src, frames=40, fps=400))
+        engine.run(report_every=0)
+
+        stats = engine.stats()[0]
+        self.assertEqual(stats["captured"], 40)
+        self.assertGreater(stats["dropped"], 0)
+        self.assertEqual(stats["inferred"] + stats["dropped"], 40)
+        # Frames are processed in capture order even when some are skipped
+        remaining = [frame[1] for frame in seen]
+        self.assertEqual(remaining, sorted(remaining, reverse=True))
+        self.assertIsNotNone(stats["latency_p95_ms"])
+
+
+class TestStreamReader(unittest.TestCase):
+
+    def test_finished_reader_can_be_joined(self):
+        reader = StreamReader(0, "cam0", threading.Condition(), capture_factory=lambda src: FakeCapture(src, frames=3))
+        reader.start()
+        reader.join(timeout=5)
+        self.assertFalse(reader.is_alive())
+        self.assertTrue(reader.finished)
+        self.assertEqual(reader.stats.captured, 3)
+        reader.stop()
+        reader.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
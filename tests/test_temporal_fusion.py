@@ -0,0 +1,72 @@
+import sys
+import os
+import unittest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from temporal_fusion import TemporalFusion
+
+
+class TestTemporalFusion(unittest.TestCase):
+
+    def setUp(self):
+        self.fusion = TemporalFusion(window_seconds=10, bucket_seconds=1, max_lateness=3)
+        self.seen = []
+        self.fusion.listeners.append(self.seen.append)
+
+    def test_evidence_accumulates_across_modalities(self):
+        f = self.fusion
+        self.assertIsNone(f.ingest("cell-a", "audio", 100.0, 0.95))
+        # Chem arrives a few seconds later: both now count in the window
+        t = f.ingest("cell-a", "chem", 104.0, 0.95)
+        self.assertEqual(t["decision"], "SMOKE WITHOUT FLAME")
+        self.assertEqual(t["previous"], "SAFE")
+        self.assertEqual(t["final_score"], 0.57)
+        # Same decision again -> no new emission
+        self.assertIsNone(f.ingest("cell-a", "chem", 105.0, 0.95))
+        self.assertEqual(len(self.seen), 1)
+
+    def test_out_of_order_within_lateness(self):
+        f = self.fusion
+        f.ingest("cell-a", "audio", 200.0, 0.95)
+        f.ingest("cell-a", "audio", 201.0, 0.95)
+        # Chem reading stamped 2 s earlier still lands in the window
+        t = f.ingest("cell-a", "chem", 199.0, 0.95)
+        self.assertEqual(t["decision"], "SMOKE WITHOUT FLAME")
+        # Too late: dropped
+        self.assertIsNone(f.ingest("cell-a", "vision", 195.0, 0.99))
+        self.assertEqual(f.late_dropped, 1)
+
+    def test_window_expiry_returns_to_safe(self):
+        f = self.fusion
+        f.ingest("cell-a", "vision", 0.0, 0.9)
+        self.assertEqual(f.decision("cell-a"), "SMOKE WITHOUT FLAME")  # vision override
+        self.assertEqual(f.advance(5.0), [])
+        transitions = f.advance(12.0)
+        self.assertEqual([t["decision"] for t in transitions], ["SAFE"])
+        self.assertEqual(f.window_means("cell-a"), (0.0, 0.0, 0.0))
+
+    def test_event_older_than_advanced_window_dropped(self):
+        f = self.fusion
+        f.ingest("cell-a", "audio", 0.0, 0.1)
+        f.advance(20.0)
+        # Newer than the watermark (0 s) but outside the window that now ends at 20 s
+        self.assertIsNone(f.ingest("cell-a", "vision", 5.0, 0.9))
+        self.assertEqual(f.late_dropped, 1)
+        self.assertEqual(f.window_means("cell-a"), (0.0, 0.0, 0.0))
+        self.assertEqual(f.decision("cell-a"), "SAFE")
+        self.assertIsNotNone(f.ingest("cell-a", "vision", 15.0, 0.9))
+
+    def test_locations_are_independent_and_grow(self):
+        f = self.fusion
+        for i in range(10):
+            f.ingest(("cell", i), "vision", 50.0, 0.9 if i == 7 else 0.1)
+        self.assertEqual(f.stats()["locations"], 10)
+        self.assertEqual(f.decision(("cell", 7)), "SMOKE WITHOUT FLAME")
+        self.assertEqual(f.decision(("cell", 6)), "SAFE")
+        self.assertAlmostEqual(f.window_means(("cell", 6))[0], 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from thermal_baseline import ThermalBaselineStore
+from sat_filter import SatelliteFilter
+
+BBOX = (70.0, 10.0, 80.0, 20.0)
+
+
+class TestThermalBaselineStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rolling_window_mean_and_expiry(self):
+        store = ThermalBaselineStore(self.path, BBOX, cell_deg=0.01, window_days=3)
+        store.ingest([15.0, 15.0], [75.0, 75.0], [300.0, 310.0], days=[100, 100])
+        store.ingest([15.0], [75.0], [320.0], days=[101])
+        self.assertAlmostEqual(store.lookup([15.0], [75.0])[0], 310.0)
+
+        # Day 103 pushes day 100 out of a 3-day window
+        store.ingest([15.0], [75.0], [330.0], days=[103])
+        self.assertAlmostEqual(store.lookup([15.0], [75.0])[0], 325.0)
+
+        # No history / outside bbox -> NaN
+        self.assertTrue(np.isnan(store.lookup([12.0, 50.0], [72.0, 75.0])).all())
+
+    def test_ingest_persists_and_totals_match_slabs(self):
+        rng = np.random.default_rng(0)
+        store = ThermalBaselineStore(self.path, BBOX, cell_deg=1.0, window_days=3)
+        observed = []
+        for day in range(100, 120):
+            lats, lons = rng.uniform(10, 12, 50), rng.uniform(70, 72, 50)
+            bright = rng.normal(300, 5, 50)
+            store.ingest(lats, lons, bright, days=day)
+            observed.append((day, lats, lons, bright.astype(np.float32)))
+
+        # No flush(): every ingest is already on disk
+        reopened = ThermalBaselineStore.open(self.path)
+        recent = [o for o in observed if o[0] > 116]
+        lats, lons, bright = (np.concatenate([o[i] for o in recent]) for i in (1, 2, 3))
+        cell = (lats < 11) & (lons < 71)
+        self.assertAlmostEqual(reopened.lookup([10.5], [70.5])[0], float(bright[cell].mean(dtype=np.float64)), places=3)
+        np.testing.assert_allclose(reopened.total_sum, reopened.day_sum.sum(axis=0, dtype=np.float64), rtol=1e-6)
+        np.testing.assert_array_equal(reopened.total_count, reopened.day_count.sum(axis=0))
+
+    def test_ingest_features_skips_seen_observations(self):
+        store = ThermalBaselineStore(self.path, BBOX, cell_deg=0.01)
+
+        def feature(lat, date, time="0100", brightness=310.0):
+            return {"geometry": {"coordinates": [75.0, lat]},
+                    "properties": {"source": "VIIRS", "date": date, "time": time, "brightness": brightness}}
+
+        pull = [feature(15.0, "2026-01-01"), feature(15.0, "2026-01-01", "1300", 320.0), feature(16.0, "bad")]
+        self.assertEqual(store.ingest_features(pull), 2)
+        self.assertEqual(store.ingest_features(pull + [feature(15.0, "2026-01-02", brightness=330.0)]), 1)
+        self.assertAlmostEqual(store.lookup([15.0], [75.0])[0], 320.0)
+
+    def test_persistence_and_archive_loader(self):
+        csv_path = os.path.join(self.tmp.name, "archive.csv")
+        with open(csv_path, "w") as f:
+            f.write("latitude,longitude,bright_ti4,acq_date,acq_time\n")
+            for i in range(10):
+                f.write(f"15.0,75.0,{300 + i},2026-01-0{1 + i % 3},0100\n")
+
+        store = ThermalBaselineStore(self.path, BBOX, cell_deg=0.01)
+        self.assertEqual(store.load_firms_archive(csv_path, chunk_rows=3), 10)
+
+        reopened = ThermalBaselineStore.open(self.path)
+        self.assertAlmostEqual(reopened.lookup([15.0], [75.0])[0], 304.5)
+
+        sf = SatelliteFilter(reopened)
+        self.assertAlmostEqual(sf.get_historic_baseline(15.0, 75.0), 304.5)
+        baselines = sf.get_historic_baselines([15.0, 12.0], [75.0, 72.0])
+        self.assertAlmostEqual(baselines[0], 304.5)
+        self.assertTrue(295.0 <= baselines[1] <= 305.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
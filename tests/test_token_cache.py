@@ -0,0 +1,114 @@
+import sys
+import os
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from token_cache import DEFAULT_EXPIRES_IN, OAuthTokenCache, TokenRequestError
+
+
+class StubOAuthHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Sentinel Hub OAuth endpoint."""
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode()
+        with server.lock:
+            server.requests += 1
+            n = server.requests
+        time.sleep(server.delay)
+        if "client_secret=bad" in body:
+            self.send_response(401)
+            self.end_headers()
+            self.wfile.write(b"invalid_client")
+            return
+        token = {"access_token": f"tok-{n}", "token_type": "Bearer"}
+        if server.expires_in is not None:
+            token["expires_in"] = server.expires_in
+        payload = json.dumps(token)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOAuthTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubOAuthHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.delay = 0.05
+        self.server.expires_in = 3600
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/oauth/token"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrent_callers_share_one_refresh(self):
+        cache = OAuthTokenCache(self.url, "id", "secret")
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(cache.get_token()["access_token"]))
+                   for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(set(tokens), {"tok-1"})
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 19)
+        self.assertIsNotNone(stats["last_refresh_ms"])
+
+    def test_refreshes_before_expiry(self):
+        now = [0.0]
+        cache = OAuthTokenCache(self.url, "id", "secret", refresh_margin=60, clock=lambda: now[0])
+        self.assertEqual(cache.get_token()["access_token"], "tok-1")
+
+        now[0] = 3500.0  # inside the token lifetime, outside the refresh margin
+        self.assertEqual(cache.get_token()["access_token"], "tok-1")
+        now[0] = 3550.0  # within 60s of expiry -> early refresh
+        self.assertEqual(cache.get_token()["access_token"], "tok-2")
+        self.assertEqual(self.server.requests, 2)
+
+    def test_short_or_missing_lifetime_still_cached(self):
+        now = [0.0]
+        self.server.expires_in = 30  # shorter than the 60 s refresh margin
+        cache = OAuthTokenCache(self.url, "id", "secret", refresh_margin=60, clock=lambda: now[0])
+        self.assertEqual(cache.get_token()["access_token"], "tok-1")
+        now[0] = 14.0  # before half the lifetime
+        self.assertEqual(cache.get_token()["access_token"], "tok-1")
+        now[0] = 16.0
+        self.assertEqual(cache.get_token()["access_token"], "tok-2")
+
+        self.server.expires_in = None  # no expires_in: DEFAULT_EXPIRES_IN
+        cache.invalidate()
+        self.assertEqual(cache.get_token()["access_token"], "tok-3")
+        now[0] += DEFAULT_EXPIRES_IN - 61
+        self.assertEqual(cache.get_token()["access_token"], "tok-3")
+        self.assertEqual(self.server.requests, 3)
+
+    def test_rejected_credentials_raise(self):
+        cache = OAuthTokenCache(self.url, "id", "bad")
+        with self.assertRaises(TokenRequestError) as ctx:
+            cache.get_token()
+        self.assertEqual(ctx.exception.status_code, 401)
+        self.assertEqual(cache.stats()["refresh_failures"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
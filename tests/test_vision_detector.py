@@ -0,0 +1,96 @@
+import sys
+import os
+import contextlib
+import io
+import threading
+import unittest
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from vision_detector import VisionDetector
+
+
+class TestVisionDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [1000.0]
+        self.vision = VisionDetector(buffer_size=4, clock=lambda: self.now[0])
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+
+    def test_sources_keep_separate_ema(self):
+        self.vision.update_detection(0.9, "a.jpg", source="cam-a")
+        self.vision.update_detection(0.2, "b.jpg", source="cam-b")
+        self.vision.update_detection(0.5, "a2.jpg", source="cam-a")
+        a = self.vision.detect_fire(source="cam-a")
+        b = self.vision.detect_fire(source="cam-b")
+        self.assertAlmostEqual(a["normalized_conf"], 0.7 * 0.9 + 0.3 * 0.5)  # slow decay
+        self.assertAlmostEqual(b["normalized_conf"], 0.2)  # not mixed with cam-a
+        self.assertEqual((a["source"], a["source_id"], a["image_path"]), ("REAL_YOLO_FEED", "cam-a", "a2.jpg"))
+        # Without a source, the last one that reported answers
+        self.assertEqual(self.vision.detect_fire()["source_id"], "cam-a")
+
+    def test_stale_detection_falls_back_to_simulation(self):
+        self.vision.update_detection(0.9, "a.jpg", source="cam-a")
+        self.now[0] += 11
+        self.assertEqual(self.vision.detect_fire(source="cam-a")["source"], "SIMULATION")
+        self.assertEqual(self.vision.detect_fire(source="unknown")["source"], "SIMULATION")
+        # A stale EMA does not carry into the next detection
+        self.vision.update_detection(0.4, "a.jpg", source="cam-a")
+        self.assertAlmostEqual(self.vision.detect_fire(source="cam-a")["normalized_conf"], 0.4)
+
+    def test_ring_buffer_keeps_last_records_in_order(self):
+        for i in range(6):
+            self.now[0] += 1
+            self.vision.update_detection(0.1 * (i + 1), None, p_count=i, source="drone-1", bbox=[i, i, i + 5, i + 5])
+        history = self.vision.history("drone-1")
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history["persons"].tolist(), [2, 3, 4, 5])
+        self.assertEqual(history["timestamp"].tolist(), [1003.0, 1004.0, 1005.0, 1006.0])
+        self.assertEqual(history["bbox"][-1].tolist(), [5, 5, 10, 10])
+        self.assertEqual(self.vision.history("drone-1", n=2)["persons"].tolist(), [4, 5])
+        self.assertEqual(len(self.vision.history("nobody")), 0)
+
+    def test_detect_near_returns_strongest_fresh_source(self):
+        self.vision.update_detection(0.6, "a.jpg", lat=12.970, lon=77.590, source="cam-a")
+        self.vision.update_detection(0.8, "b.jpg", lat=12.975, lon=77.590, source="cam-b")
+        self.vision.update_detection(0.99, "far.jpg", lat=13.5, lon=77.590, source="cam-far")
+        near = self.vision.detect_near(12.97, 77.59, radius_km=1.0)
+        self.assertEqual(near["source_id"], "cam-b")
+
+        self.now[0] += 8
+        self.vision.update_detection(0.5, "a.jpg", lat=12.970, lon=77.590, source="cam-a")
+        self.now[0] += 3  # cam-b is now stale
+        self.assertEqual(self.vision.detect_near(12.97, 77.59, radius_km=1.0)["source_id"], "cam-a")
+        self.now[0] += 20
+        self.assertIsNone(self.vision.detect_near(12.97, 77.59, radius_km=1.0))
+
+    def test_concurrent_updates_from_many_sources(self):
+        vision = VisionDetector(buffer_size=1000)
+
+        def post(source):
+            for i in range(500):
+                vision.update_detection(0.5 + (i % 2) * 0.1, None, lat=10.0, lon=20.0 + 0.001 * source,
+                                        source=f"cam-{source}")
+
+        threads = [threading.Thread(target=post, args=(s,)) for s in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(vision.sources), 8)
+        for s in range(8):
+            history = vision.history(f"cam-{s}")
+            self.assertEqual(len(history), 500)
+            np.testing.assert_allclose(history["confidence"][-2:], [0.5, 0.6], rtol=1e-6)
+        self.assertEqual(len(vision.positions), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
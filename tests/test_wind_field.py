@@ -0,0 +1,128 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from wind_field import (FileWindProvider, OpenMeteoWindProvider, StubWindProvider, WindFieldService,
+                        WindGrid, to_components)
+
+
+class LinearProvider:
+    """u = lat + 2*lon, v = 3*lat - lon: bilinear interpolation reproduces it exactly."""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, west, south, rows, cols, step_deg, valid_at):
+        self.calls.append((west, south, valid_at))
+        lats = south + np.arange(rows) * step_deg
+        lons = west + np.arange(cols) * step_deg
+        lat, lon = np.meshgrid(lats, lons, indexing="ij")
+        return lat + 2 * lon, 3 * lat - lon
+
+
+class TestWindField(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.now = [7200.0]
+        self.provider = LinearProvider()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def service(self, **kwargs):
+        kwargs.setdefault("clock", lambda: self.now[0])
+        return WindFieldService(self.provider, tile_deg=2.0, step_deg=0.5, **kwargs)
+
+    def test_bilinear_interpolation_across_tiles(self):
+        field = self.service()
+        rng = np.random.default_rng(0)
+        lats, lons = rng.uniform(-5, 5, 1000), rng.uniform(-5, 5, 1000)
+        speed, bearing = field.sample(lats, lons)
+        u, v = lats + 2 * lons, 3 * lats - lons
+        np.testing.assert_allclose(speed, np.hypot(u, v), atol=1e-3)
+        eu, ev = to_components(speed, bearing)
+        np.testing.assert_allclose(eu, u, atol=1e-3)
+        np.testing.assert_allclose(ev, v, atol=1e-3)
+        self.assertEqual(len(self.provider.calls), 36)  # one fetch per 2 deg tile (6 x 6), not per point
+
+    def test_points_in_one_tile_cost_one_fetch(self):
+        field = self.service()
+        field.sample(np.full(500, 10.3), np.linspace(20.1, 21.9, 500))
+        field.sample([10.7], [21.0])
+        self.assertEqual(len(self.provider.calls), 1)
+        self.assertEqual(field.stats()["upstream_fetches"], 1)
+
+    def test_new_time_bucket_refetches(self):
+        field = self.service(bucket_seconds=3600, ttl_seconds=7200)
+        field.sample([10.3], [20.3])
+        self.now[0] += 3600
+        field.sample([10.3], [20.3])
+        self.assertEqual([c[2] for c in self.provider.calls], [7200, 10800])
+
+    def test_disk_store_survives_restart_until_ttl(self):
+        kwargs = {"cache_dir": self.tmp, "bucket_seconds": 36000, "ttl_seconds": 3600}
+        self.service(**kwargs).sample([10.3], [20.3])
+        restarted = self.service(**kwargs)
+        restarted.sample([10.3], [20.3])
+        self.assertEqual(len(self.provider.calls), 1)
+        self.assertEqual(restarted.stats()["disk_hits"], 1)
+
+        self.now[0] += 3601  # same time bucket, but the stored tile is past its TTL
+        self.service(**kwargs).sample([10.3], [20.3])
+        self.assertEqual(len(self.provider.calls), 2)
+
+    def test_prune_drops_expired_buckets(self):
+        field = self.service(cache_dir=self.tmp, bucket_seconds=3600, ttl_seconds=3600)
+        field.sample([10.3], [20.3])
+        self.now[0] += 3 * 3600
+        field.sample([10.3], [20.3])
+        buckets = sorted(name.split("_")[1] for name in os.listdir(self.tmp))
+        self.assertEqual(buckets, ["5"])
+
+    def test_stub_matches_old_defaults(self):
+        field = WindFieldService(StubWindProvider())
+        speed, bearing = field.sample_point(-33.9, 151.2)
+        self.assertAlmostEqual(speed, 10.0, places=4)
+        self.assertAlmostEqual(bearing, 0.0, places=3)
+
+    def test_file_provider_picks_time_slice(self):
+        path = os.path.join(self.tmp, "wind.npz")
+        lats, lons = np.arange(0, 11.0), np.arange(0, 21.0)
+        u = np.stack([np.full((11, 21), 5.0), np.full((11, 21), -5.0)])
+        np.savez(path, lats=lats, lons=lons, u=u, v=np.zeros_like(u), times=np.array([0.0, 3600.0]))
+        field = WindFieldService(FileWindProvider(path), tile_deg=2.0, step_deg=0.5, clock=lambda: 1800.0)
+        self.assertAlmostEqual(field.sample_point(5.0, 10.0)[1], 90.0, places=3)
+        self.assertAlmostEqual(field.sample_point(5.0, 10.0, timestamp=4000.0)[1], 270.0, places=3)
+
+    def test_open_meteo_batches_points_and_flips_direction(self):
+        session = mock.Mock()
+
+        def get(url, timeout, params):
+            n = len(params["latitude"].split(","))
+            return mock.Mock(status_code=200, json=lambda: [
+                {"current": {"wind_speed_10m": 20.0, "wind_direction_10m": 270.0}}] * n)
+
+        session.get.side_effect = get
+        provider = OpenMeteoWindProvider(session=session, max_points=10)
+        u, v = provider.fetch(0.0, 0.0, 5, 5, 0.5, 0)
+        self.assertEqual(session.get.call_count, 3)
+        np.testing.assert_allclose(u, 20.0, atol=1e-9)  # westerly wind pushes east
+        np.testing.assert_allclose(v, 0.0, atol=1e-9)
+
+    def test_grid_clamps_points_off_the_edge(self):
+        grid = WindGrid(0.0, 0.0, 1.0, [[0.0, 1.0], [2.0, 3.0]], np.zeros((2, 2)))
+        u, _ = grid.interpolate([-1.0, 0.5, 5.0], [-1.0, 0.5, 5.0])
+        np.testing.assert_allclose(u, [0.0, 1.5, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()